@@ -0,0 +1,171 @@
+# encoding: utf-8
+from multiprocessing import Pool, Queue, Manager
+from builder.defines import LOG_BATCH_SIZE
+from builder.manager import LogListener, WallSection
+
+import logging
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+
+
+def log_records(count):
+    """Logs a number of build records from a worker of the pool.
+
+    Args:
+        count (int) : The number of records to log.
+
+    Returns:
+        int: The number of logged records.
+    """
+
+    log = logging.getLogger(WallSection.__name__)
+
+    for i in range(count):
+        log.info(f'Added 1 foot to section {i} to reach 30 feet on day 1')
+
+    # Send the buffered log messages of the task
+    WallSection.flush_logs()
+
+    return count
+
+
+def benchmark_log_transport(queue,
+                            records=10000,
+                            num_teams=4,
+                            tasks=16,
+                            batch_size=LOG_BATCH_SIZE
+                            ):
+    """Measures how many log records per second reach the log file.
+
+    The workers of a pool log the records to the queue and a log listener
+    writes them to a temporary file. The time is measured from the first
+    task until the listener has written the last record.
+
+    Args:
+        queue (Queue)       : The log queue (native or a manager proxy).
+        records (int)       : The total number of records.
+        num_teams (int)     : The number of workers.
+        tasks (int)         : The number of tasks the records are split into.
+        batch_size (int)    : The number of records sent at a time.
+
+    Returns:
+        float: The number of records written per second.
+
+    Example:
+
+        from multiprocessing import Queue
+        from builder.benchmark import benchmark_log_transport
+
+        # Measure the native queue
+        print(benchmark_log_transport(Queue(), records=10000))
+    """
+
+    with tempfile.TemporaryDirectory() as folder:
+
+        # Start the log consumer process
+        listener = LogListener(
+            queue=queue,
+            logfile=os.path.join(folder, 'benchmark.log'),
+            echo=False
+        )
+        listener.start()
+
+        # Split the records between the tasks
+        counts = [records // tasks] * tasks
+        counts[-1] += records % tasks
+
+        with Pool(num_teams, WallSection.prepare, (queue, batch_size)) as pool:
+
+            # Save the start timestamp
+            start_time = time.perf_counter()
+
+            pool.map(log_records, counts)
+
+            # Let the workers send their last log messages before exiting
+            pool.close()
+            pool.join()
+
+        # Wait until the listener has written all records
+        listener.stop()
+
+        # Save the end timestamp
+        end_time = time.perf_counter()
+
+    return records / (end_time - start_time)
+
+
+def measure_sections(count=100000):
+    """Measures the memory and the pickle size of the wall sections.
+
+    The memory is traced while the sections are created, so it includes the
+    list of sections and the integers of their attributes.
+
+    Args:
+        count (int) : The number of sections.
+
+    Returns:
+        dict: The bytes per section in memory, in a pickled list and of a
+            single pickled section.
+
+    Example:
+
+        from builder.benchmark import measure_sections
+
+        print(measure_sections(count=100000))
+    """
+
+    # Trace the memory allocated by the sections
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        sections = [
+            WallSection(section_id=i, profile_id=0, start_height=i % 30)
+            for i in range(count)
+        ]
+        end = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'memory': (end - start) / count,
+        'pickle': len(pickle.dumps(sections)) / count,
+        'single': len(pickle.dumps(sections[0])),
+    }
+
+
+def main():
+    """Compares the log transport and measures the size of the sections."""
+
+    # Measure the size of the wall sections
+    sizes = measure_sections()
+    print(f'WallSection : {sizes["memory"]:.1f} bytes in memory, '
+          f'{sizes["pickle"]:.1f} bytes pickled in a list, '
+          f'{sizes["single"]} bytes pickled alone')
+
+    records = 100000
+
+    for batch_size in (1, LOG_BATCH_SIZE):
+
+        # Measure the proxied queue of a manager process
+        with Manager() as manager:
+            proxied = benchmark_log_transport(
+                manager.Queue(), records=records, batch_size=batch_size
+            )
+
+        # Measure the native queue inherited by the workers
+        queue = Queue()
+        native = benchmark_log_transport(
+            queue, records=records, batch_size=batch_size
+        )
+        queue.close()
+
+        print(f'Batch size {batch_size:>4} : '
+              f'Manager().Queue() {proxied:10,.0f} records/s, '
+              f'Queue() {native:10,.0f} records/s')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+# encoding: utf-8
+from builder.errors import *
+
+from collections import OrderedDict
+from concurrent.futures import Future
+import asyncio
+import threading
+
+
+class BuildResult(object):
+    """Summary of a build that answers the ice and cost queries.
+
+    Attributes:
+        ice (list)              : The ice consumed by each profile.
+        cost_per_volume (int)   : The cost of ice per cubic foot.
+
+    Example:
+
+        from builder.cache import BuildResult
+
+        # Summarize a build
+        result = BuildResult.from_builder(engine.build(days=1))
+
+        # Get the cost of the first profile
+        print(result.get_cost(profile_id=0))
+    """
+
+    def __init__(self, ice=None, cost_per_volume=0):
+        """Initializes the result.
+
+        Args:
+            ice (list)              : The ice consumed by each profile.
+            cost_per_volume (int)   : The cost of ice per cubic foot.
+        """
+
+        # Set the instance attributes
+        self.ice = ice or []
+        self.cost_per_volume = cost_per_volume
+
+    def __repr__(self):
+        """Returns a string representation of the result."""
+
+        return (f"BuildResult(ice={self.get_ice()}, "
+                f"cost={self.get_cost()}"
+                f")"
+                )
+
+    @classmethod
+    def from_builder(cls, builder):
+        """Summarizes the state of a builder after a build.
+
+        Args:
+            builder (WallBuilderAbc) : A builder with the ice per profile.
+
+        Returns:
+            BuildResult : The summary of the build.
+        """
+
+        config = builder.config
+
+        return cls(
+            ice=[
+                builder.get_ice(profile_id=profile_id)
+                for profile_id in range(len(config.profiles))
+            ],
+            cost_per_volume=config.cost_per_volume
+        )
+
+    def get_ice(self, profile_id=None):
+        """Returns the ice of the wall (or of a profile)."""
+
+        # Get the ice of the whole wall
+        if profile_id is None:
+            return sum(self.ice)
+
+        # Get the ice of a single profile
+        if not 0 <= profile_id < len(self.ice):
+            raise BuilderError(f"Profile with ID {profile_id} not found.")
+
+        return self.ice[profile_id]
+
+    def get_cost(self, profile_id=None):
+        """Returns the cost of the wall (or of a profile)."""
+        return self.get_ice(profile_id) * self.cost_per_volume
+
+
+class ResultCache(object):
+    """Bounded LRU cache of build results.
+
+    The results are keyed by the fingerprint of the configuration, the number
+    of days and the number of teams. Repeated requests with the same key are
+    answered without building the wall. The least recently used result is
+    evicted when the cache is full.
+
+    Concurrent requests for a key that is being built are coalesced: the
+    first request builds the wall and the others wait for the same result
+    (single-flight).
+
+    Attributes:
+        maxsize (int)   : The maximum number of results.
+        hits (int)      : The number of requests answered from the cache.
+        misses (int)    : The number of requests that needed a build.
+        coalesced (int) : The number of requests that waited for a build of
+                          another request.
+
+    Example:
+
+        from builder.cache import ResultCache
+
+        cache = ResultCache(maxsize=128)
+
+        # Build the wall only on the first request
+        result = cache.get_result(builder, days=1, num_teams=20)
+        result = cache.get_result(builder, days=1, num_teams=20)
+
+        # Show the hits and misses
+        print(cache.get_stats())
+    """
+
+    def __init__(self, maxsize=128):
+        """Initializes the cache.
+
+        Args:
+            maxsize (int) : The maximum number of results.
+        """
+
+        # Check the size of the cache
+        if maxsize < 1:
+            raise BuilderError(f"Invalid cache size {maxsize}.")
+
+        # Set the instance attributes
+        self.maxsize = maxsize
+        self.results = OrderedDict()
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        # Protect the results shared by the requests
+        self.lock = threading.Lock()
+
+        # Build one result at a time with each builder
+        self.build_locks = {}
+
+    def __len__(self):
+        """Returns the number of cached results."""
+        return len(self.results)
+
+    def __repr__(self):
+        """Returns a string representation of the cache."""
+
+        return (f"ResultCache(maxsize={self.maxsize}, "
+                f"size={len(self)}, "
+                f"hits={self.hits}, "
+                f"misses={self.misses}, "
+                f"coalesced={self.coalesced}"
+                f")"
+                )
+
+    @staticmethod
+    def make_key(config, days, num_teams):
+        """Returns the key of a build.
+
+        Args:
+            config (WallConfigurator)   : The configuration of the build.
+            days (int)                  : The number of days.
+            num_teams (int)             : The number of teams.
+
+        Returns:
+            tuple : The key of the build.
+        """
+        return config.get_fingerprint(), days, num_teams
+
+    def get(self, key):
+        """Returns a cached result, or None if the key is not cached."""
+
+        with self.lock:
+
+            # Count the miss
+            if key not in self.results:
+                self.misses += 1
+                return None
+
+            # Mark the result as recently used
+            self.results.move_to_end(key)
+            self.hits += 1
+
+            return self.results[key]
+
+    def put(self, key, result):
+        """Stores a result and evicts the least recently used one."""
+
+        with self.lock:
+            self.results[key] = result
+            self.results.move_to_end(key)
+
+            # Evict the oldest results
+            while len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+
+    def clear(self):
+        """Removes all cached results."""
+
+        with self.lock:
+            self.results.clear()
+
+    def claim(self, key):
+        """Looks up a key and joins or starts its build.
+
+        Args:
+            key (tuple) : The key of the build.
+
+        Returns:
+            tuple: The cached result (or None), the future of the build and
+                True if the caller must build the wall.
+        """
+
+        with self.lock:
+
+            # Answer from the cache
+            if key in self.results:
+                self.results.move_to_end(key)
+                self.hits += 1
+                return self.results[key], None, False
+
+            # Wait for the build of another request
+            if key in self.pending:
+                self.coalesced += 1
+                return None, self.pending[key], False
+
+            # Start a new build
+            self.misses += 1
+            future = self.pending[key] = Future()
+            return None, future, True
+
+    def get_build_lock(self, builder):
+        """Returns the lock of the builds of a builder.
+
+        A builder keeps the state of its last build, so the builds of the
+        same builder run one at a time. The builds of different builders
+        (e.g. the analytic engine and the wall manager) run in parallel.
+
+        Args:
+            builder (WallBuilderAbc) : The builder of the wall.
+
+        Returns:
+            Lock: The lock of the builder.
+        """
+
+        with self.lock:
+            lock = self.build_locks.get(id(builder))
+            if lock is None:
+                lock = self.build_locks[id(builder)] = threading.Lock()
+
+            return lock
+
+    @staticmethod
+    def summarize(builder, days=1, num_teams=1):
+        """Builds the wall and returns an immutable result.
+
+        The snapshot of the builder is used if the builder takes one (see
+        WallManager.build_snapshot), otherwise the ice of each profile is
+        summarized after the build.
+
+        Args:
+            builder (WallBuilderAbc)    : The builder of the wall.
+            days (int)                  : The number of days.
+            num_teams (int)             : The number of teams.
+
+        Returns:
+            WallSnapshot or BuildResult : The result of the build.
+        """
+
+        # Take the snapshot of the build
+        if hasattr(builder, 'build_snapshot'):
+            return builder.build_snapshot(days=days, num_teams=num_teams)
+
+        builder.build(days=days, num_teams=num_teams)
+        return BuildResult.from_builder(builder)
+
+    def build(self, key, future, builder, days=1, num_teams=1):
+        """Builds the wall and passes the result to the waiting requests.
+
+        Args:
+            key (tuple)                 : The key of the build.
+            future (Future)             : The future of the build.
+            builder (WallBuilderAbc)    : The builder of the wall.
+            days (int)                  : The number of days.
+            num_teams (int)             : The number of teams.
+        """
+
+        try:
+            # Build one result at a time with the same builder
+            with self.get_build_lock(builder):
+                result = self.summarize(builder, days, num_teams)
+
+            # Store the result before the build is finished
+            self.put(key, result)
+            if not future.done():
+                future.set_result(result)
+
+        # Pass the error to the waiting requests
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def get_result(self, builder, days=1, num_teams=1):
+        """Returns the result of a build from the cache or from the builder.
+
+        Args:
+            builder (WallBuilderAbc)    : The builder used on a miss.
+            days (int)                  : The number of days.
+            num_teams (int)             : The number of teams.
+
+        Returns:
+            BuildResult : The result of the build.
+        """
+
+        # Look up the result of the same configuration
+        key = self.make_key(builder.config, days, num_teams)
+        result, future, leader = self.claim(key)
+
+        if result is not None:
+            return result
+
+        # Build the wall on a miss
+        if leader:
+            self.build(key, future, builder, days, num_teams)
+
+        return future.result()
+
+    async def aget_result(self, builder, days=1, num_teams=1, executor=None):
+        """Returns the result of a build without blocking the event loop.
+
+        The build runs on a thread of the executor. The requests that wait
+        for the same build do not use a thread, and a cancelled request does
+        not cancel the build for the others.
+
+        Args:
+            builder (WallBuilderAbc)    : The builder used on a miss.
+            days (int)                  : The number of days.
+            num_teams (int)             : The number of teams.
+            executor (Executor)         : The executor of the builds, or None
+                                          for the default executor.
+
+        Returns:
+            BuildResult : The result of the build.
+        """
+
+        # Look up the result of the same configuration
+        key = self.make_key(builder.config, days, num_teams)
+        result, future, leader = self.claim(key)
+
+        if result is not None:
+            return result
+
+        # Build the wall on a miss
+        if leader:
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(
+                executor, self.build, key, future, builder, days, num_teams
+            )
+
+        # Wait without cancelling the shared future on a cancelled request
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def get_stats(self):
+        """Returns the statistics of the cache.
+
+        Returns:
+            dict : The size, the hits, the misses and the coalesced
+                requests of the cache.
+        """
+
+        with self.lock:
+            return {
+                'maxsize': self.maxsize,
+                'size': len(self.results),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'pending': len(self.pending),
+            }
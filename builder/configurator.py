@@ -3,6 +3,8 @@ from abc import ABC, abstractmethod
 from builder.errors import BuilderConfigError
 from pathlib import Path
 import configparser
+import hashlib
+import json
 
 from builder.defines import *
 from builder.validator import ConfigValidator, ConfigValidatorAbc
@@ -57,6 +59,8 @@ class WallConfigurator(object):
         build_rate (int)                : The build rate of feet per day
         num_teams (int)                 : The number of workers
         cpu_worktime (float)            : The CPU work time (in seconds)
+        chunk_size (int)                : The sections per task (0 = auto)
+        engine (str)                    : The wall builder engine
         profiles  (list)                : The list of profiles
         validator (ConfigValidatorAbc)  : The configuration validator
 
@@ -87,6 +91,8 @@ class WallConfigurator(object):
                  build_rate=BUILD_RATE,
                  num_teams=MAX_WORKERS,
                  cpu_worktime=WORK_DELAY,
+                 chunk_size=CHUNK_SIZE,
+                 engine=ENGINE,
                  profiles=PROFILES,
                  validator=ConfigValidator()
                  ):
@@ -100,6 +106,8 @@ class WallConfigurator(object):
             build_rate (int)                : The build rate of feet per day
             num_teams (int)                 : The number of workers
             cpu_worktime (float)            : The CPU work time (in seconds)
+            chunk_size (int)                : The sections per task (0 = auto)
+            engine (str)                    : The wall builder engine
             profiles  (list)                : The list of profiles
             validator (ConfigValidatorAbc)  : The configuration validator
         """
@@ -114,6 +122,8 @@ class WallConfigurator(object):
         # Task
         self.num_teams = num_teams
         self.cpu_worktime = cpu_worktime
+        self.chunk_size = chunk_size
+        self.engine = engine
 
         # Profiles
         self.profiles = profiles or []
@@ -132,6 +142,8 @@ class WallConfigurator(object):
             f"build_rate={self.build_rate}, "
             f"num_workers={self.num_teams}, "
             f"cpu_worktime={self.cpu_worktime}, "
+            f"chunk_size={self.chunk_size}, "
+            f"engine={self.engine}, "
             f"profiles={self.profiles}, "
         )
 
@@ -145,9 +157,70 @@ class WallConfigurator(object):
             'build_rate': self.build_rate,
             'num_teams': self.num_teams,
             'cpu_worktime': self.cpu_worktime,
+            'chunk_size': self.chunk_size,
+            'engine': self.engine,
             'profiles': self.profiles,
         }
 
+    def get_fingerprint(self):
+        """Returns a stable hash of the configuration parameters.
+
+        The fingerprint changes whenever any of the parameters changes and can
+        be used as a key for the results calculated from the configuration.
+
+        Returns:
+            str : The hexadecimal digest of the parameters
+        """
+
+        # Serialize the parameters in a deterministic way
+        data = json.dumps(self.get_params(), sort_keys=True)
+
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def copy_params(self):
+        """Returns a copy of the parameters that later changes do not alter.
+
+        Returns:
+            dict : The configuration parameters with copied profile rows
+        """
+
+        params = self.get_params()
+        params['profiles'] = [list(row) for row in self.profiles]
+
+        return params
+
+    def get_changed_profiles(self, params):
+        """Returns the IDs of the profiles that differ from other parameters.
+
+        The profiles are compared row by row, so an edited row changes only
+        its own profile, while an added or removed row changes the profiles
+        from its position to the end.
+
+        Args:
+            params (dict) : The parameters of another configuration (see
+                            copy_params).
+
+        Returns:
+            list : The IDs of the changed profiles, or None if any parameter
+                   other than the profiles differs.
+        """
+
+        # Any other parameter changes the whole wall
+        current = self.get_params()
+        if any(current[key] != value
+               for key, value in params.items() if key != 'profiles'):
+            return None
+
+        # Compare the rows of both configurations
+        profiles = params['profiles']
+        return [
+            profile_id
+            for profile_id in range(max(len(self.profiles), len(profiles)))
+            if profile_id >= len(self.profiles) or
+            profile_id >= len(profiles) or
+            self.profiles[profile_id] != profiles[profile_id]
+        ]
+
     def set_params(self, params):
         """Sets the configuration parameters.
 
@@ -166,6 +239,8 @@ class WallConfigurator(object):
         self.build_rate = params.get('build_rate', BUILD_RATE)
         self.num_teams = params.get('num_teams', MAX_WORKERS)
         self.cpu_worktime = params.get('cpu_worktime', WORK_DELAY)
+        self.chunk_size = params.get('chunk_size', CHUNK_SIZE)
+        self.engine = params.get('engine', ENGINE)
         self.profiles = params.get('profiles', PROFILES)
 
     @classmethod
@@ -211,6 +286,8 @@ class WallConfigurator(object):
             data = parser['Task']
             config.num_teams = data.getint('NUM_WORKERS')
             config.cpu_worktime = data.getfloat('CPU_WORKTIME')
+            config.chunk_size = data.getint('CHUNK_SIZE', fallback=CHUNK_SIZE)
+            config.engine = data.get('ENGINE', ENGINE)
 
         except ValueError as e:
             raise BuilderConfigError(
@@ -264,6 +341,8 @@ class WallConfigurator(object):
             task = parser['Task']
             task['NUM_WORKERS'] = str(self.num_teams)
             task['CPU_WORKTIME'] = str(self.cpu_worktime)
+            task['CHUNK_SIZE'] = str(self.chunk_size)
+            task['ENGINE'] = self.engine
 
         except Exception as e:
             raise BuilderConfigError(
@@ -324,6 +403,12 @@ class WallConfigurator(object):
         if params.get('cpu_worktime'):
             self.validator.check_cpu_worktime(params['cpu_worktime'])
 
+        if params.get('chunk_size'):
+            self.validator.check_chunk_size(params['chunk_size'])
+
+        if params.get('engine'):
+            self.validator.check_engine(params['engine'])
+
         if params.get('profiles'):
             self.validator.check_config_list(params['profiles'])
 
@@ -5,7 +5,20 @@ WORK_DELAY = 0.01           # Simulated CPU work in seconds
 MAX_SECTION_COUNT = 2000    # Maximum number of sections
 MAX_WORKERS = 20            # Maximum number of workers
 BUILD_RATE = 1              # Feet per day
+CHUNK_SIZE = 0              # Sections per task (0 = auto-tune)
+HEIGHT_TYPECODE = 'b'       # Array type of the section heights (int8)
+CHECKPOINT_COUNT = 8        # Simulation checkpoints kept per manager
+LOG_BATCH_SIZE = 100        # Log records per batch
+LOG_BUFFER_SIZE = 65536     # Size of the log file buffer in bytes
+LOG_FLUSH_INTERVAL = 1.0    # Maximum time between log flushes in seconds
+LOG_OPEN_TIMEOUT = 10.0     # Maximum wait for the log files to reopen
+LOG_PAGE_SIZE = 1000        # Log messages per page of the REST API
+LOG_STREAM_SIZE = 100       # Log messages per chunk of a streamed response
+LOG_FOLLOW_INTERVAL = 1.0   # Time between two polls of a followed log
+LOG_FOLLOW_TIMEOUT = 30.0   # Maximum time to follow the log in a request
 PROFILES = [[21, 25, 28], [17], [17, 22, 17, 19, 17, ]]
+ENGINE = 'analytic'         # Default wall builder engine
+ENGINES = ('analytic', 'simulation', 'scheduler')  # Available engines
 
 DEFAULT_LOG_FILE = 'wall_progress.log'
 DEFAULT_INI_FILE = 'wall.ini'
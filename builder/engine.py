@@ -0,0 +1,257 @@
+# encoding: utf-8
+from builder.errors import *
+from builder.manager import WallBuilderAbc
+from builder.validator import ConfigValidator
+from builder.table import WallTable
+from builder.logreader import LogQueryMixin
+
+
+class AnalyticEngine(LogQueryMixin, WallBuilderAbc):
+    """Calculates the progress of the wall in closed form.
+
+    Every crew adds `build_rate` feet per day to its section until the target
+    height is reached. The height of a section on a given day is therefore
+    known in advance and no worker processes are needed to answer the ice and
+    cost queries. The engine shares the interface of the WallManager and can
+    replace it whenever the simulation of the pool is not required.
+
+    The totals per profile and for the whole wall are looked up in a table
+    materialized once per configuration (see WallTable).
+
+    The engine writes no log messages, so its log queries return the logs of
+    the last simulation in the log file.
+
+    Attributes:
+        days (int)                  : The number of days built so far.
+        table (WallTable)           : The cumulative ice per day and profile.
+        log_filepath (str)          : The path to the log file.
+        validator (ConfigValidator) : The configuration validator.
+
+    Example:
+
+        from builder.engine import AnalyticEngine
+        from builder.configurator import WallConfigurator
+
+        # Define the wall configuration
+        config = WallConfigurator(
+            profiles=[[21, 25, 28], [17], [17, 22, 17, 19, 17, ]]
+        )
+
+        # Create the engine and build the wall for one day
+        engine = AnalyticEngine.set_config(config).build(days=1)
+
+        # Get the ice consumed by the first profile
+        print(engine.get_ice(profile_id=0))
+
+        # Get the cost of the whole wall
+        print(engine.get_cost())
+    """
+
+    def __init__(self,
+                 log_filepath='wall.log',
+                 validator=ConfigValidator()
+                 ):
+        """Initializes the analytic engine.
+
+        Args:
+            log_filepath (str)          : The path to the log file.
+            validator (ConfigValidator) : The configuration validator.
+        """
+
+        # Set the instance attributes
+        self.days = 0
+        self.table = None
+
+        # Set the log file of the simulation
+        self.log_filepath = log_filepath
+
+        # Set the validator
+        self.validator = validator
+
+    def __repr__(self):
+        """Returns a string representation of the engine."""
+
+        return (f"AnalyticEngine(days={self.days}, "
+                f"ice={self.get_ice()}, "
+                f"cost={self.get_cost()}, "
+                f"ready={self.is_ready()}"
+                f")"
+                )
+
+    def get_table(self):
+        """Get the table with the cumulative ice per day and profile.
+
+        Returns:
+            WallTable: The table of the current configuration.
+        """
+
+        # Materialize the table anew only if the configuration changed (the
+        # profiles that did not change are copied from the previous table)
+        fingerprint = self.config.get_fingerprint()
+        if self.table is None or self.table.fingerprint != fingerprint:
+            self.table = WallTable.from_config(self.config, self.table)
+
+        return self.table
+
+    def get_heights(self, profile_id=None, section_id=None):
+        """Returns the start heights selected by a profile or a section.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all profiles.
+            section_id (int) : The section ID, or None for all sections.
+
+        Returns:
+            list: The start heights of the selected sections.
+        """
+
+        # Select a single section using the global section numbering
+        if section_id is not None:
+            heights = [h for row in self.config.profiles for h in row]
+            if not 0 <= section_id < len(heights):
+                raise BuilderError(f"Section with ID {section_id} not found.")
+            return [heights[section_id]]
+
+        # Select all sections of the wall
+        if profile_id is None:
+            return [h for row in self.config.profiles for h in row]
+
+        # Select the sections of a single profile
+        if not 0 <= profile_id < len(self.config.profiles):
+            raise BuilderError(f"Profile with ID {profile_id} not found.")
+
+        return self.config.profiles[profile_id]
+
+    def get_height(self, start_height):
+        """Returns the height of a section after the built days.
+
+        Args:
+            start_height (int) : The start height of the section.
+
+        Returns:
+            int: The current height of the section.
+        """
+
+        # Sections above the target height are never built
+        target_height = self.config.target_height
+        if start_height >= target_height:
+            return start_height
+
+        # Add the build rate for each day until the target is reached
+        height = start_height + self.days * self.config.build_rate
+        return min(height, target_height)
+
+    def is_ready(self, profile_id=None, section_id=None):
+        """Check if the selected sections are ready.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all profiles.
+            section_id (int) : The section ID, or None for all sections.
+
+        Returns:
+            bool: True if all selected sections reached the target height.
+        """
+
+        # Check a single section
+        if section_id is not None:
+            height = self.get_heights(section_id=section_id)[0]
+            return self.get_height(height) >= self.config.target_height
+
+        # Check if there are any sections
+        if not self.get_heights(profile_id):
+            return False
+
+        # Check if the completion day has been reached
+        else:
+            table = self.get_table()
+            return self.days >= table.get_completion_day(profile_id)
+
+    def get_ice(self, profile_id=None, section_id=None):
+        """Get the ice consumed by the selected sections.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all profiles.
+            section_id (int) : The section ID, or None for all sections.
+
+        Returns:
+            int: The ice consumed until the built day.
+        """
+
+        # Look up the totals of the wall or of a profile
+        if section_id is None:
+            return self.get_table().get_ice(self.days, profile_id)
+
+        heights = self.get_heights(profile_id, section_id)
+        delta = sum(self.get_height(h) - h for h in heights)
+        return delta * self.config.volume_ice_per_foot
+
+    def get_cost(self, profile_id=None, section_id=None):
+        """Get the cost of the selected sections.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all profiles.
+            section_id (int) : The section ID, or None for all sections.
+
+        Returns:
+            int: The cost until the built day.
+        """
+        return self.get_ice(profile_id, section_id) * self.config.cost_per_volume
+
+    def validate(self):
+        """Validate the engine configuration.
+
+        Raises:
+            BuilderValidationError: If the profiles list is invalid.
+
+        Returns:
+            AnalyticEngine: The validated engine instance.
+        """
+
+        # Check the profiles list
+        self.validator.check_config_list(self.config.profiles)
+
+        # Check the start height of each section
+        for height in self.get_heights():
+            self.validator.check_height(height)
+
+        return self
+
+    def build(self, days=1, num_teams=1):
+        """Build the wall for the given number of days.
+
+        No work is done by this method. The heights are calculated on demand
+        by the query methods, so the number of teams has no influence.
+
+        Args:
+            days (int)      : The number of days to build the wall.
+            num_teams (int) : The number of construction teams (unused).
+
+        Returns:
+            AnalyticEngine: The updated engine instance.
+        """
+
+        self.days = days
+        return self
+
+
+def main():
+    """Main function for testing the analytic engine."""
+
+    from builder.configurator import WallConfigurator
+
+    config = WallConfigurator(
+        profiles=[
+            [21, 25, 28],
+            [17],
+            [17, 22, 17, 19, 17, ]
+        ]
+    )
+
+    # Create the engine and build the wall
+    engine = AnalyticEngine.set_config(config)
+    engine.build(days=30)
+
+    return engine.get_ice(), engine.get_cost()
+
+
+if __name__ == "__main__":
+    print(main())
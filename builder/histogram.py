@@ -0,0 +1,185 @@
+# encoding: utf-8
+from builder.errors import *
+
+
+class WallHistogram(object):
+    """Number of sections of a profile for each start height.
+
+    The start heights of the sections are within [0, target_height], so any
+    number of sections collapses to target_height + 1 buckets. The ice, cost
+    and completion day of a profile depend only on the bucket counts and are
+    calculated without iterating over the sections.
+
+    Attributes:
+        target_height (int) : The target height of the wall.
+        counts (list)       : The number of sections for each start height.
+
+    Example:
+
+        from builder.histogram import WallHistogram
+
+        # Count the sections by start height
+        histogram = WallHistogram.from_heights([21, 25, 28], target_height=30)
+
+        # Get the feet added until the second day
+        print(histogram.get_feet(day=2))
+
+        # Get the day on which the last section is completed
+        print(histogram.get_completion_day())
+    """
+
+    def __init__(self, target_height=0, counts=None):
+        """Initializes the histogram.
+
+        Args:
+            target_height (int) : The target height of the wall.
+            counts (list)       : The number of sections for each start height.
+        """
+
+        # Set the instance attributes
+        self.target_height = target_height
+        self.counts = counts or [0] * (target_height + 1)
+
+    def __eq__(self, other):
+        """Check if two histograms are equal."""
+        return all([
+            self.target_height == other.target_height,
+            self.counts == other.counts
+        ])
+
+    def __ne__(self, other):
+        """Check if two histograms are not equal."""
+        return not self == other
+
+    def __len__(self):
+        """Returns the number of sections in the histogram."""
+        return sum(self.counts)
+
+    def __repr__(self):
+        """Returns a string representation of the histogram."""
+
+        return (f"WallHistogram(target_height={self.target_height}, "
+                f"sections={len(self)}"
+                f")"
+                )
+
+    @classmethod
+    def from_heights(cls, heights, target_height):
+        """Creates a histogram from the start heights of the sections.
+
+        Args:
+            heights (list)      : The start heights of the sections.
+            target_height (int) : The target height of the wall.
+
+        Returns:
+            WallHistogram : The histogram of the start heights.
+        """
+
+        histogram = cls(target_height=target_height)
+        for height in heights:
+            histogram.add(height)
+
+        return histogram
+
+    def add(self, height, count=1):
+        """Adds sections with the given start height.
+
+        Args:
+            height (int)    : The start height of the sections.
+            count (int)     : The number of sections.
+
+        Returns:
+            WallHistogram : The updated histogram.
+        """
+
+        # Check the start height
+        if height < 0:
+            raise BuilderError(f"Invalid start height {height}.")
+
+        # Sections above the target height are never built
+        self.counts[min(height, self.target_height)] += count
+
+        return self
+
+    def get_feet(self, day, build_rate=1):
+        """Returns the feet added to all sections until the given day.
+
+        Args:
+            day (int)           : The day of the construction.
+            build_rate (int)    : The build rate in feet per day.
+
+        Returns:
+            int : The feet added until the given day.
+        """
+
+        feet = 0
+        for height, count in enumerate(self.counts):
+            if count:
+                feet += count * min(day * build_rate, self.target_height - height)
+
+        return feet
+
+    def get_daily_feet(self, day, build_rate=1):
+        """Returns the feet added to all sections on the given day.
+
+        Args:
+            day (int)           : The day of the construction.
+            build_rate (int)    : The build rate in feet per day.
+
+        Returns:
+            int : The feet added on the given day.
+        """
+
+        # Nothing is built before the first day
+        if day < 1:
+            return 0
+
+        return (self.get_feet(day, build_rate) -
+                self.get_feet(day - 1, build_rate))
+
+    def get_completion_day(self, build_rate=1):
+        """Returns the day on which the last section is completed.
+
+        Args:
+            build_rate (int)    : The build rate in feet per day.
+
+        Returns:
+            int : The completion day, or 0 if there is nothing to build.
+        """
+
+        # The lowest section is completed last
+        for height, count in enumerate(self.counts):
+            if count:
+                feet = self.target_height - height
+                return -(-feet // build_rate)
+
+        return 0
+
+    def get_ice(self, day, volume_ice_per_foot, build_rate=1):
+        """Returns the ice consumed until the given day.
+
+        Args:
+            day (int)                   : The day of the construction.
+            volume_ice_per_foot (int)   : The cubic feet of ice per foot.
+            build_rate (int)            : The build rate in feet per day.
+
+        Returns:
+            int : The ice consumed until the given day.
+        """
+        return self.get_feet(day, build_rate) * volume_ice_per_foot
+
+    def get_cost(self, day, volume_ice_per_foot, cost_per_volume, build_rate=1):
+        """Returns the cost until the given day.
+
+        Args:
+            day (int)                   : The day of the construction.
+            volume_ice_per_foot (int)   : The cubic feet of ice per foot.
+            cost_per_volume (int)       : The cost of ice per cubic foot.
+            build_rate (int)            : The build rate in feet per day.
+
+        Returns:
+            int : The cost until the given day.
+        """
+
+        ice = self.get_ice(day, volume_ice_per_foot, build_rate)
+        return ice * cost_per_volume
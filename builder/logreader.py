@@ -0,0 +1,428 @@
+# encoding: utf-8
+from builder.errors import *
+
+import os
+import re
+
+# The build progress logged by the workers
+PROGRESS = re.compile(
+    r'Added \d+ foot to section (?P<section_id>\d+) to reach \d+ feet'
+    r' on day (?P<day>\d+)$'
+)
+
+
+def get_section_ids(profiles, profile_id=None, section_id=None):
+    """Returns the IDs of the sections selected by a profile and a section.
+
+    The sections are numbered globally, i.e. the first section of a profile
+    follows the last section of the previous profile.
+
+    Args:
+        profiles (list)     : The profiles list of the configuration.
+        profile_id (int)    : The profile ID, or None for all profiles.
+        section_id (int)    : The section ID, or None for all sections.
+
+    Returns:
+        range: The selected section IDs, or None if all sections are selected.
+    """
+
+    selected = None
+
+    # Select the sections of a single profile
+    if profile_id is not None:
+        if not 0 <= profile_id < len(profiles):
+            raise BuilderError(f"Profile with ID {profile_id} not found.")
+
+        start = sum(len(row) for row in profiles[:profile_id])
+        selected = range(start, start + len(profiles[profile_id]))
+
+    # Select a single section (of the profile)
+    if section_id is not None:
+        if selected is not None and section_id not in selected:
+            return range(0)
+        selected = range(section_id, section_id + 1)
+
+    return selected
+
+
+def paginate(logs, cursor=0, limit=None):
+    """Returns a page of log lines from an iterator.
+
+    Args:
+        logs (iterable) : The log lines with the cursor of the next line.
+        cursor (int)    : The cursor of the first line.
+        limit (int)     : The maximum number of lines, or None for all.
+
+    Returns:
+        dict: The log lines and the cursor of the next page (None if there are
+            no more lines).
+    """
+
+    if limit is not None and limit < 1:
+        raise BuilderError(f"Invalid limit {limit}.")
+
+    page = []
+    following = None
+
+    for line, position in logs:
+
+        # Continue after the last line of a full page
+        if limit is not None and len(page) == limit:
+            following = cursor
+            break
+
+        page.append(line)
+        cursor = position
+
+    return {
+        'logs': page,
+        'next': following
+    }
+
+
+class LogReader(object):
+    """Reads the log file page by page with the filters pushed down.
+
+    The log file is read lazily line by line. The position of a line is its
+    byte offset in the file, which is used as a cursor to continue reading
+    from the next line without reading the previous lines again. The lines
+    are filtered while reading, so only the matching lines are kept in
+    memory.
+
+    Attributes:
+        filepath (str) : The path of the log file.
+
+    Example:
+
+        from builder.logreader import LogReader
+
+        reader = LogReader('wall.log')
+
+        # Get the first 100 lines of the first day
+        page = reader.get_page(limit=100, day=1)
+
+        # Get the next 100 lines
+        page = reader.get_page(cursor=page['next'], limit=100, day=1)
+    """
+
+    def __init__(self, filepath):
+        """Initializes the log reader.
+
+        Args:
+            filepath (str) : The path of the log file.
+        """
+
+        self.filepath = filepath
+
+    @staticmethod
+    def match(line, day=None, section_ids=None, process=None):
+        """Checks if a log line matches the filters.
+
+        Args:
+            line (str)          : The log line.
+            day (int)           : The day, or None for all days.
+            section_ids (range) : The section IDs, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Returns:
+            bool: True if the line matches all filters.
+        """
+
+        # Check the process name (fourth column of the log format)
+        if process is not None:
+            columns = line.split(maxsplit=4)
+            if len(columns) < 4 or columns[3] != process:
+                return False
+
+        # Nothing else to check
+        if day is None and section_ids is None:
+            return True
+
+        # Check the build progress of the line
+        progress = PROGRESS.search(line)
+        if progress is None:
+            return False
+
+        if day is not None and int(progress['day']) != day:
+            return False
+
+        if section_ids is not None:
+            if int(progress['section_id']) not in section_ids:
+                return False
+
+        return True
+
+    def iter_logs(self, cursor=0, day=None, section_ids=None, process=None):
+        """Yields the matching log lines from a cursor.
+
+        Args:
+            cursor (int)        : The byte offset to start reading from.
+            day (int)           : The day, or None for all days.
+            section_ids (range) : The section IDs, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Yields:
+            tuple: The log line and the cursor of the next line.
+        """
+
+        # Nothing to read without a log file
+        if not os.path.isfile(self.filepath):
+            return
+
+        if cursor < 0:
+            raise BuilderError(f"Invalid cursor {cursor}.")
+
+        with open(self.filepath, 'rb') as file:
+            file.seek(cursor)
+
+            for data in file:
+                cursor += len(data)
+
+                # Skip a partly written last line
+                if not data.endswith(b'\n'):
+                    break
+
+                line = data.decode('utf-8', errors='replace').strip()
+                if self.match(line, day, section_ids, process):
+                    yield line, cursor
+
+    def get_page(self,
+                 cursor=0,
+                 limit=None,
+                 day=None,
+                 section_ids=None,
+                 process=None
+                 ):
+        """Returns a page of the matching log lines.
+
+        Args:
+            cursor (int)        : The byte offset to start reading from.
+            limit (int)         : The maximum number of lines, or None for all.
+            day (int)           : The day, or None for all days.
+            section_ids (range) : The section IDs, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Returns:
+            dict: The log lines and the cursor of the next page (None if there
+                are no more lines).
+        """
+
+        return paginate(
+            self.iter_logs(cursor, day, section_ids, process),
+            cursor=cursor,
+            limit=limit
+        )
+
+    def get_size(self):
+        """Returns the size of the log file in bytes (0 if missing)."""
+
+        if not os.path.isfile(self.filepath):
+            return 0
+
+        return os.path.getsize(self.filepath)
+
+    def get_tail(self,
+                 offset=0,
+                 limit=None,
+                 day=None,
+                 section_ids=None,
+                 process=None
+                 ):
+        """Returns the matching log lines appended since a byte offset.
+
+        Only the data after the offset is read, so polling the log file costs
+        as much as the new lines. The returned offset is the position after
+        the last complete line that was read, including the lines that did
+        not match the filters. A log file shorter than the offset has been
+        started anew and is read from the beginning.
+
+        Args:
+            offset (int)        : The byte offset of the previous call.
+            limit (int)         : The maximum number of lines, or None for all.
+            day (int)           : The day, or None for all days.
+            section_ids (range) : The section IDs, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Returns:
+            dict: The new log lines and the offset for the next call.
+        """
+
+        if offset < 0:
+            raise BuilderError(f"Invalid offset {offset}.")
+
+        if limit is not None and limit < 1:
+            raise BuilderError(f"Invalid limit {limit}.")
+
+        # The log file was started anew
+        if offset > self.get_size():
+            offset = 0
+
+        logs = []
+
+        if os.path.isfile(self.filepath):
+            with open(self.filepath, 'rb') as file:
+                file.seek(offset)
+
+                for data in file:
+
+                    # Skip a partly written last line
+                    if not data.endswith(b'\n'):
+                        break
+
+                    line = data.decode('utf-8', errors='replace').strip()
+                    if self.match(line, day, section_ids, process):
+
+                        # Resume from this line on the next call
+                        if limit is not None and len(logs) == limit:
+                            break
+
+                        logs.append(line)
+
+                    offset += len(data)
+
+        return {
+            'logs': logs,
+            'offset': offset
+        }
+
+
+class LogQueryMixin(object):
+    """Adds the log queries of the REST API to a wall builder.
+
+    The profile and section filters are resolved into global section IDs
+    from the configuration of the builder, and the log messages are read
+    from the record source of the builder. By default the source is the log
+    file at `log_filepath`. A builder that keeps its log in another form
+    overrides only `read_logs` and `read_tail`.
+
+    Example:
+
+        from builder.logreader import LogQueryMixin
+        from builder.manager import WallBuilderAbc
+
+        class Builder(LogQueryMixin, WallBuilderAbc):
+            log_filepath = 'wall.log'
+    """
+
+    def read_logs(self, cursor=0, day=None, section_ids=None, process=None):
+        """Yields the matching log messages of the builder from a cursor.
+
+        Args:
+            cursor (int)        : The byte offset to start reading from.
+            day (int)           : The day, or None for all days.
+            section_ids (range) : The section IDs, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Returns:
+            iterator: The log messages with the cursor of the next message.
+        """
+
+        return LogReader(self.log_filepath).iter_logs(
+            cursor, day, section_ids, process
+        )
+
+    def read_tail(self,
+                  offset=0,
+                  limit=None,
+                  day=None,
+                  section_ids=None,
+                  process=None
+                  ):
+        """Returns the matching log messages of the builder since an offset.
+
+        Args:
+            offset (int)        : The byte offset of the previous call.
+            limit (int)         : The maximum number of messages, or None.
+            day (int)           : The day, or None for all days.
+            section_ids (range) : The section IDs, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Returns:
+            dict: The new log messages and the offset for the next call.
+        """
+
+        return LogReader(self.log_filepath).get_tail(
+            offset, limit, day, section_ids, process
+        )
+
+    def iter_logs(self,
+                  cursor=0,
+                  day=None,
+                  profile_id=None,
+                  section_id=None,
+                  process=None
+                  ):
+        """Returns an iterator that reads the log messages lazily.
+
+        Args:
+            cursor (int)        : The cursor to start reading from.
+            day (int)           : The day, or None for all days.
+            profile_id (int)    : The profile ID, or None for all profiles.
+            section_id (int)    : The section ID, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Returns:
+            iterator: The log messages with the cursor of the next message.
+        """
+
+        section_ids = get_section_ids(
+            self.config.profiles, profile_id, section_id
+        )
+
+        return self.read_logs(cursor, day, section_ids, process)
+
+    def get_logs(self,
+                 cursor=0,
+                 limit=None,
+                 day=None,
+                 profile_id=None,
+                 section_id=None,
+                 process=None
+                 ):
+        """Get a page of the log messages.
+
+        Args:
+            cursor (int)        : The cursor to start reading from.
+            limit (int)         : The maximum number of messages, or None.
+            day (int)           : The day, or None for all days.
+            profile_id (int)    : The profile ID, or None for all profiles.
+            section_id (int)    : The section ID, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Returns:
+            dict: The log messages and the cursor of the next page.
+        """
+
+        return paginate(
+            self.iter_logs(cursor, day, profile_id, section_id, process),
+            cursor=cursor,
+            limit=limit
+        )
+
+    def tail_logs(self,
+                  offset=0,
+                  limit=None,
+                  day=None,
+                  profile_id=None,
+                  section_id=None,
+                  process=None
+                  ):
+        """Get the log messages appended since an offset.
+
+        Args:
+            offset (int)        : The offset returned by the previous call.
+            limit (int)         : The maximum number of messages, or None.
+            day (int)           : The day, or None for all days.
+            profile_id (int)    : The profile ID, or None for all profiles.
+            section_id (int)    : The section ID, or None for all sections.
+            process (str)       : The process name, or None for all processes.
+
+        Returns:
+            dict: The new log messages and the offset for the next call.
+        """
+
+        section_ids = get_section_ids(
+            self.config.profiles, profile_id, section_id
+        )
+
+        return self.read_tail(offset, limit, day, section_ids, process)
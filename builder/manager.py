@@ -1,22 +1,204 @@
 # encoding: utf-8
 from abc import ABC, abstractmethod
-from multiprocessing import Process, Pool, Queue, Manager, current_process
+from multiprocessing import Process, Pool, Queue, Event, Value, current_process
+from multiprocessing import resource_tracker, shared_memory
 from builder.errors import *
+from builder.defines import LOG_BATCH_SIZE, LOG_BUFFER_SIZE, LOG_FLUSH_INTERVAL
+from builder.defines import HEIGHT_TYPECODE, CHECKPOINT_COUNT, LOG_OPEN_TIMEOUT
 from builder.configurator import WallConfigurator
 from builder.validator import ConfigValidator
+from builder.table import WallTable
+from builder.histogram import WallHistogram
+from builder.worklog import WorkLog, WorkLogHandler, get_worklog_filepath
+from builder.logreader import LogQueryMixin
+from builder.snapshot import WallSnapshot
+from builder.state import SimulationState
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from queue import Empty
 
 import logging.handlers
 import logging
+import os
+import threading
 import time
 
+# NumPy is optional, the heights are built in pure Python without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class BatchQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that sends the log records in batches.
+
+    The records are collected in a list and the whole list is put on the
+    queue when the batch is full, when the oldest record is older than the
+    flush interval, or when the handler is flushed. This saves a round-trip
+    to the queue for each record.
+
+    Attributes:
+        batch_size (int)        : The maximum number of records per batch.
+        flush_interval (float)  : The maximum age of a batch in seconds.
+        buffer (list)           : The records waiting to be sent.
+    """
+
+    def __init__(self,
+                 queue,
+                 batch_size=LOG_BATCH_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL
+                 ):
+        """Initializes the batch queue handler.
+
+        Args:
+            queue (Queue)           : A queue to send the batches to.
+            batch_size (int)        : The maximum number of records per batch.
+            flush_interval (float)  : The maximum age of a batch in seconds.
+        """
+
+        # Initialize the parent class
+        super().__init__(queue)
+
+        # Set the instance attributes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.batch_time = 0.0
+
+    def enqueue(self, record):
+        """Adds a prepared record to the current batch."""
+
+        # Save the time of the first record in the batch
+        if not self.buffer:
+            self.batch_time = time.monotonic()
+
+        self.buffer.append(record)
+
+        # Send the batch when it is full or too old
+        if (len(self.buffer) >= self.batch_size or
+                time.monotonic() - self.batch_time >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Sends the current batch to the queue."""
+
+        self.acquire()
+        try:
+            if self.buffer:
+                self.queue.put_nowait(self.buffer)
+                self.buffer = []
+        finally:
+            self.release()
+
+    def close(self):
+        """Sends the last batch and closes the handler."""
+
+        self.flush()
+        super().close()
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that writes the log records through a large buffer.
+
+    The stream is not flushed after each record as with the FileHandler, but
+    only when the flush interval has passed or when the handler is flushed
+    or closed.
+
+    Attributes:
+        buffer_size (int)       : The size of the write buffer in bytes.
+        flush_interval (float)  : The maximum time between two flushes.
+    """
+
+    def __init__(self,
+                 filename,
+                 mode='w',
+                 buffer_size=LOG_BUFFER_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL
+                 ):
+        """Initializes the buffered file handler.
+
+        Args:
+            filename (str)          : The name of the log file.
+            mode (str)              : The mode to open the log file.
+            buffer_size (int)       : The size of the write buffer in bytes.
+            flush_interval (float)  : The maximum time between two flushes.
+        """
+
+        # Set the buffer before the parent class opens the file
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.flush_time = time.monotonic()
+
+        # Initialize the parent class
+        super().__init__(filename=filename, mode=mode)
+
+    def _open(self):
+        """Opens the log file with a large write buffer."""
+
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+
+    def emit(self, record):
+        """Writes a record to the buffer and flushes it periodically."""
+
+        try:
+
+            # Open the file on the first record (delayed handler)
+            if self.stream is None:
+                self.stream = self._open()
+
+            self.stream.write(self.format(record) + self.terminator)
+
+            # Flush the buffer periodically
+            if time.monotonic() - self.flush_time >= self.flush_interval:
+                self.flush()
+
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Writes the buffer to the file."""
+
+        self.flush_time = time.monotonic()
+        super().flush()
+
 
 class LogListener(Process):
     """Process that listens for log messages on a queue.
 
+    The listener accepts single log records and batches of log records (see
+    BatchQueueHandler). It takes up to `batch_size` items from the queue at
+    a time, writes them to the log file through a buffer and flushes the
+    buffer when the queue is idle. The work records attached to the log
+    records are also written to a binary work log if one is given, and its
+    index is written when no item arrives within the flush interval.
+
+    A long-lived listener reopens its log files on request (see reopen), so
+    each build can start new log files or append to the previous ones. The
+    work records handled since the files were opened are counted, so a build
+    can wait for the records of its workers (see wait_records).
+
     Attributes:
-        queue (Queue)   : A queue to receive log messages.
-        logfile (str)   : The name of the log file.
-        log (Logger)    : The root logger.
+        queue (Queue)       : A queue to receive log messages.
+        logfile (str)       : The name of the log file.
+        echo (bool)         : Also write the log messages to the console.
+        batch_size (int)    : The maximum number of items taken at a time.
+        worklog (str)       : The name of the binary work log, or None.
+        mode (str)          : The mode to open the log files ('w' or 'a').
+        opened (Event)      : Set when the log files have been reopened.
+        flushed (Event)     : Set when the log files have been written on
+                              request.
+        handled (Value)     : The work records handled since the files were
+                              opened.
+        log (Logger)        : The root logger.
 
 
     Example:
@@ -26,7 +208,7 @@ class LogListener(Process):
         queue = Queue()
 
         # Create a log listener process
-        listener = LogListener(queue)
+        listener = LogListener(queue, echo=True)
 
         # Apply the logging configuration (console and log file)
         listener.configure()
@@ -41,12 +223,24 @@ class LogListener(Process):
         listener.stop()
     """
 
-    def __init__(self, queue, logfile='listener.log'):
+    def __init__(self,
+                 queue,
+                 logfile='listener.log',
+                 echo=True,
+                 batch_size=LOG_BATCH_SIZE,
+                 worklog=None,
+                 mode='w'
+                 ):
         """Initializes the log listener process.
 
         Args:
-            queue (Queue)   : A queue to receive log messages.
-            logfile (str)   : The name of the log file.
+            queue (Queue)       : A queue to receive log messages.
+            logfile (str)       : The name of the log file.
+            echo (bool)         : Also write the log messages to the console.
+            batch_size (int)    : The maximum number of items taken at a time.
+            worklog (str)       : The name of the binary work log, or None.
+            mode (str)          : The mode to open the log files ('w' to
+                                  start new files, 'a' to append).
         """
 
         # Initialize the parent class
@@ -58,34 +252,124 @@ class LogListener(Process):
         # Set the log file name
         self.logfile = logfile
 
+        # Set the console output and the batch size
+        self.echo = echo
+        self.batch_size = batch_size
+
+        # Set the binary work log file name and the mode of the files
+        self.worklog = worklog
+        self.mode = mode
+
+        # Signal the reopened and written log files and the handled work
+        # records to the parent process
+        self.opened = Event()
+        self.flushed = Event()
+        self.handled = Value('q', 0)
+
         # Get the root logger
         self.log = logging.getLogger()
 
     def configure(self):
         """Configure the listener process to log to a file."""
 
-        # Define the message format
-        formatter = logging.Formatter(
-            '%(asctime)s %(levelname)-8s %(processName)-15s - %(message)s'
-        )
+        # Remove the queue handlers inherited from the parent process, which
+        # would send the handled records back to the queue
+        for handler in list(self.log.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                self.log.removeHandler(handler)
 
         # Add a console handler to the root logger
-        console_handler = logging.StreamHandler()
-
-        # Add a file handler to the root logger
-        file_handler = logging.FileHandler(
-            filename=self.logfile,
-            mode='w'
-        )
-
-        # Set the message format for the handlers
-        for handler in [console_handler, file_handler]:
-            handler.setFormatter(formatter)
+        if self.echo:
+            handler = logging.StreamHandler()
+            handler.setFormatter(self.get_formatter())
             self.log.addHandler(handler)
 
+        # Open the log files
+        self.open_files(self.mode)
+
         # Set the log level for the root logger
         self.log.setLevel(logging.INFO)
 
+    @staticmethod
+    def get_formatter():
+        """Returns the format of the log messages."""
+
+        return logging.Formatter(
+            '%(asctime)s %(levelname)-8s %(processName)-15s - %(message)s'
+        )
+
+    def open_files(self, mode='w'):
+        """Close the log files and open them again in the listener process.
+
+        Args:
+            mode (str) : The mode to open the log files ('w' or 'a').
+        """
+
+        # Write and close the open log files
+        for handler in list(self.log.handlers):
+            if isinstance(handler, (BufferedFileHandler, WorkLogHandler)):
+                self.log.removeHandler(handler)
+                handler.close()
+
+        # Add a buffered file handler to the root logger
+        handler = BufferedFileHandler(filename=self.logfile, mode=mode)
+        handler.setFormatter(self.get_formatter())
+        self.log.addHandler(handler)
+
+        # Add a handler for the binary work records
+        if self.worklog:
+            self.log.addHandler(WorkLogHandler(self.worklog, mode=mode + 'b'))
+
+        self.mode = mode
+        self.handled.value = 0
+
+    def reopen(self, mode='w', timeout=LOG_OPEN_TIMEOUT):
+        """Ask the running listener to reopen the log files.
+
+        The records sent before the request are written to the previous
+        files. The method waits until the files have been reopened, so the
+        records sent afterwards are written to the new files.
+
+        Args:
+            mode (str)      : The mode to open the log files ('w' or 'a').
+            timeout (float) : The maximum time to wait in seconds.
+        """
+
+        self.opened.clear()
+        self.queue.put(('open', mode))
+
+        if not self.opened.wait(timeout):
+            raise BuilderError("The log listener did not open the log files.")
+
+    def wait_records(self, count, timeout=LOG_OPEN_TIMEOUT):
+        """Wait until the listener has handled a number of work records.
+
+        The workers send their records through the feeder thread of the
+        queue, so the records of a task can arrive after its result. Once
+        the records are handled, the listener is asked to write the log
+        files and the index of the work log, so they can be read at once.
+
+        Args:
+            count (int)     : The number of work records since the files were
+                              opened.
+            timeout (float) : The maximum time to wait in seconds.
+
+        Returns:
+            bool: True if all records were handled before the timeout.
+        """
+
+        deadline = time.monotonic() + timeout
+        while self.handled.value < count:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+
+        # Write the buffered records and the index
+        self.flushed.clear()
+        self.queue.put(('flush',))
+
+        return self.flushed.wait(max(deadline - time.monotonic(), 0))
+
     def stop(self):
         """Stop the log listener process."""
 
@@ -95,6 +379,45 @@ class LogListener(Process):
         # Wait for the listener process to finish
         self.join()
 
+    def drain(self):
+        """Get the next items from the queue.
+
+        The method waits up to the flush interval for an item and then takes
+        up to `batch_size` items without blocking.
+
+        Returns:
+            list: The items taken from the queue, empty if the queue is idle.
+        """
+
+        # Wait for the next item
+        try:
+            items = [self.queue.get(timeout=LOG_FLUSH_INTERVAL)]
+        except Empty:
+            return []
+
+        # Take the available items without waiting
+        while len(items) < self.batch_size and items[-1] is not None:
+            try:
+                items.append(self.queue.get_nowait())
+            except Empty:
+                break
+
+        return items
+
+    def flush(self, force=False):
+        """Flush the buffers of the log handlers.
+
+        Args:
+            force (bool) : Also write the index of the work log regardless of
+                           its flush interval.
+        """
+
+        for handler in self.log.handlers:
+            if isinstance(handler, WorkLogHandler):
+                handler.flush(force)
+            else:
+                handler.flush()
+
     def run(self):
         """Process that listens for log messages on the queue."""
 
@@ -102,32 +425,71 @@ class LogListener(Process):
         self.configure()
 
         # Process messages from the queue
-        while True:
+        running = True
+        while running:
 
             try:
 
-                # Get the next log record from the queue
-                record = self.queue.get()
+                # Get the next log records from the queue
+                items = self.drain()
 
-                # Sentinel to tell the listener to quit
-                if record is None:
-                    break
+                for item in items:
+
+                    # Sentinel to tell the listener to quit
+                    if item is None:
+                        running = False
+                        break
+
+                    # Request to reopen the log files
+                    if isinstance(item, tuple) and item[0] == 'open':
+                        self.open_files(mode=item[1])
+                        self.opened.set()
+                        continue
+
+                    # Request to write the log files and the index
+                    if isinstance(item, tuple):
+                        self.flush(force=True)
+                        self.flushed.set()
+                        continue
+
+                    # Accept single records and batches of records
+                    records = item if isinstance(item, list) else [item]
+
+                    for record in records:
+
+                        # Get the sending logger (from any process)
+                        logger = logging.getLogger(record.name)
+
+                        # Handle the log record using the registered handlers
+                        logger.handle(record)
 
-                # Get the sending logger (from any process)
-                logger = logging.getLogger(record.name)
+                    # Count the work records of the batch
+                    with self.handled.get_lock():
+                        self.handled.value += sum(
+                            1 for record in records if hasattr(record, 'work')
+                        )
 
-                # Handle the log record using the registered log handlers
-                logger.handle(record)
+                # Write the buffers when the queue is idle, and the index of
+                # the work log when no item arrived
+                if len(items) < self.batch_size:
+                    self.flush(force=not items)
 
             # Handle exceptions gracefully
             except Exception as e:
                 self.log.error(f'Error in log listener: {e}', exc_info=True)
                 break
 
+        # Write the remaining records before the process exits
+        for handler in self.log.handlers:
+            handler.close()
+
 
 class WallBuilderAbc(ABC):
     """Abstract base class for the wall actors."""
 
+    # Allow the value types to have no instance dictionary
+    __slots__ = ()
+
     # All instances of the base class must share the same configuration
     config = WallConfigurator()
 
@@ -146,29 +508,53 @@ class WallBuilderAbc(ABC):
         return cls()
 
     @staticmethod
-    def prepare(queue):
+    def prepare(queue, batch_size=LOG_BATCH_SIZE, teams=None):
         """Prepares the process before the actual work.
 
         The prepare method might include setting up the logger, configuring the
         process, and other initialization tasks. The method is called before
         the actual work is done by the process (see the Pool constructor).
 
+        The process numbers keep growing with each new pool, so the workers
+        are named after their team in the pool when a counter is given.
+
         Args:
-            queue (Queue): A queue to receive log messages.
+            queue (Queue)       : A queue to receive log messages.
+            batch_size (int)    : The number of log messages sent at a time.
+            teams (Value)       : A counter of the workers started by the
+                                  pool, or None to keep the process names.
         """
 
+        # Number the worker from 1 to the number of teams of the pool
+        if teams is not None:
+            with teams.get_lock():
+                teams.value += 1
+                current_process().name = f'Worker-{teams.value}'
+
         # Get the root logger for the wall builder
         log = logging.getLogger()
 
         # Set the log level for the root logger
         log.setLevel(logging.INFO)
 
-        # Create a QueueHandler to send log messages to a queue
-        handler = logging.handlers.QueueHandler(queue)
+        # Remove the queue handlers inherited from the parent process
+        for handler in list(log.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                log.removeHandler(handler)
 
-        # Add the QueueHandler to the root logger
+        # Create a handler to send batches of log messages to a queue
+        handler = BatchQueueHandler(queue, batch_size=batch_size)
+
+        # Add the handler to the root logger
         log.addHandler(handler)
 
+    @staticmethod
+    def flush_logs():
+        """Sends the buffered log messages of the process to the queue."""
+
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+
     @abstractmethod
     def is_ready(self, *args, **kwargs):
         """Check if the wall is ready to be constructed."""
@@ -198,12 +584,16 @@ class WallBuilderAbc(ABC):
 class WallSection(WallBuilderAbc):
     """Represents a section of a wall.
 
+    The section is a compact value type without an instance dictionary. The
+    configuration and the validator are shared by all sections, and the
+    progress is logged by the caller of the build method.
+
     Attributes:
         section_id (int)    : The name of the wall section.
         profile_id (int)    : The profile ID of the wall section.
         start_height (int)  : The starting height of the wall section.
         current_height (int): The current height of the wall section.
-        log (Logger)        : The logger for the wall section.
+        day (int)           : The number of days the section was built.
 
     Example:
 
@@ -227,14 +617,24 @@ class WallSection(WallBuilderAbc):
         print(section.get_cost())
     """
 
+    __slots__ = (
+        'section_id',
+        'profile_id',
+        'start_height',
+        'current_height',
+        'day',
+    )
+
     # All instances must share the same configuration
     config = WallConfigurator()
 
+    # All instances share the same validator
+    validator = ConfigValidator()
+
     def __init__(self,
                  section_id=0,
                  profile_id=None,
-                 start_height=0,
-                 validator=ConfigValidator()
+                 start_height=0
                  ):
         """Initializes the wall section.
 
@@ -251,12 +651,31 @@ class WallSection(WallBuilderAbc):
         self.current_height = start_height
         self.day = 0
 
-        # Set the logger for the wall builder
-        self.log = logging.getLogger(self.__class__.__name__)
-        self.log.addHandler(logging.NullHandler())
+    @classmethod
+    def from_heights(cls,
+                     section_id,
+                     profile_id,
+                     start_height,
+                     current_height
+                     ):
+        """Creates a wall section from its start and current heights.
 
-        # Set the validator
-        self.validator = validator
+        Args:
+            section_id (int)    : The section identifier.
+            profile_id (int)    : The profile ID of the wall section.
+            start_height (int)  : The starting height of the wall section.
+            current_height (int): The current height of the wall section.
+
+        Returns:
+            WallSection: The wall section with the days it was built.
+        """
+
+        section = cls(section_id, profile_id, start_height)
+        section.current_height = current_height
+        section.day = -(-(current_height - start_height) //
+                        cls.config.build_rate)
+
+        return section
 
     def __eq__(self, other):
         """Check if two wall sections are equal."""
@@ -302,14 +721,19 @@ class WallSection(WallBuilderAbc):
         self.validator.check_primary_key(self.section_id)
         self.validator.check_foreign_key(self.profile_id)
 
-    def build(self, days=1):
+    def build(self, days=1, log=None):
         """Increment the section height with the build rate (foot/day).
 
         This method is part of a simulation process where each call to `build`
         increases the current height of the wall section by a predefined build
         rate. The method also renames the current worker process for better
-        identification and logs the progress of the construction. It simulates
-        time taken for the building process using a sleep function.
+        identification and logs the progress of the construction to the
+        logger of the caller. It simulates time taken for the building process
+        using a sleep function.
+
+        Args:
+            days (int)      : The number of days to build the section.
+            log (Logger)    : The logger of the build progress, or None.
 
         Returns:
             WallSection: The updated wall section instance.
@@ -326,20 +750,31 @@ class WallSection(WallBuilderAbc):
             if self.is_ready():
                 break
 
-            # Build the wall for the day
+            # Build the wall for the day up to the target height
             if self.current_height < self.config.target_height:
-                self.current_height += self.config.build_rate
+                self.current_height = min(
+                    self.current_height + self.config.build_rate,
+                    self.config.target_height
+                )
                 self.day += 1
 
                 # Log the build progress
-                self.log.info(f'Added 1 foot to section {self.section_id} to reach'
-                              f' {self.current_height} feet on day {self.day}')
+                if log is not None:
+                    log.info(f'Added 1 foot to section {self.section_id} to reach'
+                             f' {self.current_height} feet on day {self.day}',
+                             extra={'work': (
+                                 self.day,
+                                 self.profile_id,
+                                 self.section_id,
+                                 get_team(),
+                                 self.current_height
+                             )})
 
             # Simulate CPU work
             time.sleep(self.config.cpu_worktime)
 
-        # Cleanup the log handlers
-        self.log.handlers.clear()
+        # Send the buffered log messages of the task
+        self.flush_logs()
 
         # Return the updated wall section
         return self
@@ -352,6 +787,7 @@ class WallProfile(WallBuilderAbc):
         profile_id (int): The profile ID of the wall profile.
         sections (list): A list of wall sections in the profile.
         log (Logger): The logger for the wall profile.
+        section_log (Logger): The logger of the build progress of the sections.
 
     Example:
 
@@ -405,6 +841,9 @@ class WallProfile(WallBuilderAbc):
         self.log = logging.getLogger(self.__class__.__name__)
         self.log.addHandler(logging.NullHandler())
 
+        # Set the logger of the build progress of the sections
+        self.section_log = logging.getLogger(WallSection.__name__)
+
         # Set the validator
         self.validator = validator
 
@@ -444,6 +883,14 @@ class WallProfile(WallBuilderAbc):
         """Returns the total ice consumed by the wall profile."""
         return sum(section.get_ice() for section in self.sections)
 
+    def get_histogram(self):
+        """Returns the histogram of the start heights of the sections."""
+
+        return WallHistogram.from_heights(
+            heights=(section.start_height for section in self.sections),
+            target_height=self.config.target_height
+        )
+
     def get_cost(self):
         """Returns the total cost of the wall profile."""
         return self.get_ice() * self.config.cost_per_volume
@@ -477,24 +924,36 @@ class WallProfile(WallBuilderAbc):
         """Builds all sections in the wall profile by the build rate.
 
         This method builds each section in the wall profile by calling the
-        `build` method of each section. The method logs the progress of the
-        construction and returns the updated wall profile instance.
+        `build` method of each section. Only the unfinished sections are
+        built each day, and a section is dropped on the day it is finished,
+        so the work is proportional to the feet built. The method logs the
+        progress of the construction and returns the updated wall profile
+        instance.
+
+        Args:
+            days (int) : The number of days to build the profile.
 
         Returns:
             WallProfile: The updated wall profile instance.
         """
 
+        # Keep only the unfinished sections
+        active = [section for section in self.sections
+                  if not section.is_ready()]
+
         # Build each section in the wall profile
         for day in range(days):
 
             # Check if all sections are ready
-            if self.is_ready():
+            if not active:
                 break
 
-            # Build each section in the wall profile
-            for section in self.sections:
-                if not section.is_ready():
-                    section.build()
+            # Build each unfinished section for the day
+            for section in active:
+                section.build(log=self.section_log)
+
+            # Drop the sections finished on this day
+            active = [section for section in active if not section.is_ready()]
 
         # Cleanup the log handlers
         self.log.handlers.clear()
@@ -503,153 +962,570 @@ class WallProfile(WallBuilderAbc):
         return self
 
 
-class WallManager(WallBuilderAbc):
-    """Manages the construction of a wall.
+class WallProfileArray(WallBuilderAbc):
+    """Represents a profile of a wall as a slice of the global heights.
+
+    The start and current heights of all sections of the wall are kept in two
+    contiguous arrays of the wall manager. A profile keeps only its offset
+    and length in these arrays, and a histogram of the start heights of its
+    sections. Every section of a profile is built on the same days, so the
+    unfinished sections and the feet added to them follow from the histogram
+    and the number of days built. The ice, the cost and the readiness of a
+    profile are read from these counters instead of a list of section
+    objects.
 
     Attributes:
-        profiles (list): A list of wall profiles.
-        sections (list): A list of wall sections.
-        log (Logger): The logger for the wall builder.
+        profile_id (int)    : The profile ID of the wall profile.
+        offset (int)        : The ID of the first section of the profile.
+        length (int)        : The number of sections of the profile.
+        starts (array)      : The start heights of all sections of the wall.
+        heights (array)     : The current heights of all sections of the wall.
+        histogram (WallHistogram): The histogram of the start heights.
+        days (int)          : The number of days the profile was built.
+        remaining (int)     : The number of sections below the target height.
+        feet (int)          : The feet added to the sections of the profile.
+        config (WallConfigurator): The configuration of the profile (the
+                              shared configuration by default).
+        use_numpy (bool)    : Build the heights with NumPy (True if it is
+                              installed).
 
     Example:
 
-        from builder.manager import WallManager
-
-        # Define the wall configuration
-        config_list = [
-            [21, 25, 28],
-            [17],
-            [17, 22, 17, 19, 17, ]
-        ]
-
-        # Create a wall builder
-        builder = WallManager()
-
-        # Set the profiles' config list
-        builder.set_config_list(config_list)
+        from array import array
+        from builder.manager import WallProfileArray
 
-        # Build the wall
-        builder.build(num_teams=20, days=30)
+        # Share the heights of two profiles
+        starts = array('b', [21, 25, 28, 17])
+        heights = array('b', starts)
 
-        # Get the ice consumed by the wall
-        print(builder.get_ice())
+        # Build the second profile
+        profile = WallProfileArray(1, 3, 1, starts, heights).build(days=2)
 
-        # Get the cost of the wall
-        print(builder.get_cost())
+        # Get the ice consumed by the profile
+        print(profile.get_ice())
     """
 
+    # Build the heights with NumPy if it is installed
+    use_numpy = np is not None
+
     def __init__(self,
-                 log_filepath='wall.log',
-                 validator=ConfigValidator()
+                 profile_id=0,
+                 offset=0,
+                 length=0,
+                 starts=None,
+                 heights=None,
+                 histogram=None,
+                 config=None
                  ):
-        """Initializes the wall builder."""
-
-        # Set the instance attributes
-        self.profiles = []
-        self.sections = []
-
-        # Set the logger for the wall builder
-        self.log_filepath = log_filepath
-        self.log = logging.getLogger()
-        self.log.addHandler(logging.NullHandler())
-
-        # Set the validator
-        self.validator = validator
+        """Initializes the wall profile.
 
-    def parse_profile_list(self):
-        """Parse the configuration list to create wall sections.
+        Args:
+            profile_id (int)    : The profile ID of the wall profile.
+            offset (int)        : The ID of the first section of the profile.
+            length (int)        : The number of sections of the profile.
+            starts (array)      : The start heights of all sections.
+            heights (array)     : The current heights of all sections.
+            histogram (WallHistogram): The histogram of the start heights of
+                                  the profile, or None to count them.
+            config (WallConfigurator): The configuration of the wall (e.g.
+                                  of its manager), or None for the shared
+                                  configuration.
+        """
 
-        This method parses the configuration list to create wall sections. It
-        creates a wall profile for each row in the configuration list and
-        populates the sections with the start heights.
+        # Use the configuration of the wall instead of the shared one
+        if config is not None:
+            self.config = config
 
-        Returns:
-            WallManager: The updated wall manager instance
-        """
+        # Set the instance attributes
+        self.profile_id = profile_id
+        self.offset = offset
+        self.length = length
+        self.starts = array(HEIGHT_TYPECODE) if starts is None else starts
+        self.heights = heights
+
+        # Start from the start heights
+        if self.heights is None:
+            self.heights = array(HEIGHT_TYPECODE, self.starts)
+
+        # Count the sections by start height once
+        self.histogram = histogram
+        if self.histogram is None:
+            self.histogram = WallHistogram.from_heights(
+                heights=self.get_starts(),
+                target_height=self.config.target_height
+            )
 
-        # Helper variable to track the section ID
-        section_id = 0
+        # Count the unfinished sections and the feet added so far
+        self.update_aggregates()
 
-        # Clear the profiles and sections
-        self.profiles.clear()
-        self.sections.clear()
+    def __eq__(self, other):
+        """Check if two wall profiles are equal."""
+        return all([
+            self.profile_id == other.profile_id,
+            self.offset == other.offset,
+            self.get_starts() == other.get_starts(),
+            self.get_heights() == other.get_heights()
+        ])
 
-        # Parse the sections and profiles from the configuration list
-        for row in self.config.profiles:
+    def __ne__(self, other):
+        """Check if two wall profiles are not equal."""
+        return not self == other
 
-            profile_id = self.config.profiles.index(row)
-            profile = WallProfile(profile_id=profile_id)
+    def __repr__(self):
+        """Returns a string representation of the wall profile."""
 
-            # Extract the sections from the row
-            for column in row:
-                section = WallSection(
-                    section_id=section_id,
-                    profile_id=profile_id,
-                    start_height=column
+        return (f"WallProfileArray(profile_id={self.profile_id}, "
+                f"offset={self.offset}, "
+                f"length={self.length}, "
+                f"ice={self.get_ice()}, "
+                f"cost={self.get_cost()}, "
+                f"ready={self.is_ready()}"
+                f")"
                 )
-                profile.sections.append(section)
-                section_id += 1
 
-            # Create a wall profile from the sections
-            self.profiles.append(profile)
-            self.sections.extend(profile.sections)
+    @property
+    def sections(self):
+        """Returns the sections of the profile as WallSection values."""
 
-        return self
+        return [
+            WallSection.from_heights(
+                section_id=section_id,
+                profile_id=self.profile_id,
+                start_height=self.starts[section_id],
+                current_height=self.heights[section_id]
+            )
+            for section_id in range(self.offset, self.offset + self.length)
+        ]
 
-    def set_config_list(self, profiles_list):
-        """Set the profiles' list.
+    def get_starts(self):
+        """Returns a copy of the start heights of the profile."""
+        return self.starts[self.offset:self.offset + self.length]
 
-        Args:
-            profiles_list (list): A list of profiles.
+    def get_heights(self):
+        """Returns a copy of the current heights of the profile."""
+        return self.heights[self.offset:self.offset + self.length]
+
+    def update_aggregates(self):
+        """Counts the days built from the heights and updates the counters.
 
         Returns:
-            WallManager: The updated wall manager instance.
+            WallProfileArray: The updated wall profile instance.
         """
 
-        # Set the profiles and sections
-        self.config.profiles = profiles_list
+        build_rate = self.config.build_rate
 
-        return self
+        # The sections built the longest show the days of the profile
+        self.days = max(
+            (-(-(height - start) // build_rate)
+             for start, height in zip(self.get_starts(), self.get_heights())),
+            default=0
+        )
 
-    def update_profiles(self):
-        """Update the profiles after calculations.
+        return self.count_days()
 
-        This method is used to update the profiles after the calculations are
-        complete. It filters the sections based on the profile ID and assigns
-        the filtered sections to the profile.
+    def count_days(self):
+        """Counts the unfinished sections and the feet from the histogram.
 
         Returns:
-            WallManager: An instance of the WallManager class.
+            WallProfileArray: The updated wall profile instance.
         """
 
-        for profile in self.profiles:
-            profile_sections = list(
-                filter(lambda x: x.profile_id == profile.profile_id,
-                       self.sections)
-            )
-            profile.sections = profile_sections
+        build_rate = self.config.build_rate
+        grown = self.days * build_rate
+
+        # The sections lower than the grown feet are still unfinished
+        self.remaining = sum(
+            count for height, count in enumerate(self.histogram.counts)
+            if self.histogram.target_height - height > grown
+        )
+        self.feet = self.histogram.get_feet(self.days, build_rate)
 
         return self
 
-    def get_profile(self, profile_id):
-        """Get a profile by its ID.
+    def is_ready(self):
+        """Returns True if the wall profile is ready to be constructed."""
 
-        Args:
-            profile_id (int): The profile ID of the wall profile.
+        # Check if there are any sections
+        if not self.length:
+            return False
 
-        Returns:
-            WallProfile: The wall profile with the specified ID.
-        """
+        return not self.remaining
 
-        try:
-            return next(
-                profile for profile in self.profiles
-                if profile.profile_id == profile_id
-            )
+    def get_ice(self):
+        """Returns the total ice consumed by the wall profile."""
+        return self.feet * self.config.volume_ice_per_foot
+
+    def get_cost(self):
+        """Returns the total cost of the wall profile."""
+        return self.get_ice() * self.config.cost_per_volume
+
+    def get_histogram(self):
+        """Returns the histogram of the start heights of the sections."""
+        return self.histogram
+
+    def get_completion_day(self):
+        """Returns the day on which the last section of the profile is ready."""
+        return self.histogram.get_completion_day(self.config.build_rate)
+
+    def validate(self):
+        """Validates the wall profile and the start heights of its sections.
+
+        Raises:
+            BuilderValidationError: If an attribute's type or value is invalid.
+
+        Returns:
+            WallProfileArray: The validated wall profile instance.
+        """
+
+        # Check the instance attributes
+        WallSection.validator.check_primary_key(self.profile_id)
+        WallSection.validator.check_wall_profiles(range(self.length))
+
+        # Check the start height of each section
+        for height in self.get_starts():
+            WallSection.validator.check_height(height)
+
+        return self
+
+    def build(self, days=1):
+        """Builds the sections of the profile in the current process.
+
+        The heights are updated in place without logging or simulated work,
+        the wall manager builds its sections with a pool of workers instead.
+        Each section grows by the build rate on every day up to the target
+        height, so its height after n days is computed at once. The slice of
+        the heights is updated with a single vectorized operation if NumPy is
+        installed and section by section otherwise.
+
+        Args:
+            days (int) : The number of days to build the profile.
+
+        Returns:
+            WallProfileArray: The updated wall profile instance.
+        """
+
+        target_height = self.config.target_height
+        build_rate = self.config.build_rate
+        end = self.offset + self.length
+
+        # Build the whole slice with NumPy if it is installed
+        if self.use_numpy and self.length:
+            heights = np.frombuffer(self.heights, dtype=HEIGHT_TYPECODE)
+            heights = heights[self.offset:end]
+            built = np.minimum(
+                heights.astype(np.int64) + days * build_rate, target_height
+            )
+            heights[:] = np.where(heights < target_height, built, heights)
+
+        # Build each section until it is ready otherwise
+        else:
+            for section_id in range(self.offset, end):
+                height = self.heights[section_id]
+                if height < target_height:
+                    self.heights[section_id] = min(
+                        height + days * build_rate, target_height
+                    )
+
+        # Count the work of the days from the histogram
+        self.days = min(self.days + days, self.get_completion_day())
+        return self.count_days()
+
+
+class WallManager(LogQueryMixin, WallBuilderAbc):
+    """Manages the construction of a wall.
+
+    The start and current heights of the sections are kept in two contiguous
+    arrays in the global section order. Each profile is a slice of these
+    arrays, so a profile is aggregated without looking at the other sections.
+
+    Attributes:
+        profiles (list): A list of wall profiles (WallProfileArray).
+        starts (array): The start height of each section.
+        heights (array): The current height of each section.
+        profile_index (dict): The wall profiles by profile ID.
+        section_profiles (array): The profile ID of each section.
+        remaining (int): The number of sections below the target height.
+        feet (int): The feet added to all sections.
+        daily_feet (array): The feet added on each day of the build.
+        work_count (int): The work records logged by the workers since the
+            start of the last build.
+        checkpoints (OrderedDict): The heights by fingerprint and day.
+        checkpoint_params (dict): The parameters of the configuration of the
+            checkpoints by fingerprint.
+        max_checkpoints (int): The maximum number of checkpoints.
+        log_day (tuple): The fingerprint and the last day of the progress
+            in the log files, or None if they do not start at day 1.
+        state_filepath (str): The file of the durable state, or None.
+        table (WallTable): The cumulative ice per day and profile.
+        pool (WallPool): A long-lived pool of workers, or None.
+        log (Logger): The logger for the wall builder.
+
+    Example:
+
+        from builder.manager import WallManager
+
+        # Define the wall configuration
+        config_list = [
+            [21, 25, 28],
+            [17],
+            [17, 22, 17, 19, 17, ]
+        ]
+
+        # Create a wall builder
+        builder = WallManager()
+
+        # Set the profiles' config list
+        builder.set_config_list(config_list)
+
+        # Build the wall
+        builder.build(num_teams=20, days=30)
+
+        # Get the ice consumed by the wall
+        print(builder.get_ice())
+
+        # Get the cost of the wall
+        print(builder.get_cost())
+    """
+
+    def __init__(self,
+                 log_filepath='wall.log',
+                 validator=ConfigValidator(),
+                 pool=None,
+                 max_checkpoints=CHECKPOINT_COUNT,
+                 state_filepath=None
+                 ):
+        """Initializes the wall builder.
+
+        Args:
+            log_filepath (str)  : The path to the log file.
+            validator (ConfigValidator) : The configuration validator.
+            pool (WallPool)     : A long-lived pool of workers. A new pool is
+                                  created for each build if not given.
+            max_checkpoints (int) : The maximum number of checkpoints kept
+                                  (0 to build every day from the start).
+            state_filepath (str) : The file to save the state after each
+                                  build and to restore it before the first
+                                  build, or None.
+        """
+
+        # Set the instance attributes
+        self.profiles = []
+        self.starts = array(HEIGHT_TYPECODE)
+        self.heights = array(HEIGHT_TYPECODE)
+        self.profile_index = {}
+        self.section_profiles = array('i')
+        self.remaining = 0
+        self.feet = 0
+        self.daily_feet = array('i')
+        self.work_count = 0
+        self.checkpoints = OrderedDict()
+        self.checkpoint_params = {}
+        self.max_checkpoints = max_checkpoints
+        self.log_day = None
+        self.state_filepath = state_filepath
+        self.table = None
+        self.pool = pool
+
+        # The result of the last build (read without the lock)
+        self.snapshot = None
+
+        # Protect the sections and profiles shared by the threads
+        self.lock = threading.RLock()
+
+        # Set the logger for the wall builder
+        self.log_filepath = log_filepath
+        self.log = logging.getLogger()
+        self.log.addHandler(logging.NullHandler())
+
+        # Set the validator
+        self.validator = validator
+
+    @property
+    def sections(self):
+        """Returns the sections of the wall as WallSection values."""
+        return [section for profile in self.profiles
+                for section in profile.sections]
+
+    def parse_profile_list(self):
+        """Parse the configuration list into the arrays of heights.
+
+        This method copies the start heights of the configuration list into
+        the contiguous arrays of heights and creates a wall profile with the
+        offset and length of each row in the configuration list. The indexes
+        of the profiles and of the profile of each section and the histogram
+        of each profile are built at the same time, so the lookups by ID take
+        constant time and the totals are read from the histograms.
+
+        Returns:
+            WallManager: The updated wall manager instance
+        """
+
+        # Clear the profiles, the arrays of heights and the indexes
+        self.profiles = []
+        self.starts = array(HEIGHT_TYPECODE)
+        self.profile_index = {}
+        self.section_profiles = array('i')
+
+        # Copy the start heights of the configuration list
+        offsets = []
+        for profile_id, row in enumerate(self.config.profiles):
+            offsets.append(len(self.starts))
+            try:
+                self.starts.extend(row)
+            except OverflowError:
+                raise BuilderValidationError(
+                    info=f"Invalid start height in profile {profile_id}"
+                )
+        offsets.append(len(self.starts))
+
+        # Start the current heights from the start heights
+        self.heights = array(HEIGHT_TYPECODE, self.starts)
+
+        # Create a wall profile from the slice of each row
+        for profile_id, offset in enumerate(offsets[:-1]):
+            profile = WallProfileArray(
+                profile_id=profile_id,
+                offset=offset,
+                length=offsets[profile_id + 1] - offset,
+                starts=self.starts,
+                heights=self.heights,
+                histogram=WallHistogram.from_heights(
+                    heights=self.starts[offset:offsets[profile_id + 1]],
+                    target_height=self.config.target_height
+                ),
+                config=self.config
+            )
+            self.profiles.append(profile)
+
+            # Index the profile and map its sections to it
+            self.profile_index[profile_id] = profile
+            self.section_profiles.extend([profile_id] * profile.length)
+
+        # Count the unfinished sections and the ice per day of the wall
+        self.update_aggregates()
+
+        return self
+
+    def update_aggregates(self):
+        """Count the unfinished sections and the feet added on each day.
+
+        The counters are updated once after the heights change, so the
+        readiness, the ice and the ice of a day are read in constant time.
+        Each section is built by the build rate on every day until it is
+        ready, so the counters of a profile follow from the histogram of its
+        start heights and the number of days it was built.
+
+        Returns:
+            WallManager: The updated wall manager instance.
+        """
+
+        # Count the days built of each profile from its heights
+        for profile in self.profiles:
+            profile.update_aggregates()
+
+        return self.update_totals()
+
+    def update_totals(self):
+        """Total the counters of the profiles and the feet of each day.
+
+        Returns:
+            WallManager: The updated wall manager instance.
+        """
+
+        # Total the counters of the profiles
+        self.remaining = sum(profile.remaining for profile in self.profiles)
+        self.feet = sum(profile.feet for profile in self.profiles)
+
+        # Total the feet of each day from the histograms
+        build_rate = self.config.build_rate
+        days = max((profile.days for profile in self.profiles), default=0)
+        self.daily_feet = array('i', (
+            sum(profile.histogram.get_daily_feet(day, build_rate)
+                for profile in self.profiles if profile.days >= day)
+            for day in range(1, days + 1)
+        ))
+
+        return self
+
+    def set_config_list(self, profiles_list):
+        """Set the profiles' list.
+
+        Args:
+            profiles_list (list): A list of profiles.
+
+        Returns:
+            WallManager: The updated wall manager instance.
+        """
+
+        # Set the profiles and sections
+        self.config.profiles = profiles_list
+
+        return self
+
+    def get_histograms(self):
+        """Get the histogram of the start heights for each profile.
+
+        The histograms are counted once when the profile list is parsed, so
+        no wall sections are created.
+
+        Returns:
+            list: The histogram of each profile.
+        """
+        return [profile.histogram for profile in self.profiles]
+
+    def get_completion_day(self, profile_id=None):
+        """Get the day on which the wall (or a profile) is completed.
+
+        Args:
+            profile_id (int): The profile ID, or None for the whole wall.
+
+        Returns:
+            int: The completion day.
+        """
+
+        # Get the completion day of a single profile
+        if profile_id is not None:
+            return self.get_profile(profile_id).get_completion_day()
+
+        return max(
+            (profile.get_completion_day() for profile in self.profiles),
+            default=0
+        )
+
+    def get_table(self):
+        """Get the table with the cumulative ice per day and profile.
+
+        The table is materialized once per configuration and reused until the
+        fingerprint of the configuration changes.
+
+        Returns:
+            WallTable: The table of the current configuration.
+        """
+
+        # Materialize the table anew only if the configuration changed (the
+        # profiles that did not change are copied from the previous table)
+        fingerprint = self.config.get_fingerprint()
+        if self.table is None or self.table.fingerprint != fingerprint:
+            self.table = WallTable.from_config(self.config, self.table)
+
+        return self.table
+
+    def get_profile(self, profile_id):
+        """Get a profile by its ID.
+
+        Args:
+            profile_id (int): The profile ID of the wall profile.
 
-        except StopIteration:
+        Returns:
+            WallProfileArray: The wall profile with the specified ID.
+        """
+
+        profile = self.profile_index.get(profile_id)
+        if profile is None:
             raise BuilderError(f"Profile with ID {profile_id} not found.")
 
+        return profile
+
     def get_section(self, section_id):
         """Get a section by its ID.
 
@@ -660,49 +1536,77 @@ class WallManager(WallBuilderAbc):
             WallSection: The wall section with the specified ID.
         """
 
-        try:
-            return next(
-                section for section in self.sections
-                if section.section_id == section_id
-            )
-
-        except StopIteration:
+        # The sections are numbered by their position in the arrays
+        if not isinstance(section_id, int) or \
+                not 0 <= section_id < len(self.starts):
             raise BuilderError(f"Section with ID {section_id} not found.")
 
-    def get_logs(self):
-        """Get the log messages from a file."""
+        return WallSection.from_heights(
+            section_id=section_id,
+            profile_id=self.section_profiles[section_id],
+            start_height=self.starts[section_id],
+            current_height=self.heights[section_id]
+        )
 
-        logs = []
+    def get_worklog(self):
+        """Get the binary work log written next to the log file.
 
-        with open(self.log_filepath, 'r') as file:
-            for line in file:
-                logs.append(line.strip())
+        Returns:
+            WorkLog: The reader of the work records.
+        """
+        return WorkLog(get_worklog_filepath(self.log_filepath))
 
-        # Convert the logs to a dictionary
-        logs = {
-            'logs': logs
-        }
+    def is_ready(self, profile_id=None):
+        """Check if all wall sections (of a profile) are ready."""
 
-        return logs
-
-    def is_ready(self):
-        """Check if all wall sections are ready."""
+        # Check a single profile
+        if profile_id is not None:
+            return self.get_profile(profile_id).is_ready()
 
         # Check if there are any sections
-        if not self.sections:
+        if not self.heights:
             return False
 
         # Check if all sections are ready
         else:
-            return all(section.is_ready() for section in self.sections)
+            return not self.remaining
 
-    def get_ice(self):
-        """Get the total ice consumed by the wall."""
-        return sum(section.get_ice() for section in self.sections)
+    def get_ice(self, profile_id=None):
+        """Get the total ice consumed by the wall (or by a profile)."""
 
-    def get_cost(self):
-        """Get the total cost of the wall."""
-        return sum(section.get_cost() for section in self.sections)
+        # Get the ice of a single profile
+        if profile_id is not None:
+            return self.get_profile(profile_id).get_ice()
+
+        return self.feet * self.config.volume_ice_per_foot
+
+    def get_daily_ice(self, day):
+        """Get the ice consumed by the wall on a day of the last build.
+
+        Args:
+            day (int): The day of the build, starting from 1.
+
+        Returns:
+            int: The ice consumed on the day (0 after the last day of work).
+        """
+
+        if not isinstance(day, int) or day < 1:
+            raise BuilderError(f"Invalid day {day}.")
+
+        # No work after the last day of the build
+        if day > len(self.daily_feet):
+            return 0
+
+        return self.daily_feet[day - 1] * self.config.volume_ice_per_foot
+
+    def get_cost(self, profile_id=None):
+        """Get the total cost of the wall (or of a profile)."""
+
+        # Get the cost of a single profile
+        if profile_id is not None:
+            return self.get_profile(profile_id).get_cost()
+
+        return self.get_ice() * self.config.cost_per_volume
 
     def validate(self):
         """Validate the wall builder configuration.
@@ -747,59 +1651,805 @@ class WallManager(WallBuilderAbc):
             WallManager: The updated wall builder instance.
         """
 
-        # Set the name of the current process
-        current_process().name = 'Manager'
+        with self.lock:
+
+            # Set the name of the current process
+            current_process().name = 'Manager'
+
+            # Restore the checkpoints saved before a restart
+            if self.state_filepath and not self.checkpoints:
+                self.load_state(self.state_filepath)
 
-        # Create a manager to share the log queue
-        with Manager() as manager:
+            # Reuse the long-lived pool of workers if available
+            if self.pool is not None:
+                self.build_with_pool(days=days, num_teams=num_teams)
+            else:
+                self.build_with_processes(days=days, num_teams=num_teams)
 
-            # Create a shared log queue
-            queue = manager.Queue()
+            # Publish the result of the build
+            self.snapshot = self.get_snapshot(days=days, num_teams=num_teams)
 
-            # Prepare the process (logger configuration, etc.)
-            self.prepare(queue)
+            # Save the state for the next start
+            if self.state_filepath:
+                self.save_state(self.state_filepath)
+
+        # Return the updated wall builder
+        return self
+
+    def build_snapshot(self, days=1, num_teams=1):
+        """Build the wall and return the snapshot of this build.
+
+        The build and the snapshot are taken under the lock of the manager,
+        so concurrent callers always get the snapshot of their own build.
+
+        Args:
+            days (int)      : The number of days to build the wall.
+            num_teams (int) : The number of construction teams.
+
+        Returns:
+            WallSnapshot: The immutable result of the build.
+        """
+
+        with self.lock:
+            return self.build(days=days, num_teams=num_teams).snapshot
+
+    def build_profiles(self, days=1):
+        """Build the wall in the current process without workers or logs.
+
+        The profiles are built from their start heights with the vectorized
+        build of the wall profiles, so what-if analyses over walls with
+        millions of sections take a single pass over the heights. No work is
+        simulated or logged and the checkpoints are left unchanged.
+
+        Args:
+            days (int) : The number of days to build the wall.
+
+        Returns:
+            WallManager: The updated wall manager instance.
 
-            # Start the log consumer process
-            log_listener = LogListener(
-                queue=queue,
-                logfile=self.log_filepath
+        Example:
+
+            from builder.manager import WallManager
+            from builder.configurator import WallConfigurator
+
+            # Define a wall with a million sections
+            config = WallConfigurator(profiles=[[0] * 10 ** 6])
+
+            # Build the wall for ten days
+            manager = WallManager.set_config(config).build_profiles(days=10)
+
+            # Get the cost of the wall
+            print(manager.get_cost())
+        """
+
+        with self.lock:
+
+            # Start every profile from its start heights
+            self.parse_profile_list()
+
+            # Build each profile and total the counters of the profiles
+            for profile in self.profiles:
+                profile.build(days)
+            self.update_totals()
+
+            # Publish the result of the build
+            self.snapshot = self.get_snapshot(days=days)
+
+        return self
+
+    def get_snapshot(self, days=0, num_teams=1):
+        """Take an immutable snapshot of the current heights.
+
+        Args:
+            days (int)      : The number of days of the build.
+            num_teams (int) : The number of teams of the build.
+
+        Returns:
+            WallSnapshot: The snapshot of the profiles.
+        """
+
+        with self.lock:
+            return WallSnapshot.from_rows(
+                starts=[profile.get_starts() for profile in self.profiles],
+                heights=[profile.get_heights() for profile in self.profiles],
+                config=self.config,
+                days=days,
+                num_teams=num_teams
             )
-            log_listener.start()
 
-            # Parse the profile list anew to get any changes
+    def build_with_processes(self, days=1, num_teams=1):
+        """Build the wall with a new log listener and pool of workers.
+
+        Args:
+            days (int)      : The number of days to build the wall.
+            num_teams (int) : The number of construction teams.
+
+        Returns:
+            WallManager: The updated wall builder instance.
+        """
+
+        # Parse the profile list anew to get any changes
+        self.parse_profile_list()
+
+        # Answer from a checkpoint without workers or new logs
+        resume = self.load_resume(days)
+        if resume[0] == days and not resume[1]:
+            return self
+
+        # Create the log queue (inherited by the workers at start)
+        queue = Queue()
+
+        # Prepare the process (logger configuration, etc.)
+        self.prepare(queue)
+
+        # Start the log consumer process (appending to resumed logs)
+        log_listener = LogListener(
+            queue=queue,
+            logfile=self.log_filepath,
+            echo=False,
+            worklog=get_worklog_filepath(self.log_filepath),
+            mode=resume[2]
+        )
+        log_listener.start()
+
+        # Share the tracker of the shared arrays with the workers
+        resource_tracker.ensure_running()
+
+        # Create a pool of workers
+        initargs = (queue, LOG_BATCH_SIZE, Value('i', 0))
+        with Pool(num_teams, WallSection.prepare, initargs) as pool:
+
+            # Save the start timestamp
+            start_time = time.time()
+
+            # Map a section from a profile to a worker team
+            self.resume_sections(
+                starmap=pool.starmap,
+                days=days,
+                num_teams=num_teams,
+                resume=resume
+            )
+
+            # Save the end timestamp
+            end_time = time.time()
+
+            # Let the workers send their last log messages before exiting
+            pool.close()
+            pool.join()
+
+        # Log the results
+        self.log.debug(f'TOTAL TIME : {end_time - start_time:.2f} seconds')
+
+        # Stop the log listener process
+        self.flush_logs()
+        log_listener.stop()
+
+        # Release the log queue
+        queue.close()
+        queue.join_thread()
+
+        # Cleanup the log handlers
+        self.log.handlers.clear()
+
+        # Return the updated wall builder
+        return self
+
+    def load_checkpoint(self, days):
+        """Restore the heights of the latest checkpoint up to a day.
+
+        Args:
+            days (int) : The day of the build.
+
+        Returns:
+            int: The day of the restored checkpoint, or 0 if there is none.
+        """
+
+        fingerprint = self.config.get_fingerprint()
+
+        # Find the latest checkpoint not after the day
+        day = max(
+            (day for key, day in self.checkpoints
+             if key == fingerprint and day <= days),
+            default=0
+        )
+        if not day:
+            return 0
+
+        # Mark the checkpoint as recently used
+        self.checkpoints.move_to_end((fingerprint, day))
+
+        # Copy the heights in place (shared with the profiles)
+        self.heights[:] = array(
+            HEIGHT_TYPECODE, self.checkpoints[fingerprint, day]
+        )
+        self.update_aggregates()
+
+        return day
+
+    def load_changed_checkpoint(self, days):
+        """Restore the unchanged profiles from a checkpoint of another config.
+
+        A section is built the same way whatever the other sections are, so
+        the profiles that did not change since a checkpoint of an earlier
+        configuration keep their heights of that checkpoint. Only the
+        sections of the changed profiles must be built from the start.
+
+        Args:
+            days (int) : The day of the build.
+
+        Returns:
+            tuple: The day of the restored checkpoint (0 if there is none) and
+                the runs of sections (offset and length) to build up to it.
+        """
+
+        # Find the latest checkpoint of a configuration with other profiles
+        found = None
+        for key, day in self.checkpoints:
+            params = self.checkpoint_params.get(key)
+            if params is None or day > days or (found and found[1] >= day):
+                continue
+
+            changed = self.config.get_changed_profiles(params)
+            if changed is not None:
+                found = key, day, params, set(changed)
+
+        if found is None:
+            return 0, []
+
+        key, day, params, changed = found
+
+        # Mark the checkpoint as recently used
+        self.checkpoints.move_to_end((key, day))
+        heights = array(HEIGHT_TYPECODE, self.checkpoints[key, day])
+
+        # Copy the heights of the unchanged profiles (shared with the profiles)
+        ranges = []
+        offset = 0
+        for profile_id, row in enumerate(params['profiles']):
+            profile = self.profile_index.get(profile_id)
+            if profile_id not in changed:
+                self.heights[profile.offset:profile.offset + profile.length] = \
+                    heights[offset:offset + profile.length]
+            elif profile is not None and profile.length:
+                ranges.append((profile.offset, profile.length))
+            offset += len(row)
+
+        # Build the added profiles as well
+        for profile in self.profiles[len(params['profiles']):]:
+            if profile.length:
+                ranges.append((profile.offset, profile.length))
+
+        # The changed profiles are built from the start heights
+        for offset, length in ranges:
+            self.heights[offset:offset + length] = \
+                self.starts[offset:offset + length]
+
+        self.update_aggregates()
+
+        return day, ranges
+
+    def save_checkpoint(self, day):
+        """Save the current heights as the checkpoint of a day.
+
+        The least recently used checkpoints are evicted beyond the maximum
+        number of checkpoints.
+
+        Args:
+            day (int) : The day of the current heights.
+
+        Returns:
+            WallManager: The updated wall manager instance.
+        """
+
+        # Nothing to save without days or checkpoints
+        if not day or self.max_checkpoints < 1:
+            return self
+
+        key = self.config.get_fingerprint(), day
+        self.checkpoints[key] = self.heights.tobytes()
+        self.checkpoints.move_to_end(key)
+        if key[0] not in self.checkpoint_params:
+            self.checkpoint_params[key[0]] = self.config.copy_params()
+
+        # Evict the oldest checkpoints
+        while len(self.checkpoints) > self.max_checkpoints:
+            self.checkpoints.popitem(last=False)
+
+        # Forget the configurations without checkpoints
+        fingerprints = {fingerprint for fingerprint, _ in self.checkpoints}
+        for fingerprint in list(self.checkpoint_params):
+            if fingerprint not in fingerprints:
+                del self.checkpoint_params[fingerprint]
+
+        return self
+
+    def get_log_day(self):
+        """Get the last day of the progress in the log files.
+
+        Returns:
+            int: The last day of the builds of the current configuration in
+                the log files, or 0 if they do not hold its days from day 1.
+        """
+
+        # The log files were started for another configuration
+        if self.log_day is None:
+            return 0
+
+        fingerprint, day = self.log_day
+        return day if fingerprint == self.config.get_fingerprint() else 0
+
+    def load_resume(self, days):
+        """Restore the heights to resume a build from and choose the log mode.
+
+        A build resumes from the latest checkpoint only if the log files hold
+        the progress up to its day, so the progress of the missing days is
+        appended to them. Otherwise it resumes from the checkpoint of the
+        last day in the log files, or it starts from the first day in new log
+        files. A request for the day of a checkpoint is answered from it and
+        the log files are left as they are.
+
+        Args:
+            days (int) : The day of the build.
+
+        Returns:
+            tuple: The day to resume from, the runs of sections (offset and
+                length) to build up to it and the mode of the log files ('w'
+                to start new files, 'a' to append to them).
+        """
+
+        # Resume from the latest checkpoint
+        start_day = self.load_checkpoint(days)
+        if start_day == days:
+            return start_day, [], 'a'
+
+        # Resume from the last day in the log files instead
+        log_day = self.get_log_day()
+        if start_day and start_day != log_day:
+            if 0 < log_day < days and self.load_checkpoint(log_day) == log_day:
+                return log_day, [], 'a'
+
+            # Start from the first day in new log files
+            self.heights[:] = self.starts
+            self.update_aggregates()
+            return 0, [], 'w'
+
+        if start_day:
+            return start_day, [], 'a'
+
+        # Catch up the changed profiles of an earlier configuration
+        start_day, ranges = self.load_changed_checkpoint(days)
+        return start_day, ranges, 'w'
+
+    def resume_sections(self, starmap, days=1, num_teams=1, resume=None):
+        """Build the sections from the latest checkpoint up to a day.
+
+        Only the days after the checkpoint are simulated, e.g. a build of
+        day 12 after a build of day 10 simulates days 11 and 12. Without a
+        checkpoint of the configuration, a checkpoint of a configuration with
+        other profiles is used, and only the changed profiles are simulated
+        up to its day. The heights of the day are saved as a new checkpoint.
+
+        Args:
+            starmap (callable)  : The starmap function of a pool.
+            days (int)          : The number of days to build the wall.
+            num_teams (int)     : The number of construction teams.
+            resume (tuple)      : The result of load_resume, or None to
+                                  restore the checkpoint here.
+
+        Returns:
+            WallManager: The updated wall builder instance.
+        """
+
+        # Resume from the latest checkpoint
+        if resume is None:
+            resume = self.load_resume(days)
+
+        start_day, ranges, _ = resume
+
+        # Catch up the changed profiles of an earlier configuration
+        if ranges:
+            self.build_sections(
+                starmap=starmap,
+                days=start_day,
+                num_teams=num_teams,
+                ranges=ranges
+            )
+
+        # Simulate the missing days
+        if days > start_day:
+            self.build_sections(
+                starmap=starmap,
+                days=days - start_day,
+                num_teams=num_teams,
+                start_day=start_day
+            )
+
+        # The log files hold every day only without a catch-up
+        if ranges:
+            self.log_day = None
+        elif days > start_day:
+            self.log_day = self.config.get_fingerprint(), days
+
+        return self.save_checkpoint(days)
+
+    def save_state(self, filepath):
+        """Save the heights and the checkpoints to a state file.
+
+        Only the checkpoints of the current configuration are saved. The
+        heights and the checkpoints are written as flat arrays, so the file
+        is compact and quick to restore.
+
+        Args:
+            filepath (str) : The path of the state file.
+
+        Returns:
+            WallManager: The wall manager instance.
+        """
+
+        with self.lock:
+            fingerprint = self.config.get_fingerprint()
+
+            # Concatenate the checkpoints of the configuration
+            days = array('i')
+            checkpoints = array(HEIGHT_TYPECODE)
+            for (key, day), heights in self.checkpoints.items():
+                if key == fingerprint:
+                    days.append(day)
+                    checkpoints.frombytes(heights)
+
+            SimulationState(
+                fingerprint=fingerprint,
+                day=self.snapshot.days if self.snapshot else 0,
+                num_teams=self.snapshot.num_teams if self.snapshot else 0,
+                arrays={
+                    'heights': self.heights,
+                    'days': days,
+                    'checkpts': checkpoints,
+                    'logday': array('i', [self.get_log_day()]),
+                }
+            ).save(filepath)
+
+        return self
+
+    def load_state(self, filepath):
+        """Restore the heights and the checkpoints from a state file.
+
+        The state is ignored if the file is missing or was saved for another
+        configuration. A state file that is invalid or does not match the
+        sections of the configuration is discarded with a warning. The
+        snapshot of the saved build is published, so the results are
+        available without building the wall again.
+
+        Args:
+            filepath (str) : The path of the state file.
+
+        Returns:
+            bool: True if the state was restored.
+        """
+
+        # Nothing to restore before the first build
+        if not os.path.exists(filepath):
+            return False
+
+        with self.lock:
+            try:
+                state = SimulationState.load(filepath)
+            except BuilderError as e:
+                SimulationState.discard(filepath, e)
+                return False
+
+            # Ignore the state of another configuration
+            fingerprint = self.config.get_fingerprint()
+            if state.fingerprint != fingerprint:
+                return False
+
+            # Check the state matches the sections
             self.parse_profile_list()
+            count = len(self.heights)
+            try:
+                heights = state.arrays['heights']
+                days = state.arrays['days']
+                checkpoints = state.arrays['checkpts']
+                valid = all([
+                    heights.typecode == checkpoints.typecode == HEIGHT_TYPECODE,
+                    len(heights) == count,
+                    len(checkpoints) == count * len(days),
+                ])
+            except KeyError:
+                valid = False
+
+            if not valid:
+                SimulationState.discard(filepath, "The sections do not match.")
+                return False
+
+            # Restore the checkpoints of the configuration
+            self.checkpoint_params[fingerprint] = self.config.copy_params()
+            for i, day in enumerate(days):
+                self.checkpoints[fingerprint, day] = \
+                    checkpoints[i * count:(i + 1) * count].tobytes()
+
+            # Continue the log files of the saved build
+            log_day = state.arrays.get('logday')
+            if log_day and log_day[0]:
+                self.log_day = fingerprint, log_day[0]
+
+            # Restore the heights and publish the saved build
+            self.heights[:] = heights
+            self.update_aggregates()
+            if state.day:
+                self.snapshot = self.get_snapshot(state.day, state.num_teams)
+
+        return True
+
+    def get_chunk_size(self, num_teams=1):
+        """Get the number of consecutive sections built in one task.
+
+        The configured chunk size is used if set. Otherwise, the sections are
+        split into about four chunks per team, which amortizes the overhead
+        of the tasks and still balances the work between the teams.
 
-            # Create a pool of workers
-            with Pool(num_teams, WallSection.prepare, (queue,)) as pool:
+        Args:
+            num_teams (int) : The number of construction teams.
 
-                # Save the start timestamp
-                start_time = time.time()
+        Returns:
+            int: The number of sections per task.
+        """
 
-                # Map a section from a profile to a worker team
-                self.sections = pool.starmap(
-                    func=WallSection.build,
-                    iterable=[(section, days) for section in self.sections]
-                )
+        # Use the configured chunk size
+        if self.config.chunk_size:
+            return self.config.chunk_size
+
+        # Auto-tune the chunk size (see multiprocessing.Pool.map)
+        chunk_size, extra = divmod(len(self.heights), num_teams * 4)
+        if extra:
+            chunk_size += 1
 
-                # Save the end timestamp
-                end_time = time.time()
+        return max(chunk_size, 1)
 
-            # Log the results
-            self.log.debug(f'TOTAL TIME : {end_time - start_time:.2f} seconds')
+    def build_sections(self,
+                       starmap,
+                       days=1,
+                       num_teams=1,
+                       start_day=0,
+                       ranges=None
+                       ):
+        """Build the sections in a pool with the heights in shared memory.
 
-            # Update the profiles
-            self.update_profiles()
+        The heights of the sections are copied into a shared int32 array.
+        Each task receives only the name of the shared memory block, the
+        offset and length of a run of sections and the number of days. The
+        workers update the heights in place, so no WallSection objects are
+        pickled and sent through the pool.
+
+        Args:
+            starmap (callable)  : The starmap function of a pool.
+            days (int)          : The number of days to build the wall.
+            num_teams (int)     : The number of construction teams.
+            start_day (int)     : The day of the current heights.
+            ranges (list)       : The runs of sections (offset and length) to
+                                  build, or None for all sections.
+
+        Returns:
+            WallManager: The updated wall builder instance.
+        """
 
-            # Stop the log listener process
-            log_listener.stop()
+        count = len(self.heights)
+        if ranges is None:
+            ranges = [(0, count)]
 
-            # Cleanup the log handlers
-            self.log.handlers.clear()
+        # Create the shared array of heights
+        block = shared_memory.SharedMemory(create=True, size=max(count, 1) * 4)
+        heights = block.buf.cast('i')
+
+        try:
+
+            # Copy the current heights into the shared array
+            heights[:count] = array('i', self.heights)
+
+            # Find the first section of each profile
+            profiles = [
+                (profile.offset, profile.profile_id)
+                for profile in self.profiles if profile.length
+            ]
+            starts = [start for start, _ in profiles]
+
+            # Map a run of sections to a worker team
+            size = self.get_chunk_size(num_teams)
+            tasks = []
+            for begin, end in ((offset, offset + length)
+                               for offset, length in ranges):
+                for offset in range(begin, end, size):
+                    length = min(size, end - offset)
+
+                    # Pass only the profiles in the run
+                    first = max(bisect_right(starts, offset) - 1, 0)
+                    last = bisect_left(starts, offset + length)
+
+                    tasks.append(
+                        (block.name, offset, length, days,
+                         tuple(profiles[first:last]), start_day)
+                    )
+
+            starmap(build_shared_sections, tasks)
+
+            # Copy the heights back in place (shared with the profiles)
+            built = array(HEIGHT_TYPECODE, heights[:count].tolist())
+            build_rate = self.config.build_rate
+            self.work_count += sum(
+                -(-(height - start) // build_rate)
+                for start, height in zip(self.heights, built)
+            )
+            self.heights[:] = built
+
+            # Count the work of the workers
+            self.update_aggregates()
+
+        finally:
+
+            # Release the shared memory block
+            heights.release()
+            block.close()
+            block.unlink()
+
+        return self
+
+    def build_with_pool(self, days=1, num_teams=1):
+        """Build the wall using the long-lived pool of workers.
+
+        The pool is resized if the number of teams has changed. The log
+        listener of the pool keeps running between the builds. It starts new
+        log files for a build from the first day and appends to them when a
+        build resumes from a checkpoint.
+
+        Args:
+            days (int)      : The number of days to build the wall.
+            num_teams (int) : The number of construction teams.
+
+        Returns:
+            WallManager: The updated wall builder instance.
+        """
+
+        # Parse the profile list anew to get any changes
+        self.parse_profile_list()
+
+        # Answer from a checkpoint without workers or new logs
+        resume = self.load_resume(days)
+        if resume[0] == days and not resume[1]:
+            return self
+
+        # Match the size of the pool with the number of teams
+        self.pool.resize(num_teams)
+
+        # Start new log files or append to the resumed ones
+        self.pool.open_logs(mode=resume[2])
+        self.work_count = 0
+
+        # Save the start timestamp
+        start_time = time.time()
+
+        # Map a section from a profile to a worker team
+        self.resume_sections(
+            starmap=self.pool.starmap,
+            days=days,
+            num_teams=num_teams,
+            resume=resume
+        )
+
+        # Wait for the records still sent by the workers
+        if not self.pool.wait_logs(self.work_count):
+            self.log.warning('Some work records of the build were not logged')
+
+        # Save the end timestamp
+        end_time = time.time()
+
+        # Log the results
+        self.log.debug(f'TOTAL TIME : {end_time - start_time:.2f} seconds')
 
         # Return the updated wall builder
         return self
 
 
+def get_team():
+    """Returns the number of the worker team of the current process.
+
+    Returns:
+        int: The number of the worker in its pool (see WallSection.prepare),
+            or 0 outside a pool of workers.
+    """
+
+    number = current_process().name.split('-')[-1]
+    return int(number) if number.isdigit() else 0
+
+
+def build_shared_sections(name,
+                          offset,
+                          length,
+                          days,
+                          profiles=(),
+                          start_day=0
+                          ):
+    """Build a run of sections with the heights in shared memory.
+
+    The function is executed by the workers of the pool. It builds the
+    sections in the same way as WallSection.build, but updates the heights in
+    the shared array of the wall manager.
+
+    Args:
+        name (str)          : The name of the shared memory block.
+        offset (int)        : The ID of the first section in the run.
+        length (int)        : The number of sections in the run.
+        days (int)          : The number of days to build the sections.
+        profiles (tuple)    : The (first section ID, profile ID) pairs of the
+                              profiles in the run.
+        start_day (int)     : The day of the current heights.
+
+    Returns:
+        tuple: The offset and length of the built run.
+    """
+
+    # Rename the worker process
+    original_name = current_process().name
+    current_process().name = f'Worker-{original_name.split("-")[-1]}'
+
+    # Use the configuration and the logger of the wall sections
+    config = WallSection.config
+    log = logging.getLogger(WallSection.__name__)
+    team = get_team()
+
+    # Get the first section of each profile in the run
+    starts = [start for start, _ in profiles]
+
+    # Attach to the shared array of heights
+    block = shared_memory.SharedMemory(name=name)
+    heights = block.buf.cast('i')
+
+    try:
+
+        for section_id in range(offset, offset + length):
+
+            # Find the profile of the section
+            i = bisect_right(starts, section_id) - 1
+            profile_id = profiles[i][1] if i >= 0 else -1
+
+            # Build the wall section
+            for day in range(start_day + 1, start_day + days + 1):
+
+                # Check if the section is ready
+                if heights[section_id] >= config.target_height:
+                    break
+
+                # Build the wall for the day up to the target height
+                heights[section_id] = min(
+                    heights[section_id] + config.build_rate,
+                    config.target_height
+                )
+
+                # Log the build progress
+                log.info(f'Added 1 foot to section {section_id} to reach'
+                         f' {heights[section_id]} feet on day {day}',
+                         extra={'work': (
+                             day,
+                             profile_id,
+                             section_id,
+                             team,
+                             heights[section_id]
+                         )})
+
+                # Simulate CPU work
+                time.sleep(config.cpu_worktime)
+
+    finally:
+
+        # Detach from the shared array
+        heights.release()
+        block.close()
+
+        # Send the buffered log messages of the task
+        WallSection.flush_logs()
+
+    return offset, length
+
+
 def main():
     """Main function for testing the wall classes."""
 
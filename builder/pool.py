@@ -0,0 +1,337 @@
+# encoding: utf-8
+from multiprocessing import Pool, Queue, Value, resource_tracker
+from builder.defines import LOG_BATCH_SIZE
+from builder.manager import LogListener, WallSection
+from builder.worklog import get_worklog_filepath
+
+import threading
+import time
+
+
+def run_task(func, args):
+    """Runs a task in a worker and measures the time spent on it.
+
+    Args:
+        func (callable) : The function to run.
+        args (tuple)    : The arguments of the function.
+
+    Returns:
+        tuple : The result of the function and the elapsed time in seconds.
+    """
+
+    start_time = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start_time
+
+
+class WallPool(object):
+    """Long-lived pool of construction teams shared by many builds.
+
+    Starting a log listener and a pool of workers takes much longer than
+    building a small wall. The wall pool starts them once and reuses them
+    for every build until it is stopped. The pool is restarted with a new
+    number of workers when the number of teams changes. The log listener
+    reopens the log files for each build (see open_logs), so the files hold
+    the progress of the last build instead of growing with every build.
+
+    Attributes:
+        num_teams (int)     : The number of workers in the pool.
+        log_filepath (str)  : The path to the log file.
+        queue (Queue)       : The shared queue for the log messages.
+        pending (int)       : The number of tasks waiting for a result.
+        completed (int)     : The number of tasks completed since the start.
+        busy_time (float)   : The time spent by the workers on the tasks.
+
+    Example:
+
+        from builder.pool import WallPool
+        from builder.manager import WallManager
+
+        # Start the pool of teams
+        pool = WallPool(num_teams=4, log_filepath='wall.log').start()
+
+        # Build the wall several times with the same pool
+        manager = WallManager(pool=pool)
+        manager.build(days=1)
+        manager.build(days=2)
+
+        # Show the statistics of the pool
+        print(pool.get_stats())
+
+        # Stop the pool
+        pool.stop()
+    """
+
+    def __init__(self, num_teams=1, log_filepath='wall.log'):
+        """Initializes the wall pool.
+
+        Args:
+            num_teams (int)     : The number of workers in the pool.
+            log_filepath (str)  : The path to the log file.
+        """
+
+        # Set the instance attributes
+        self.num_teams = num_teams
+        self.log_filepath = log_filepath
+
+        # The processes are created by the start method
+        self.queue = None
+        self.listener = None
+        self.pool = None
+
+        # Protect the start, stop and resize of the processes
+        self.lock = threading.RLock()
+
+        # Protect the statistics updated by the result handler thread
+        self.stats_lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.busy_time = 0.0
+        self.start_time = None
+
+    def __repr__(self):
+        """Returns a string representation of the wall pool."""
+
+        return (f"WallPool(num_teams={self.num_teams}, "
+                f"running={self.is_running()}, "
+                f"pending={self.pending}"
+                f")"
+                )
+
+    def __enter__(self):
+        """Starts the pool when entering a context."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stops the pool when leaving a context."""
+        self.stop()
+
+    def is_running(self):
+        """Returns True if the pool of workers has been started."""
+        return self.pool is not None
+
+    def start(self, mode='w'):
+        """Starts the log listener and the pool of workers.
+
+        Args:
+            mode (str) : The mode to open the log files ('w' or 'a').
+
+        Returns:
+            WallPool: The started wall pool.
+        """
+
+        with self.lock:
+
+            # Nothing to do if the pool is already running
+            if self.is_running():
+                return self
+
+            # Create the log queue (inherited by the workers at start)
+            self.queue = Queue()
+
+            # Start the log consumer process
+            self.listener = LogListener(
+                queue=self.queue,
+                logfile=self.log_filepath,
+                echo=False,
+                worklog=get_worklog_filepath(self.log_filepath),
+                mode=mode
+            )
+            self.listener.start()
+
+            # Create the pool of workers
+            self.start_pool()
+
+        return self
+
+    def open_logs(self, mode='w'):
+        """Starts new log files or appends to the previous ones.
+
+        The pool is started on the first call. The records of the previous
+        builds are written before the files are reopened.
+
+        Args:
+            mode (str) : The mode to open the log files ('w' or 'a').
+
+        Returns:
+            WallPool: The wall pool.
+        """
+
+        with self.lock:
+
+            # Open the log files with the listener
+            if not self.is_running():
+                return self.start(mode=mode)
+
+            self.listener.reopen(mode=mode)
+
+        return self
+
+    def wait_logs(self, count):
+        """Waits until the listener has handled the records of a build.
+
+        Args:
+            count (int) : The number of work records since the log files
+                          were opened.
+
+        Returns:
+            bool: True if all records were handled (or the pool is stopped).
+        """
+
+        with self.lock:
+            if not self.is_running():
+                return True
+
+            return self.listener.wait_records(count)
+
+    def start_pool(self):
+        """Creates the pool of workers and resets the statistics."""
+
+        # Share the tracker of the shared arrays with the workers
+        resource_tracker.ensure_running()
+
+        # Number the workers of the new pool from the first team
+        initargs = (self.queue, LOG_BATCH_SIZE, Value('i', 0))
+        self.pool = Pool(self.num_teams, WallSection.prepare, initargs)
+
+        with self.stats_lock:
+            self.pending = 0
+            self.completed = 0
+            self.busy_time = 0.0
+            self.start_time = time.time()
+
+    def stop_pool(self):
+        """Waits for the pending tasks and terminates the pool of workers."""
+
+        self.pool.close()
+        self.pool.join()
+        self.pool = None
+
+    def stop(self):
+        """Stops the pool of workers and the log listener.
+
+        Returns:
+            WallPool: The stopped wall pool.
+        """
+
+        with self.lock:
+
+            # Nothing to do if the pool is not running
+            if not self.is_running():
+                return self
+
+            # Stop the workers before the log listener
+            self.stop_pool()
+            self.listener.stop()
+
+            # Release the log queue and the processes
+            self.queue.close()
+            self.queue.join_thread()
+            self.listener = None
+            self.queue = None
+
+        return self
+
+    def resize(self, num_teams):
+        """Changes the number of workers in the pool.
+
+        The pool of workers is restarted only if the number of teams changes.
+        The log listener keeps running.
+
+        Args:
+            num_teams (int) : The new number of workers.
+
+        Returns:
+            WallPool: The resized wall pool.
+        """
+
+        with self.lock:
+
+            # Nothing to do if the size is the same
+            if num_teams == self.num_teams:
+                return self
+
+            self.num_teams = num_teams
+
+            # Restart a running pool with the new size
+            if self.is_running():
+                self.stop_pool()
+                self.start_pool()
+
+        return self
+
+    def on_result(self, result):
+        """Updates the statistics after a task is completed."""
+
+        with self.stats_lock:
+            self.pending -= 1
+            self.completed += 1
+            self.busy_time += result[1]
+
+    def on_error(self, error):
+        """Updates the statistics after a task has failed."""
+
+        with self.stats_lock:
+            self.pending -= 1
+
+    def starmap(self, func, iterable):
+        """Runs the function for each tuple of arguments in the pool.
+
+        The pool is started on the first call.
+
+        Args:
+            func (callable)     : The function to run.
+            iterable (iterable) : The tuples of arguments.
+
+        Returns:
+            list : The results in the order of the arguments.
+        """
+
+        # Keep the pool running until all tasks are submitted
+        with self.lock:
+
+            # Start the pool on demand
+            self.start()
+
+            # Submit the tasks to the pool
+            tasks = []
+            for args in iterable:
+                with self.stats_lock:
+                    self.pending += 1
+                tasks.append(
+                    self.pool.apply_async(
+                        func=run_task,
+                        args=(func, args),
+                        callback=self.on_result,
+                        error_callback=self.on_error
+                    )
+                )
+
+        # Wait for the results
+        return [task.get()[0] for task in tasks]
+
+    def get_stats(self):
+        """Returns the statistics of the pool.
+
+        Returns:
+            dict : The number of teams, the queue depth, the number of
+                   completed tasks and the utilisation of the workers.
+        """
+
+        with self.stats_lock:
+
+            # Share of the available worker time spent on tasks
+            utilisation = 0.0
+            if self.is_running():
+                uptime = time.time() - self.start_time
+                if uptime > 0:
+                    utilisation = self.busy_time / (uptime * self.num_teams)
+
+            return {
+                'num_teams': self.num_teams,
+                'running': self.is_running(),
+                'queue_depth': self.pending,
+                'completed': self.completed,
+                'busy_time': round(self.busy_time, 6),
+                'utilisation': round(min(utilisation, 1.0), 6),
+            }
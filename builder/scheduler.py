@@ -0,0 +1,652 @@
+# encoding: utf-8
+from builder.errors import *
+from builder.manager import WallBuilderAbc
+from builder.validator import ConfigValidator
+from builder.logreader import LogQueryMixin, paginate
+from builder.state import SimulationState
+
+from array import array
+from collections import deque, namedtuple
+from itertools import islice
+import os
+
+# A team worked on a section on a given day
+Assignment = namedtuple(
+    'Assignment', ['day', 'team', 'profile_id', 'section_id', 'height']
+)
+
+# A team was relieved on a given day because there were no jobs left
+Relief = namedtuple('Relief', ['day', 'team'])
+
+
+class TeamScheduler(LogQueryMixin, WallBuilderAbc):
+    """Simulates a limited number of teams moving between the sections.
+
+    The unfinished sections wait in a ready queue ordered by profile and
+    section. On each day of the clock every free team takes the next section
+    from the queue and works on it until the section is completed, after
+    which the team moves to the next section and profile. A team is relieved
+    on the first day without a job. The simulation is event-driven, so no
+    processes are started and no time is spent sleeping.
+
+    The queue and the jobs of the teams are kept after a build, so a later
+    day with the same configuration and teams is simulated from the last
+    simulated day. After a change of the profiles, the simulation is rewound
+    to the last day before a team reached a changed section. The state can
+    be saved to a file and restored after a restart.
+
+    Attributes:
+        days (int)          : The number of simulated days.
+        num_teams (int)     : The number of construction teams.
+        fingerprint (str)   : The fingerprint of the simulated configuration.
+        params (dict)       : The parameters of the simulated configuration.
+        heights (list)      : The current height of each section.
+        ready (deque)       : The unfinished sections without a team.
+        jobs (list)         : The section of each team (None for a free team).
+        relieved (list)     : True for each relieved team.
+        assignments (list)  : The work of each team on each day.
+        reliefs (list)      : The days on which the teams were relieved.
+        state_filepath (str): The file of the durable state, or None.
+
+    Example:
+
+        from builder.scheduler import TeamScheduler
+        from builder.configurator import WallConfigurator
+
+        # Define the wall configuration
+        config = WallConfigurator(profiles=[[21, 25, 28], [17]])
+
+        # Build the wall with two teams for five days
+        scheduler = TeamScheduler.set_config(config)
+        scheduler.build(days=5, num_teams=2)
+
+        # Get the ice consumed by the first profile
+        print(scheduler.get_ice(profile_id=0))
+
+        # Show the work of the teams on the first day
+        print(scheduler.get_assignments(day=1))
+    """
+
+    def __init__(self,
+                 log_filepath='wall.log',
+                 validator=ConfigValidator(),
+                 state_filepath=None
+                 ):
+        """Initializes the team scheduler.
+
+        Args:
+            log_filepath (str)          : The path to the log file.
+            validator (ConfigValidator) : The configuration validator.
+            state_filepath (str)        : The file to save the state after
+                                          each build and to restore it before
+                                          the first build, or None.
+        """
+
+        # Set the instance attributes
+        self.days = 0
+        self.num_teams = 0
+        self.fingerprint = None
+        self.params = None
+        self.starts = []
+        self.heights = []
+        self.profile_ids = []
+        self.ready = deque()
+        self.jobs = []
+        self.relieved = []
+        self.assignments = []
+        self.reliefs = []
+        self.state_filepath = state_filepath
+
+        # Set the log file of the simulation
+        self.log_filepath = log_filepath
+
+        # Set the validator
+        self.validator = validator
+
+    def __repr__(self):
+        """Returns a string representation of the scheduler."""
+
+        return (f"TeamScheduler(days={self.days}, "
+                f"num_teams={self.num_teams}, "
+                f"ice={self.get_ice()}, "
+                f"ready={self.is_ready()}"
+                f")"
+                )
+
+    def reset(self, num_teams=0):
+        """Sets the sections to their start heights and frees the teams.
+
+        Args:
+            num_teams (int) : The number of construction teams.
+
+        Returns:
+            TeamScheduler: The reset scheduler instance.
+        """
+
+        # Flatten the profiles using the global section numbering
+        self.starts = [h for row in self.config.profiles for h in row]
+        self.heights = list(self.starts)
+        self.profile_ids = [
+            profile_id
+            for profile_id, row in enumerate(self.config.profiles)
+            for _ in row
+        ]
+
+        # Queue the unfinished sections by profile and section
+        target_height = self.config.target_height
+        self.ready = deque(
+            i for i, height in enumerate(self.heights) if height < target_height
+        )
+
+        # Free all teams
+        self.num_teams = num_teams
+        self.jobs = [None] * num_teams
+        self.relieved = [False] * num_teams
+
+        # Clear the records of the previous simulation
+        self.days = 0
+        self.fingerprint = self.config.get_fingerprint()
+        self.params = self.config.copy_params()
+        self.assignments.clear()
+        self.reliefs.clear()
+
+        return self
+
+    def get_affected_day(self):
+        """Returns the last simulated day that a change of the profiles keeps.
+
+        The teams take the sections from the queue in the order of their
+        IDs, so the simulation does not change until a team takes the first
+        changed section, or a team is relieved instead of taking it.
+
+        Returns:
+            int: The last day that is the same with the current configuration
+                (0 if the simulation must start anew).
+        """
+
+        # Nothing to keep without a simulation or after other changes
+        if self.params is None:
+            return 0
+
+        changed = self.config.get_changed_profiles(self.params)
+        if changed is None:
+            return 0
+
+        # The configuration has not changed
+        if not changed:
+            return self.days
+
+        # The rows before the first changed profile are the same
+        first = sum(len(row) for row in self.config.profiles[:changed[0]])
+
+        # Find the first day a team reached the changed sections
+        day = self.days
+        for record in self.assignments:
+            if record.section_id >= first:
+                day = min(day, record.day - 1)
+                break
+
+        # A relieved team would take a new section of the changed profiles
+        if self.reliefs:
+            day = min(day, self.reliefs[0].day - 1)
+
+        return day
+
+    def rewind(self, day):
+        """Rewinds the simulation to the end of a day.
+
+        The records until the day are kept and the heights, the queue and the
+        jobs of the teams are replayed from them with the current
+        configuration (see get_affected_day).
+
+        Args:
+            day (int) : The last day to keep.
+
+        Returns:
+            TeamScheduler: The rewound scheduler instance.
+        """
+
+        day = min(day, self.days)
+        target_height = self.config.target_height
+
+        # Keep the records until the day
+        assignments = [record for record in self.assignments if record.day <= day]
+        reliefs = [record for record in self.reliefs if record.day <= day]
+
+        # Start from the configuration
+        self.reset(self.num_teams)
+
+        # Replay the work of the teams
+        taken = set()
+        for record in assignments:
+            self.heights[record.section_id] = record.height
+            taken.add(record.section_id)
+
+            # The team keeps working on an unfinished section
+            if record.height < target_height:
+                self.jobs[record.team - 1] = record.section_id
+            else:
+                self.jobs[record.team - 1] = None
+
+        for record in reliefs:
+            self.relieved[record.team - 1] = True
+
+        # Remove the sections taken by the teams from the queue
+        self.ready = deque(i for i in self.ready if i not in taken)
+
+        self.days = day
+        self.assignments.extend(assignments)
+        self.reliefs.extend(reliefs)
+
+        return self
+
+    def save_state(self, filepath):
+        """Saves the heights, the queues and the records to a state file.
+
+        The state is written as flat arrays, e.g. five integers for each
+        assignment, so no objects are pickled.
+
+        Args:
+            filepath (str) : The path of the state file.
+
+        Returns:
+            TeamScheduler: The scheduler instance.
+        """
+
+        SimulationState(
+            fingerprint=self.fingerprint or '',
+            day=self.days,
+            num_teams=self.num_teams,
+            arrays={
+                'heights': array('i', self.heights),
+                'ready': array('i', self.ready),
+                'jobs': array('i', (-1 if job is None else job
+                                    for job in self.jobs)),
+                'relieved': array('b', self.relieved),
+                'assign': array('i', (value for record in self.assignments
+                                      for value in record)),
+                'reliefs': array('i', (value for record in self.reliefs
+                                       for value in record)),
+            }
+        ).save(filepath)
+
+        return self
+
+    def load_state(self, filepath):
+        """Restores the heights, the queues and the records of a state file.
+
+        The state is ignored if the file is missing or was saved for another
+        configuration. A state file that is invalid or does not match the
+        sections of the configuration is discarded with a warning.
+
+        Args:
+            filepath (str) : The path of the state file.
+
+        Returns:
+            bool: True if the state was restored.
+        """
+
+        # Nothing to restore before the first build
+        if not os.path.exists(filepath):
+            return False
+
+        try:
+            state = SimulationState.load(filepath)
+        except BuilderError as e:
+            SimulationState.discard(filepath, e)
+            return False
+
+        # Ignore the state of another configuration
+        if state.fingerprint != self.config.get_fingerprint():
+            return False
+
+        # Check the state matches the sections and the teams
+        arrays = state.arrays
+        names = ('heights', 'ready', 'jobs', 'relieved', 'assign', 'reliefs')
+        count = sum(len(row) for row in self.config.profiles)
+        if any(name not in arrays for name in names) or \
+                len(arrays['heights']) != count or \
+                len(arrays['jobs']) != state.num_teams or \
+                len(arrays['relieved']) != state.num_teams:
+            SimulationState.discard(filepath, "The sections do not match.")
+            return False
+
+        self.reset(state.num_teams)
+
+        # Restore the heights and the queues
+        self.days = state.day
+        self.heights = arrays['heights'].tolist()
+        self.ready = deque(arrays['ready'])
+        self.jobs = [None if job < 0 else job for job in arrays['jobs']]
+        self.relieved = [bool(relieved) for relieved in arrays['relieved']]
+
+        # Restore the records from the flat arrays
+        values = iter(arrays['assign'])
+        self.assignments.extend(Assignment(*record) for record in zip(
+            *[values] * len(Assignment._fields)
+        ))
+        values = iter(arrays['reliefs'])
+        self.reliefs.extend(Relief(*record) for record in zip(
+            *[values] * len(Relief._fields)
+        ))
+
+        return True
+
+    def get_section_ids(self, profile_id=None, section_id=None):
+        """Returns the IDs of the sections selected by a profile or a section.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all profiles.
+            section_id (int) : The section ID, or None for all sections.
+
+        Returns:
+            range: The selected section IDs.
+        """
+
+        # Select a single section
+        if section_id is not None:
+            if not 0 <= section_id < len(self.heights):
+                raise BuilderError(f"Section with ID {section_id} not found.")
+            return range(section_id, section_id + 1)
+
+        # Select all sections of the wall
+        if profile_id is None:
+            return range(len(self.heights))
+
+        # Select the sections of a single profile
+        if not 0 <= profile_id < len(self.config.profiles):
+            raise BuilderError(f"Profile with ID {profile_id} not found.")
+
+        start = sum(len(row) for row in self.config.profiles[:profile_id])
+        return range(start, start + len(self.config.profiles[profile_id]))
+
+    def get_assignments(self, day=None, team=None):
+        """Returns the work records filtered by day and team.
+
+        Args:
+            day (int)   : The day, or None for all days.
+            team (int)  : The team, or None for all teams.
+
+        Returns:
+            list: The matching assignments.
+        """
+
+        return [
+            record for record in self.assignments
+            if (day is None or record.day == day) and
+               (team is None or record.team == team)
+        ]
+
+    def is_ready(self, profile_id=None, section_id=None):
+        """Check if the selected sections are ready.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all profiles.
+            section_id (int) : The section ID, or None for all sections.
+
+        Returns:
+            bool: True if all selected sections reached the target height.
+        """
+
+        # Check if there are any sections
+        section_ids = self.get_section_ids(profile_id, section_id)
+        if not section_ids:
+            return False
+
+        # Check if all sections are ready
+        else:
+            target_height = self.config.target_height
+            return all(self.heights[i] >= target_height for i in section_ids)
+
+    def get_ice(self, profile_id=None, section_id=None):
+        """Get the ice consumed by the selected sections.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all profiles.
+            section_id (int) : The section ID, or None for all sections.
+
+        Returns:
+            int: The ice consumed until the simulated day.
+        """
+
+        section_ids = self.get_section_ids(profile_id, section_id)
+        delta = sum(self.heights[i] - self.starts[i] for i in section_ids)
+        return delta * self.config.volume_ice_per_foot
+
+    def get_cost(self, profile_id=None, section_id=None):
+        """Get the cost of the selected sections.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all profiles.
+            section_id (int) : The section ID, or None for all sections.
+
+        Returns:
+            int: The cost until the simulated day.
+        """
+        return self.get_ice(profile_id, section_id) * self.config.cost_per_volume
+
+    def iter_events(self):
+        """Yields the assignments and the reliefs in the order of the days."""
+
+        reliefs = iter(self.reliefs)
+        relief = next(reliefs, None)
+
+        # Merge the assignments and the reliefs day by day
+        for record in self.assignments:
+            while relief is not None and relief.day < record.day:
+                yield relief
+                relief = next(reliefs, None)
+            yield record
+
+        # Add the remaining reliefs
+        while relief is not None:
+            yield relief
+            relief = next(reliefs, None)
+
+    def read_logs(self, cursor=0, day=None, section_ids=None, process=None):
+        """Yields the matching log messages from the simulation records.
+
+        Args:
+            cursor (int)        : The number of records to skip.
+            day (int)           : The day, or None for all days.
+            section_ids (range) : The section IDs, or None for all sections.
+            process (str)       : The team name (Team-1), or None for all.
+
+        Yields:
+            tuple: The log message and the cursor of the next message.
+        """
+
+        if cursor < 0:
+            raise BuilderError(f"Invalid cursor {cursor}.")
+
+        events = islice(self.iter_events(), cursor, None)
+        for cursor, event in enumerate(events, start=cursor + 1):
+
+            # Apply the filters
+            if day is not None and event.day != day:
+                continue
+
+            if process is not None and f'Team-{event.team}' != process:
+                continue
+
+            # The reliefs do not belong to a section
+            if isinstance(event, Relief):
+                if section_ids is None:
+                    yield f'Day {event.day} Team-{event.team} - Relieved', cursor
+                continue
+
+            if section_ids is not None and event.section_id not in section_ids:
+                continue
+
+            yield (
+                f'Day {event.day} Team-{event.team} - Added 1 foot to '
+                f'section {event.section_id} to reach {event.height} feet',
+                cursor
+            )
+
+    def read_tail(self,
+                  offset=0,
+                  limit=None,
+                  day=None,
+                  section_ids=None,
+                  process=None
+                  ):
+        """Returns the matching log messages recorded since an offset.
+
+        Args:
+            offset (int)        : The number of records of the previous call.
+            limit (int)         : The maximum number of messages, or None.
+            day (int)           : The day, or None for all days.
+            section_ids (range) : The section IDs, or None for all sections.
+            process (str)       : The team name (Team-1), or None for all.
+
+        Returns:
+            dict: The new log messages and the offset for the next call.
+        """
+
+        if limit is not None and limit < 1:
+            raise BuilderError(f"Invalid limit {limit}.")
+
+        # The records of a new simulation start from the beginning
+        count = len(self.assignments) + len(self.reliefs)
+        if offset > count:
+            offset = 0
+
+        page = paginate(
+            self.read_logs(offset, day, section_ids, process),
+            cursor=offset,
+            limit=limit
+        )
+
+        return {
+            'logs': page['logs'],
+            'offset': page['next'] if page['next'] is not None else count
+        }
+
+    def validate(self):
+        """Validate the scheduler configuration.
+
+        Raises:
+            BuilderValidationError: If the profiles list is invalid.
+
+        Returns:
+            TeamScheduler: The validated scheduler instance.
+        """
+
+        # Check the profiles list
+        self.validator.check_config_list(self.config.profiles)
+
+        # Check the start height of each section
+        for row in self.config.profiles:
+            for height in row:
+                self.validator.check_height(height)
+
+        return self
+
+    def build(self, days=1, num_teams=1):
+        """Simulate the teams for the given number of days.
+
+        The simulation continues from the last simulated day if the
+        configuration and the number of teams are the same. After a change of
+        the profiles, it is rewound to the last day that the change does not
+        affect, and it starts from the start heights otherwise.
+
+        Args:
+            days (int)      : The number of days to simulate.
+            num_teams (int) : The number of construction teams.
+
+        Returns:
+            TeamScheduler: The updated scheduler instance.
+        """
+
+        # Restore the state saved before a restart
+        if self.state_filepath and self.fingerprint is None:
+            self.load_state(self.state_filepath)
+
+        # Start from the configuration with another number of teams
+        if self.num_teams != num_teams:
+            self.reset(num_teams)
+
+        # Rewind to the last day that is the same with the configuration
+        elif any([
+            self.fingerprint != self.config.get_fingerprint(),
+            self.days > days
+        ]):
+            self.rewind(min(self.get_affected_day(), days))
+
+        target_height = self.config.target_height
+        build_rate = self.config.build_rate
+
+        # The queue of the sections and the jobs of the teams
+        ready = self.ready
+        jobs = self.jobs
+        relieved = self.relieved
+
+        for day in range(self.days + 1, days + 1):
+
+            # Stop the clock when all teams are relieved
+            if all(relieved):
+                break
+
+            self.days = day
+
+            for team in range(num_teams):
+
+                # A free team takes the next section from the queue
+                if jobs[team] is None and not relieved[team]:
+                    if ready:
+                        jobs[team] = ready.popleft()
+                    else:
+                        relieved[team] = True
+                        self.reliefs.append(Relief(day, team + 1))
+                        continue
+
+                # Skip the relieved teams
+                section_id = jobs[team]
+                if section_id is None:
+                    continue
+
+                # Add the build rate to the section
+                height = min(self.heights[section_id] + build_rate, target_height)
+                self.heights[section_id] = height
+                self.assignments.append(
+                    Assignment(
+                        day=day,
+                        team=team + 1,
+                        profile_id=self.profile_ids[section_id],
+                        section_id=section_id,
+                        height=height
+                    )
+                )
+
+                # The team is free again once the section is completed
+                if height >= target_height:
+                    jobs[team] = None
+
+        # Save the state for the next start
+        if self.state_filepath:
+            self.save_state(self.state_filepath)
+
+        return self
+
+
+def main():
+    """Main function for testing the team scheduler."""
+
+    from builder.configurator import WallConfigurator
+    import time
+
+    # Define a large wall
+    config = WallConfigurator(profiles=[[0] * 100] * 20)
+
+    # Simulate the wall with 20 teams
+    start_time = time.perf_counter()
+    scheduler = TeamScheduler.set_config(config)
+    scheduler.build(days=3000, num_teams=20)
+    end_time = time.perf_counter()
+
+    print(f'{scheduler} in {end_time - start_time:.3f} seconds')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# encoding: utf-8
+from builder.errors import *
+
+from array import array
+from collections import namedtuple
+from itertools import accumulate
+
+
+class WallSnapshot(namedtuple('WallSnapshot', [
+    'days',
+    'num_teams',
+    'fingerprint',
+    'target_height',
+    'volume_ice_per_foot',
+    'cost_per_volume',
+    'starts',
+    'heights',
+    'offsets',
+    'feet',
+])):
+    """Immutable result of a build.
+
+    The start and current heights of the sections are kept as bytes of int32
+    arrays in the global section order. The feet added to each profile are
+    totalled when the snapshot is taken, so the ice and the cost of a profile
+    are answered without looking at its sections. A snapshot cannot be
+    changed after it is taken and can be read by many threads while the
+    builder runs the next build.
+
+    Attributes:
+        days (int)                  : The number of days of the build.
+        num_teams (int)             : The number of teams of the build.
+        fingerprint (str)           : The fingerprint of the configuration.
+        target_height (int)         : The target height of the wall.
+        volume_ice_per_foot (int)   : The volume of ice per foot.
+        cost_per_volume (int)       : The cost of ice per cubic foot.
+        starts (bytes)              : The start height of each section.
+        heights (bytes)             : The current height of each section.
+        offsets (tuple)             : The first section of each profile and
+                                      the number of sections at the end.
+        feet (tuple)                : The feet added to each profile.
+
+    Example:
+
+        from builder.manager import WallManager
+
+        # Take a snapshot of a build
+        snapshot = WallManager.set_config(config).build_snapshot(days=1)
+
+        # Get the cost of the first profile
+        print(snapshot.get_cost(profile_id=0))
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_rows(cls,
+                  starts,
+                  heights,
+                  config,
+                  days=0,
+                  num_teams=1
+                  ):
+        """Takes a snapshot of the heights of the profiles.
+
+        Args:
+            starts (list)               : The start heights of each profile.
+            heights (list)              : The current heights of each profile.
+            config (WallConfigurator)   : The configuration of the build.
+            days (int)                  : The number of days of the build.
+            num_teams (int)             : The number of teams of the build.
+
+        Returns:
+            WallSnapshot: The snapshot of the build.
+        """
+
+        # Find the first section of each profile
+        offsets = tuple(accumulate((len(row) for row in starts), initial=0))
+
+        # Total the feet added to each profile
+        feet = tuple(
+            sum(heights_row) - sum(starts_row)
+            for starts_row, heights_row in zip(starts, heights)
+        )
+
+        return cls(
+            days=days,
+            num_teams=num_teams,
+            fingerprint=config.get_fingerprint(),
+            target_height=config.target_height,
+            volume_ice_per_foot=config.volume_ice_per_foot,
+            cost_per_volume=config.cost_per_volume,
+            starts=array('i', (h for row in starts for h in row)).tobytes(),
+            heights=array('i', (h for row in heights for h in row)).tobytes(),
+            offsets=offsets,
+            feet=feet,
+        )
+
+    def __repr__(self):
+        """Returns a string representation of the snapshot."""
+
+        return (f"WallSnapshot(days={self.days}, "
+                f"sections={len(self.offsets) and self.offsets[-1]}, "
+                f"ice={self.get_ice()}, "
+                f"cost={self.get_cost()}, "
+                f"ready={self.is_ready()}"
+                f")"
+                )
+
+    def check_profile_id(self, profile_id):
+        """Raises a BuilderError if the profile does not exist."""
+
+        if not 0 <= profile_id < len(self.feet):
+            raise BuilderError(f"Profile with ID {profile_id} not found.")
+
+    def get_heights(self, profile_id=None):
+        """Returns a read-only view of the current heights.
+
+        Args:
+            profile_id (int) : The profile ID, or None for all sections.
+
+        Returns:
+            memoryview: The current heights of the selected sections.
+        """
+
+        heights = memoryview(self.heights).cast('i')
+
+        # Select the sections of a single profile
+        if profile_id is not None:
+            self.check_profile_id(profile_id)
+            return heights[self.offsets[profile_id]:self.offsets[profile_id + 1]]
+
+        return heights
+
+    def is_ready(self, profile_id=None):
+        """Check if the wall (or a profile) reached the target height."""
+
+        heights = self.get_heights(profile_id)
+
+        # Check if there are any sections
+        if not len(heights):
+            return False
+
+        return min(heights) >= self.target_height
+
+    def get_ice(self, profile_id=None):
+        """Get the ice consumed by the wall (or by a profile)."""
+
+        # Get the ice of the whole wall
+        if profile_id is None:
+            return sum(self.feet) * self.volume_ice_per_foot
+
+        # Get the ice of a single profile
+        self.check_profile_id(profile_id)
+        return self.feet[profile_id] * self.volume_ice_per_foot
+
+    def get_cost(self, profile_id=None):
+        """Get the cost of the wall (or of a profile)."""
+        return self.get_ice(profile_id) * self.cost_per_volume
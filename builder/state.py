@@ -0,0 +1,181 @@
+# encoding: utf-8
+from builder.errors import *
+
+from array import array
+from collections import namedtuple
+import logging
+import os
+import struct
+import tempfile
+
+# Header of the state file (magic, fingerprint, day, teams, arrays)
+STATE_HEADER = struct.Struct('<4s40siii')
+STATE_MAGIC = b'WSTA'
+
+# Header of each array of the state file (name, typecode, item count)
+ARRAY_HEADER = struct.Struct('<8s1si')
+
+
+class SimulationState(namedtuple('SimulationState', [
+    'fingerprint',
+    'day',
+    'num_teams',
+    'arrays',
+])):
+    """Durable state of a simulation stored as flat arrays.
+
+    The state is written to a compact binary file: a fixed header with the
+    fingerprint of the configuration, the simulated day and the number of
+    teams, followed by the raw bytes of each named array. No objects are
+    pickled, so the state is restored with a copy of the bytes per array and
+    can be read by other processes. Each writer writes its own temporary
+    file that replaces the state file in a single step, so a reader never
+    sees a partly written state and concurrent writers do not mix their
+    states.
+
+    Attributes:
+        fingerprint (str)   : The fingerprint of the configuration.
+        day (int)           : The simulated day.
+        num_teams (int)     : The number of construction teams.
+        arrays (dict)       : The named arrays of the state (names of up to
+                              8 ASCII characters).
+
+    Example:
+
+        from array import array
+        from builder.state import SimulationState
+
+        # Save the heights of a simulation
+        state = SimulationState(fingerprint, 10, 2, {
+            'heights': array('b', [30, 27, 29])
+        })
+        state.save('wall.state')
+
+        # Restore the heights
+        print(SimulationState.load('wall.state').arrays['heights'])
+    """
+
+    __slots__ = ()
+
+    def save(self, filepath):
+        """Writes the state to a file.
+
+        Args:
+            filepath (str) : The path of the state file.
+
+        Returns:
+            SimulationState: The saved state.
+        """
+
+        # Write a temporary file of this writer next to the state file
+        handle, temp_filepath = tempfile.mkstemp(
+            prefix=os.path.basename(filepath) + '.',
+            suffix='.tmp',
+            dir=os.path.dirname(filepath) or '.'
+        )
+
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                file.write(STATE_HEADER.pack(
+                    STATE_MAGIC,
+                    self.fingerprint.encode('ascii'),
+                    self.day,
+                    self.num_teams,
+                    len(self.arrays)
+                ))
+
+                for name, items in self.arrays.items():
+                    file.write(ARRAY_HEADER.pack(
+                        name.encode('ascii'),
+                        items.typecode.encode('ascii'),
+                        len(items)
+                    ))
+                    file.write(items.tobytes())
+
+            # Replace the state file in a single step
+            os.replace(temp_filepath, filepath)
+
+        # Remove the temporary file of a failed write
+        except BaseException:
+            os.remove(temp_filepath)
+            raise
+
+        return self
+
+    @classmethod
+    def load(cls, filepath):
+        """Reads the state from a file.
+
+        Args:
+            filepath (str) : The path of the state file.
+
+        Returns:
+            SimulationState: The restored state.
+        """
+
+        with open(filepath, 'rb') as file:
+            data = memoryview(file.read())
+
+        # Check the format of the state file
+        try:
+            magic, fingerprint, day, num_teams, count = \
+                STATE_HEADER.unpack_from(data)
+        except struct.error:
+            raise BuilderError(f"Invalid state file {filepath}.")
+
+        if magic != STATE_MAGIC:
+            raise BuilderError(f"Invalid state file {filepath}.")
+
+        # Read the arrays one after the other
+        arrays = {}
+        offset = STATE_HEADER.size
+        for _ in range(count):
+            try:
+                name, typecode, length = ARRAY_HEADER.unpack_from(data, offset)
+            except struct.error:
+                raise BuilderError(f"Truncated state file {filepath}.")
+
+            try:
+                items = array(typecode.decode('ascii'))
+            except ValueError:
+                raise BuilderError(f"Invalid state file {filepath}.")
+
+            start = offset + ARRAY_HEADER.size
+            end = start + length * items.itemsize
+            if end > len(data):
+                raise BuilderError(f"Truncated state file {filepath}.")
+
+            items.frombytes(data[start:end])
+            arrays[name.rstrip(b'\0').decode('ascii')] = items
+            offset = end
+
+        try:
+            return cls(
+                fingerprint=fingerprint.decode('ascii'),
+                day=day,
+                num_teams=num_teams,
+                arrays=arrays
+            )
+        except ValueError:
+            raise BuilderError(f"Invalid state file {filepath}.")
+
+    @staticmethod
+    def discard(filepath, reason):
+        """Removes a state file that cannot be restored and logs a warning.
+
+        The builder then starts without the state and saves a new state
+        after its next build.
+
+        Args:
+            filepath (str)  : The path of the state file.
+            reason (str)    : The reason why the state cannot be restored.
+        """
+
+        logging.getLogger().warning(
+            f'Discarded the state file {filepath}: {reason}'
+        )
+
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,210 @@
+# encoding: utf-8
+from builder.errors import *
+from builder.histogram import WallHistogram
+
+
+class WallTable(object):
+    """Cumulative ice and cost of the wall for every day of the construction.
+
+    The table is materialized once per configuration. Each row holds the
+    cumulative ice per profile until the given day, so the ice and cost
+    queries are reduced to a lookup. Row 0 is the state before the first day
+    and the last row is the completed wall.
+
+    Attributes:
+        fingerprint (str)       : The fingerprint of the configuration.
+        params (dict)           : The parameters of the configuration.
+        cost_per_volume (int)   : The cost of ice per cubic foot.
+        rows (list)             : The cumulative ice per profile for each day.
+        totals (list)           : The cumulative ice of the wall for each day.
+        completion_days (list)  : The completion day of each profile.
+
+    Example:
+
+        from builder.configurator import WallConfigurator
+        from builder.table import WallTable
+
+        # Materialize the table for the configuration
+        config = WallConfigurator(profiles=[[21, 25, 28], [17]])
+        table = WallTable.from_config(config)
+
+        # Get the ice of the first profile on the first day
+        print(table.get_ice(day=1, profile_id=0))
+
+        # Get the cost of the wall until the tenth day
+        print(table.get_cost(day=10))
+    """
+
+    def __init__(self,
+                 rows=None,
+                 cost_per_volume=0,
+                 completion_days=None,
+                 fingerprint=None,
+                 params=None
+                 ):
+        """Initializes the table.
+
+        Args:
+            rows (list)             : The cumulative ice per profile per day.
+            cost_per_volume (int)   : The cost of ice per cubic foot.
+            completion_days (list)  : The completion day of each profile.
+            fingerprint (str)       : The fingerprint of the configuration.
+            params (dict)           : The parameters of the configuration.
+        """
+
+        # Set the instance attributes
+        self.fingerprint = fingerprint
+        self.params = params
+        self.cost_per_volume = cost_per_volume
+        self.rows = rows or [[]]
+        self.completion_days = completion_days or []
+
+        # Sum the profiles once for the overall queries
+        self.totals = [sum(row) for row in self.rows]
+
+    def __repr__(self):
+        """Returns a string representation of the table."""
+
+        return (f"WallTable(days={self.get_days()}, "
+                f"profiles={len(self.rows[0])}, "
+                f"ice={self.totals[-1]}"
+                f")"
+                )
+
+    @classmethod
+    def from_config(cls, config, previous=None):
+        """Materializes the table from a configuration.
+
+        The columns of the profiles that did not change since a previous
+        table are copied from it, so editing one profile recomputes only the
+        column of this profile.
+
+        Args:
+            config (WallConfigurator)   : The configuration object.
+            previous (WallTable)        : A table of an earlier configuration,
+                                          or None.
+
+        Returns:
+            WallTable : The table with one row per day.
+        """
+
+        # Find the profiles to compute (all without a compatible table)
+        changed = None
+        if previous is not None and previous.params is not None:
+            changed = config.get_changed_profiles(previous.params)
+        if changed is None:
+            changed = range(len(config.profiles))
+        changed = set(changed)
+
+        # Count the sections of each changed profile by start height
+        histograms = {
+            profile_id: WallHistogram.from_heights(
+                config.profiles[profile_id], config.target_height
+            )
+            for profile_id in changed if profile_id < len(config.profiles)
+        }
+
+        # All sections are completed until the day of the target height
+        rows = []
+        for day in range(config.target_height + 1):
+            rows.append([
+                histograms[profile_id].get_ice(
+                    day=day,
+                    volume_ice_per_foot=config.volume_ice_per_foot,
+                    build_rate=config.build_rate
+                )
+                if profile_id in changed else previous.rows[day][profile_id]
+                for profile_id in range(len(config.profiles))
+            ])
+
+        # Get the day on which each profile is completed
+        completion_days = [
+            histograms[profile_id].get_completion_day(config.build_rate)
+            if profile_id in changed else previous.completion_days[profile_id]
+            for profile_id in range(len(config.profiles))
+        ]
+
+        return cls(
+            rows=rows,
+            cost_per_volume=config.cost_per_volume,
+            completion_days=completion_days,
+            fingerprint=config.get_fingerprint(),
+            params=config.copy_params()
+        )
+
+    def get_days(self):
+        """Returns the last day in the table."""
+        return len(self.rows) - 1
+
+    def get_completion_day(self, profile_id=None):
+        """Returns the day on which the wall (or a profile) is completed.
+
+        Args:
+            profile_id (int)    : The profile ID, or None for the whole wall.
+
+        Returns:
+            int : The completion day.
+        """
+
+        # Get the completion day of the whole wall
+        if profile_id is None:
+            return max(self.completion_days, default=0)
+
+        # Get the completion day of a single profile
+        if not 0 <= profile_id < len(self.completion_days):
+            raise BuilderError(f"Profile with ID {profile_id} not found.")
+
+        return self.completion_days[profile_id]
+
+    def get_row(self, day):
+        """Returns the cumulative ice per profile until the given day.
+
+        Args:
+            day (int) : The day of the construction.
+
+        Returns:
+            list : The cumulative ice per profile.
+        """
+
+        # Check the day
+        if day < 0:
+            raise BuilderError(f"Day {day} is not valid.")
+
+        # Nothing changes after the wall is completed
+        return self.rows[min(day, self.get_days())]
+
+    def get_ice(self, day, profile_id=None):
+        """Returns the cumulative ice until the given day.
+
+        Args:
+            day (int)           : The day of the construction.
+            profile_id (int)    : The profile ID, or None for the whole wall.
+
+        Returns:
+            int : The cumulative ice.
+        """
+
+        # Get the row of the day
+        row = self.get_row(day)
+
+        # Get the ice of the whole wall
+        if profile_id is None:
+            return self.totals[min(day, self.get_days())]
+
+        # Get the ice of a single profile
+        if not 0 <= profile_id < len(row):
+            raise BuilderError(f"Profile with ID {profile_id} not found.")
+
+        return row[profile_id]
+
+    def get_cost(self, day, profile_id=None):
+        """Returns the cumulative cost until the given day.
+
+        Args:
+            day (int)           : The day of the construction.
+            profile_id (int)    : The profile ID, or None for the whole wall.
+
+        Returns:
+            int : The cumulative cost.
+        """
+        return self.get_ice(day, profile_id) * self.cost_per_volume
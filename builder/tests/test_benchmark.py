@@ -0,0 +1,31 @@
+from unittest import TestCase
+from multiprocessing import Queue
+from builder.benchmark import *
+
+
+class TestBenchmark(TestCase):
+
+    def test_log_records(self):
+
+        # Log the records without a queue handler
+        self.assertEqual(log_records(3), 3)
+
+    def test_benchmark_log_transport(self):
+
+        # Measure a small number of records
+        queue = Queue()
+        rate = benchmark_log_transport(queue, records=100, num_teams=2, tasks=4)
+        queue.close()
+
+        # Check the rate is positive
+        self.assertGreater(rate, 0)
+
+    def test_measure_sections(self):
+
+        # Measure a small number of sections
+        sizes = measure_sections(count=1000)
+
+        # Check the sizes are positive
+        self.assertGreater(sizes['memory'], 0)
+        self.assertGreater(sizes['pickle'], 0)
+        self.assertGreater(sizes['single'], 0)
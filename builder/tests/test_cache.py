@@ -0,0 +1,260 @@
+from unittest import TestCase
+from builder.cache import *
+from builder.engine import AnalyticEngine
+from builder.configurator import (
+    WallConfigurator,
+    COST_PER_VOLUME,
+)
+
+import os
+import tempfile
+
+
+class CountingEngine(AnalyticEngine):
+    """Analytic engine that counts the builds."""
+
+    builds = 0
+
+    def build(self, days=1, num_teams=1):
+        self.builds += 1
+        return super().build(days=days, num_teams=num_teams)
+
+
+class SlowEngine(CountingEngine):
+    """Counting engine that waits before each build."""
+
+    error = None
+
+    def build(self, days=1, num_teams=1):
+        import time
+        time.sleep(0.1)
+
+        if self.error:
+            raise self.error
+
+        return super().build(days=days, num_teams=num_teams)
+
+
+class TestBuildResult(TestCase):
+
+    def test_get_cost(self):
+
+        result = BuildResult(ice=[585, 195, 975], cost_per_volume=COST_PER_VOLUME)
+
+        # Check the totals and the profiles
+        self.assertEqual(result.get_ice(), 1755)
+        self.assertEqual(result.get_cost(), 3334500)
+        self.assertEqual(result.get_cost(profile_id=0), 1111500)
+
+        # Check unknown profiles raise an error
+        with self.assertRaises(BuilderError):
+            result.get_ice(profile_id=3)
+
+
+class TestResultCache(TestCase):
+
+    def setUp(self):
+
+        # Create an engine with a dedicated configuration
+        self.config = WallConfigurator(profiles=[[21, 25, 28], [17]])
+        self.engine = CountingEngine.set_config(self.config)
+        self.cache = ResultCache(maxsize=2)
+
+    def test_get_result(self):
+
+        # Check the first request builds the wall
+        result = self.cache.get_result(self.engine, days=1, num_teams=1)
+        self.assertEqual(result.ice, [585, 195])
+        self.assertEqual(self.engine.builds, 1)
+
+        # Check the second request is a hit
+        self.assertIs(self.cache.get_result(self.engine, days=1, num_teams=1), result)
+        self.assertEqual(self.engine.builds, 1)
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+        self.assertEqual(self.cache.get_stats()['misses'], 1)
+
+        # Check a different number of teams is a miss
+        self.cache.get_result(self.engine, days=1, num_teams=2)
+        self.assertEqual(self.engine.builds, 2)
+
+    def test_concurrent_builds(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Request different days from several threads
+        days = [1, 2, 3, 4] * 4
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda day: self.cache.get_result(self.engine, days=day),
+                days
+            ))
+
+        # Check each result matches its own build
+        for day, result in zip(days, results):
+            expected = BuildResult.from_builder(self.engine.build(days=day))
+            self.assertEqual(result.ice, expected.ice)
+
+    def test_single_flight(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        engine = SlowEngine.set_config(self.config)
+
+        # Request the same build from several threads
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: self.cache.get_result(engine, days=2),
+                range(8)
+            ))
+
+        # Check the wall was built once for all requests
+        self.assertEqual(engine.builds, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['misses'] + stats['hits'] + stats['coalesced'], 8)
+        self.assertGreater(stats['coalesced'], 0)
+        self.assertEqual(stats['pending'], 0)
+
+    def test_single_flight_async(self):
+        import asyncio
+
+        engine = SlowEngine.set_config(self.config)
+
+        async def main():
+            return await asyncio.gather(*[
+                self.cache.aget_result(engine, days=3) for _ in range(8)
+            ])
+
+        # Check the wall was built once for all requests
+        results = asyncio.run(main())
+        self.assertEqual(engine.builds, 1)
+        self.assertEqual(self.cache.get_stats()['coalesced'], 7)
+        self.assertEqual(results[0].ice, [1560, 585])
+
+    def test_cancel_async(self):
+        import asyncio
+
+        engine = SlowEngine.set_config(self.config)
+
+        async def main():
+            tasks = [
+                asyncio.create_task(self.cache.aget_result(engine, days=3))
+                for _ in range(2)
+            ]
+
+            # Cancel the coalesced request while the wall is built
+            await asyncio.sleep(0.01)
+            tasks[1].cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await tasks[1]
+
+            return await tasks[0]
+
+        # Check the other request still gets the result of the build
+        result = asyncio.run(main())
+        self.assertEqual(result.ice, [1560, 585])
+        self.assertEqual(engine.builds, 1)
+        self.assertEqual(self.cache.get_stats()['coalesced'], 1)
+
+        # Check the result is cached once the build is finished
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get_stats()['pending'], 0)
+
+    def test_build_locks(self):
+        from concurrent.futures import ThreadPoolExecutor
+        import time
+
+        engines = [SlowEngine.set_config(self.config) for _ in range(4)]
+
+        # Build different days with different engines at the same time
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(
+                lambda item: self.cache.get_result(item[1], days=item[0]),
+                enumerate(engines, start=1)
+            ))
+
+        # Check the builds of different engines do not wait for each other
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertTrue(all(engine.builds == 1 for engine in engines))
+
+        # Check each engine has its own lock
+        self.assertIs(self.cache.get_build_lock(engines[0]),
+                      self.cache.get_build_lock(engines[0]))
+        self.assertIsNot(self.cache.get_build_lock(engines[0]),
+                         self.cache.get_build_lock(engines[1]))
+
+    def test_single_flight_error(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        engine = SlowEngine.set_config(self.config)
+        engine.error = BuilderError("Build failed.")
+
+        # Check all waiting requests get the error
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.cache.get_result, engine, days=2)
+                for _ in range(4)
+            ]
+
+        for future in futures:
+            with self.assertRaises(BuilderError):
+                future.result()
+
+        # Check the failed build is not cached
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.get_stats()['pending'], 0)
+
+    def test_summarize(self):
+        from builder.manager import WallManager
+        from builder.snapshot import WallSnapshot
+
+        # Check the engine results are summarized
+        result = ResultCache.summarize(self.engine, days=1)
+        self.assertIsInstance(result, BuildResult)
+
+        # Check the manager results are snapshots
+        manager = WallManager.set_config(WallConfigurator(profiles=[[29]]))
+        with tempfile.TemporaryDirectory() as folder:
+            manager.log_filepath = os.path.join(folder, 'wall.log')
+            result = ResultCache.summarize(manager, days=1)
+        self.assertIsInstance(result, WallSnapshot)
+        self.assertEqual(result.get_ice(profile_id=0), result.volume_ice_per_foot)
+
+        # Restore the shared configuration
+        del WallManager.config
+
+    def test_config_change(self):
+
+        # Check a changed configuration is a miss
+        self.cache.get_result(self.engine, days=1)
+        self.config.profiles = [[29]]
+        result = self.cache.get_result(self.engine, days=1)
+        self.assertEqual(result.ice, [195])
+        self.assertEqual(self.engine.builds, 2)
+
+    def test_eviction(self):
+
+        # Fill the cache and use the first result again
+        self.cache.get_result(self.engine, days=1)
+        self.cache.get_result(self.engine, days=2)
+        self.cache.get_result(self.engine, days=1)
+
+        # Check the least recently used result is evicted
+        self.cache.get_result(self.engine, days=3)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.get_result(self.engine, days=1)
+        self.assertEqual(self.engine.builds, 3)
+        self.cache.get_result(self.engine, days=2)
+        self.assertEqual(self.engine.builds, 4)
+
+    def test_clear(self):
+
+        # Check the cache is empty after clearing
+        self.cache.get_result(self.engine, days=1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+        # Check an invalid size
+        with self.assertRaises(BuilderError):
+            ResultCache(maxsize=0)
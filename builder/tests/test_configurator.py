@@ -61,6 +61,8 @@ class TestConfigurator(TestCase):
         self.assertEqual(config.build_rate, BUILD_RATE)
         self.assertEqual(config.num_teams, MAX_WORKERS)
         self.assertEqual(config.cpu_worktime, WORK_DELAY)
+        self.assertEqual(config.chunk_size, CHUNK_SIZE)
+        self.assertEqual(config.engine, ENGINE)
         self.assertEqual(config.profiles, PROFILES)
 
     def test_from_ini(self):
@@ -79,6 +81,8 @@ class TestConfigurator(TestCase):
         self.assertEqual(config.build_rate, BUILD_RATE)
         self.assertEqual(config.num_teams, MAX_WORKERS)
         self.assertEqual(config.cpu_worktime, WORK_DELAY)
+        self.assertEqual(config.chunk_size, CHUNK_SIZE)
+        self.assertEqual(config.engine, ENGINE)
         self.assertEqual(config.profiles, expected_profiles)
 
     def test_to_ini(self):
@@ -104,3 +108,38 @@ class TestConfigurator(TestCase):
         # Delete the test file
         path = pathlib.Path('test_modified.ini')
         path.unlink()
+
+    def test_get_fingerprint(self):
+
+        # Check the fingerprint is stable
+        config = WallConfigurator.from_ini('test.ini')
+        self.assertEqual(
+            config.get_fingerprint(),
+            self.default_config.get_fingerprint()
+        )
+
+        # Check the fingerprint changes with the configuration
+        config.profiles = [[1, 2, 3]]
+        self.assertNotEqual(
+            config.get_fingerprint(),
+            self.default_config.get_fingerprint()
+        )
+
+    def test_get_changed_profiles(self):
+
+        # Check an edited row changes only its profile
+        config = WallConfigurator.from_ini('test.ini')
+        params = config.copy_params()
+        config.profiles[1] = [18]
+        self.assertEqual(config.get_changed_profiles(params), [1])
+
+        # Check the copied parameters are not changed by the edit
+        self.assertEqual(params['profiles'][1], [17])
+
+        # Check an added row changes only the new profile
+        config.profiles.append([20])
+        self.assertEqual(config.get_changed_profiles(params), [1, 3])
+
+        # Check another parameter changes the whole wall
+        config.build_rate += 1
+        self.assertIsNone(config.get_changed_profiles(params))
@@ -0,0 +1,120 @@
+from unittest import TestCase
+from builder.engine import *
+from builder.manager import WallManager
+from builder.configurator import (
+    WallConfigurator,
+    TARGET_HEIGHT,
+    VOLUME_ICE_PER_FOOT,
+    COST_PER_VOLUME,
+)
+
+import os
+import tempfile
+
+
+class TestAnalyticEngine(TestCase):
+
+    def setUp(self):
+
+        # Define the config list from the problem description
+        self.config_list = [
+            [21, 25, 28],
+            [17],
+            [17, 22, 17, 19, 17, ]
+        ]
+
+        # Create the engine with a dedicated configuration
+        config = WallConfigurator(profiles=self.config_list)
+        self.engine = AnalyticEngine.set_config(config)
+
+    def test_init(self):
+
+        # Check the default values
+        engine = AnalyticEngine()
+        self.assertEqual(engine.days, 0)
+        self.assertEqual(engine.get_ice(), 0)
+        self.assertEqual(engine.get_cost(), 0)
+
+    def test_get_ice(self):
+
+        # Build for one day
+        self.engine.build(days=1)
+
+        # Check the ice per profile (see the problem description)
+        self.assertEqual(self.engine.get_ice(profile_id=0), 585)
+        self.assertEqual(self.engine.get_ice(profile_id=1), 195)
+        self.assertEqual(self.engine.get_ice(profile_id=2), 975)
+        self.assertEqual(self.engine.get_ice(), 1755)
+
+        # Check the ice of a single section
+        self.assertEqual(self.engine.get_ice(section_id=0), 195)
+
+    def test_get_cost(self):
+
+        # Build for one day
+        self.engine.build(days=1)
+
+        # Check the cost (see the problem description)
+        self.assertEqual(self.engine.get_cost(profile_id=0), 1111500)
+        self.assertEqual(self.engine.get_cost(), 3334500)
+
+        # Build the whole wall
+        self.engine.build(days=TARGET_HEIGHT)
+        self.assertEqual(self.engine.get_cost(), 32233500)
+
+    def test_is_ready(self):
+
+        # Check the last section of the first profile is ready on day 2
+        self.engine.build(days=1)
+        self.assertFalse(self.engine.is_ready(section_id=2))
+        self.engine.build(days=2)
+        self.assertTrue(self.engine.is_ready(section_id=2))
+
+        # Check the wall is ready after the last section is completed
+        self.engine.build(days=12)
+        self.assertFalse(self.engine.is_ready())
+        self.engine.build(days=13)
+        self.assertTrue(self.engine.is_ready())
+
+    def test_invalid_ids(self):
+
+        # Check unknown profiles and sections raise an error
+        with self.assertRaises(BuilderError):
+            self.engine.get_ice(profile_id=3)
+
+        with self.assertRaises(BuilderError):
+            self.engine.get_ice(section_id=9)
+
+    def test_validate(self):
+
+        # Check a valid configuration
+        self.engine.validate()
+
+        # Check an invalid start height
+        config = WallConfigurator(profiles=[[1, 2], [3, 31]])
+        engine = AnalyticEngine.set_config(config)
+        with self.assertRaises(BuilderValidationError):
+            engine.validate()
+
+    def test_compare_simulation(self):
+
+        # Build the wall with a pool of workers
+        with tempfile.TemporaryDirectory() as folder:
+            manager = WallManager(log_filepath=os.path.join(folder, 'wall.log'))
+            manager.set_config_list(self.config_list)
+            manager.build(days=5, num_teams=5)
+
+        # Build the wall analytically
+        self.engine.build(days=5)
+
+        # Check the results are the same
+        self.assertEqual(self.engine.get_ice(), manager.get_ice())
+        for profile in manager.profiles:
+            expected_ice = profile.get_ice()
+            obtained_ice = self.engine.get_ice(profile_id=profile.profile_id)
+            self.assertEqual(obtained_ice, expected_ice)
+
+        # Check the expected values
+        expected_cost = self.engine.get_ice() * COST_PER_VOLUME
+        self.assertEqual(self.engine.get_cost(), expected_cost)
+        self.assertEqual(self.engine.get_ice(section_id=1), 5 * VOLUME_ICE_PER_FOOT)
@@ -0,0 +1,65 @@
+from unittest import TestCase
+from builder.histogram import *
+from builder.configurator import (
+    TARGET_HEIGHT,
+    VOLUME_ICE_PER_FOOT,
+    COST_PER_VOLUME,
+)
+
+
+class TestWallHistogram(TestCase):
+
+    def setUp(self):
+        self.heights = [17, 22, 17, 19, 17]
+        self.histogram = WallHistogram.from_heights(self.heights, TARGET_HEIGHT)
+
+    def test_init(self):
+
+        # Check the buckets
+        self.assertEqual(len(self.histogram.counts), TARGET_HEIGHT + 1)
+        self.assertEqual(len(self.histogram), len(self.heights))
+        self.assertEqual(self.histogram.counts[17], 3)
+
+        # Check an empty histogram
+        histogram = WallHistogram(target_height=TARGET_HEIGHT)
+        self.assertEqual(len(histogram), 0)
+        self.assertEqual(histogram.get_completion_day(), 0)
+
+    def test_get_feet(self):
+
+        # Check the feet match the sum over the sections
+        for day in range(TARGET_HEIGHT + 2):
+            expected_feet = sum(
+                min(day, TARGET_HEIGHT - h) for h in self.heights
+            )
+            self.assertEqual(self.histogram.get_feet(day), expected_feet)
+
+        # Check the feet on a single day
+        self.assertEqual(self.histogram.get_daily_feet(0), 0)
+        self.assertEqual(self.histogram.get_daily_feet(1), 5)
+        self.assertEqual(self.histogram.get_daily_feet(9), 4)
+
+    def test_get_completion_day(self):
+
+        # Check the lowest section is completed last
+        self.assertEqual(self.histogram.get_completion_day(), 13)
+        self.assertEqual(self.histogram.get_completion_day(build_rate=2), 7)
+
+    def test_get_cost(self):
+
+        # Check the ice and cost of the first day
+        ice = self.histogram.get_ice(1, VOLUME_ICE_PER_FOOT)
+        self.assertEqual(ice, 975)
+
+        cost = self.histogram.get_cost(1, VOLUME_ICE_PER_FOOT, COST_PER_VOLUME)
+        self.assertEqual(cost, 975 * COST_PER_VOLUME)
+
+    def test_add(self):
+
+        # Check sections above the target height are counted as completed
+        self.histogram.add(TARGET_HEIGHT + 1)
+        self.assertEqual(self.histogram.counts[TARGET_HEIGHT], 1)
+
+        # Check negative heights are rejected
+        with self.assertRaises(BuilderError):
+            self.histogram.add(-1)
@@ -0,0 +1,148 @@
+from unittest import TestCase
+from builder.logreader import *
+
+import tempfile
+
+
+class TestLogReader(TestCase):
+
+    def setUp(self):
+
+        # Create a log file in a temporary folder
+        self.folder = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.folder.name, 'wall.log')
+
+        self.lines = [
+            '2024-08-12 21:41:29,246 INFO     Worker-1        - '
+            'Added 1 foot to section 0 to reach 22 feet on day 1',
+            '2024-08-12 21:41:29,246 INFO     Worker-2        - '
+            'Added 1 foot to section 3 to reach 18 feet on day 1',
+            '2024-08-12 21:41:29,247 INFO     Worker-1        - '
+            'Added 1 foot to section 0 to reach 23 feet on day 2',
+            '2024-08-12 21:41:29,248 INFO     Worker-2        - '
+            'Added 1 foot to section 3 to reach 19 feet on day 2',
+        ]
+
+        with open(self.filepath, 'w') as file:
+            file.write('\n'.join(self.lines) + '\n')
+
+        self.reader = LogReader(self.filepath)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_get_section_ids(self):
+        profiles = [[21, 25, 28], [17], [17, 22]]
+        self.assertIsNone(get_section_ids(profiles))
+        self.assertEqual(get_section_ids(profiles, profile_id=2), range(4, 6))
+        self.assertEqual(get_section_ids(profiles, section_id=1), range(1, 2))
+        self.assertEqual(get_section_ids(profiles, 1, section_id=0), range(0))
+
+        with self.assertRaises(BuilderError):
+            get_section_ids(profiles, profile_id=3)
+
+    def test_get_page(self):
+
+        # Check all lines without a limit
+        page = self.reader.get_page()
+        self.assertEqual(page, {'logs': self.lines, 'next': None})
+
+        # Check the pages follow each other
+        page = self.reader.get_page(limit=3)
+        self.assertEqual(page['logs'], self.lines[:3])
+
+        page = self.reader.get_page(cursor=page['next'], limit=3)
+        self.assertEqual(page, {'logs': self.lines[3:], 'next': None})
+
+        # Check an invalid limit
+        with self.assertRaises(BuilderError):
+            self.reader.get_page(limit=0)
+
+    def test_filters(self):
+
+        # Check the filters of the lines
+        logs = self.reader.get_page(day=2)['logs']
+        self.assertEqual(logs, self.lines[2:])
+
+        logs = self.reader.get_page(section_ids=range(3, 4))['logs']
+        self.assertEqual(logs, [self.lines[1], self.lines[3]])
+
+        logs = self.reader.get_page(day=1, process='Worker-1')['logs']
+        self.assertEqual(logs, self.lines[:1])
+
+        # Check the filters across the pages
+        page = self.reader.get_page(limit=1, process='Worker-2')
+        self.assertEqual(page['logs'], self.lines[1:2])
+        page = self.reader.get_page(page['next'], limit=1, process='Worker-2')
+        self.assertEqual(page, {'logs': self.lines[3:], 'next': None})
+
+    def test_partial_line(self):
+
+        # Write a line without the end of line
+        with open(self.filepath, 'a') as file:
+            file.write('2024-08-12 21:41:29,249 INFO')
+
+        # Check the partly written line is skipped
+        self.assertEqual(self.reader.get_page()['logs'], self.lines)
+
+    def test_get_tail(self):
+
+        # Check all lines are new at the start
+        tail = self.reader.get_tail()
+        self.assertEqual(tail['logs'], self.lines)
+        self.assertEqual(tail['offset'], self.reader.get_size())
+
+        # Check only the appended lines are returned
+        with open(self.filepath, 'a') as file:
+            file.write(self.lines[0] + '\n' + self.lines[1])
+
+        tail = self.reader.get_tail(tail['offset'])
+        self.assertEqual(tail['logs'], self.lines[:1])
+
+        # Check the offset does not move without new lines
+        self.assertEqual(
+            self.reader.get_tail(tail['offset']),
+            {'logs': [], 'offset': tail['offset']}
+        )
+
+        # Check the offset moves past the lines that do not match
+        tail = self.reader.get_tail(day=3)
+        self.assertEqual(tail['logs'], [])
+        self.assertEqual(tail['offset'], self.reader.get_tail()['offset'])
+
+        # Check the limit keeps the next line for the next call
+        tail = self.reader.get_tail(limit=1, process='Worker-2')
+        self.assertEqual(tail['logs'], self.lines[1:2])
+        tail = self.reader.get_tail(tail['offset'], limit=1, process='Worker-2')
+        self.assertEqual(tail['logs'], self.lines[3:])
+
+    def test_get_tail_restarted(self):
+
+        # Check a log file started anew is read from the beginning
+        tail = self.reader.get_tail(offset=10 ** 6)
+        self.assertEqual(tail['logs'], self.lines)
+
+    def test_missing_file(self):
+        reader = LogReader(os.path.join(self.folder.name, 'missing.log'))
+        self.assertEqual(reader.get_page(), {'logs': [], 'next': None})
+
+    def test_log_query_mixin(self):
+        from builder.configurator import WallConfigurator
+
+        # Query the log file through a builder with two profiles
+        builder = LogQueryMixin()
+        builder.config = WallConfigurator(profiles=[[21, 25, 28], [17]])
+        builder.log_filepath = self.filepath
+
+        # Check the profile filter selects the global section IDs
+        page = builder.get_logs(profile_id=1, limit=1)
+        self.assertEqual(page['logs'], self.lines[1:2])
+        page = builder.get_logs(cursor=page['next'], profile_id=1)
+        self.assertEqual(page, {'logs': self.lines[3:], 'next': None})
+        self.assertEqual(list(builder.iter_logs(day=2, section_id=0))[0][0],
+                         self.lines[2])
+
+        # Check the tail is read from the same source
+        tail = builder.tail_logs(profile_id=0)
+        self.assertEqual(tail['logs'], self.lines[0::2])
+        self.assertEqual(builder.tail_logs(tail['offset'])['logs'], [])
@@ -1,4 +1,4 @@
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from builder.manager import *
 from builder.errors import *
 from builder.configurator import (
@@ -8,6 +8,13 @@ from builder.configurator import (
     MAX_SECTION_COUNT
 )
 
+from array import array
+
+import logging
+import os
+import pickle
+import tempfile
+
 
 class TestWallSection(TestCase):
 
@@ -44,6 +51,41 @@ class TestWallSection(TestCase):
         # Check the current height is equal to the target height
         self.assertEqual(self.section.current_height, TARGET_HEIGHT)
 
+    def test_build_rate(self):
+
+        # Build with a build rate above the height of the target
+        config = WallSection.config
+        WallSection.set_config(WallConfigurator(build_rate=120))
+        try:
+            self.section.build(days=2)
+        finally:
+            WallSection.config = config
+
+        # Check the section stops at the target height
+        self.assertEqual(self.section.current_height, TARGET_HEIGHT)
+        self.assertEqual(self.section.day, 1)
+
+    def test_build_log(self):
+
+        # Log the build progress to the logger of the caller
+        with self.assertLogs('caller', level='INFO') as logs:
+            self.section.build(days=2, log=logging.getLogger('caller'))
+
+        # Check the progress of each day is logged
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(logs.records[-1].work, (2, None, 0, 0, 2))
+
+    def test_slots(self):
+
+        # Check the section has no instance dictionary
+        self.assertFalse(hasattr(self.section, '__dict__'))
+
+        # Check the section survives a pickle round trip
+        self.section.build(days=3)
+        section = pickle.loads(pickle.dumps(self.section))
+        self.assertEqual(section, self.section)
+        self.assertEqual(section.day, 3)
+
     def test_get_ice(self):
 
         # Initialize the start height
@@ -246,6 +288,44 @@ class TestWallProfile(TestCase):
         for section in self.sections:
             self.assertEqual(section.current_height, TARGET_HEIGHT)
 
+    def test_build_active_sections(self):
+
+        # Count the days built by each section
+        class CountedSection(WallSection):
+            calls = []
+
+            def build(self, days=1, log=None):
+                self.calls.append(self.section_id)
+                return super().build(days=days, log=log)
+
+        sections = [
+            CountedSection(section_id=i, profile_id=1, start_height=height)
+            for i, height in enumerate([TARGET_HEIGHT - 1, TARGET_HEIGHT - 3,
+                                        TARGET_HEIGHT])
+        ]
+
+        # Build the profile for more days than needed
+        profile = WallProfile(profile_id=1, sections=sections).build(days=5)
+
+        # Check only the unfinished sections were built each day
+        self.assertTrue(profile.is_ready())
+        self.assertEqual(CountedSection.calls, [0, 1, 1, 1])
+
+    def test_get_histogram(self):
+
+        # Set the start heights of the sections
+        for section, height in zip(self.sections, [28, 28, 17]):
+            section.start_height = height
+
+        # Check the sections are counted by start height
+        histogram = self.profile.get_histogram()
+        self.assertEqual(len(histogram), 3)
+        self.assertEqual(histogram.counts[28], 2)
+        self.assertEqual(histogram.counts[17], 1)
+
+        # Check the completion day of the profile
+        self.assertEqual(histogram.get_completion_day(), TARGET_HEIGHT - 17)
+
     def test_validate_profile_id(self):
 
         # Set the profile-id to valid values
@@ -289,12 +369,126 @@ class TestWallProfile(TestCase):
                 profile.validate()
 
 
+class TestWallProfileArray(TestCase):
+
+    def setUp(self):
+        self.starts = array('b', [21, 25, 28, 17])
+        self.heights = array('b', self.starts)
+        self.profile = WallProfileArray(0, 0, 3, self.starts, self.heights)
+
+    def test_init(self):
+
+        # Check the profile is a slice of the arrays
+        self.assertEqual(list(self.profile.get_starts()), [21, 25, 28])
+        self.assertEqual([s.section_id for s in self.profile.sections], [0, 1, 2])
+
+    def test_build(self):
+
+        # Build the profile for two days
+        self.profile.build(days=2)
+
+        # Check only the sections of the profile are built
+        self.assertEqual(list(self.heights), [23, 27, 30, 17])
+        self.assertEqual([s.day for s in self.profile.sections], [2, 2, 2])
+
+        # Check the ice of the built feet
+        self.assertEqual(self.profile.get_ice(), 6 * VOLUME_ICE_PER_FOOT)
+        self.assertEqual(self.profile.get_cost(),
+                         6 * VOLUME_ICE_PER_FOOT * COST_PER_VOLUME)
+
+    def check_build(self, use_numpy):
+
+        # Build the profile for two and then eleven more days
+        self.profile.use_numpy = use_numpy
+        self.profile.build(days=2)
+        self.assertEqual(list(self.heights), [23, 27, 30, 17])
+        self.profile.build(days=11)
+
+        # Check the sections stop at the target height
+        self.assertEqual(list(self.heights), [30, 30, 30, 17])
+        self.assertEqual(self.profile.feet, 9 + 5 + 2)
+
+    def test_build_python(self):
+        self.check_build(use_numpy=False)
+
+    def check_build_rate(self, use_numpy):
+
+        # Build the profile with a build rate above the height of the target
+        self.profile.config = WallConfigurator(build_rate=120)
+        self.profile.use_numpy = use_numpy
+        self.profile.build(days=2)
+
+        # Check the heights stop at the target height
+        self.assertEqual(list(self.heights), [30, 30, 30, 17])
+        self.assertEqual(self.profile.feet, 9 + 5 + 2)
+        self.assertTrue(self.profile.is_ready())
+
+    def test_build_rate_python(self):
+        self.check_build_rate(use_numpy=False)
+
+    @skipIf(np is None, 'NumPy is not installed')
+    def test_build_rate_numpy(self):
+        self.check_build_rate(use_numpy=True)
+
+    @skipIf(np is None, 'NumPy is not installed')
+    def test_build_numpy(self):
+        self.check_build(use_numpy=True)
+
+    def test_is_ready(self):
+
+        # Check the profile is ready at the target height
+        self.assertFalse(self.profile.is_ready())
+        self.profile.build(days=TARGET_HEIGHT)
+        self.assertTrue(self.profile.is_ready())
+
+        # Check an empty profile is not ready
+        self.assertFalse(WallProfileArray().is_ready())
+
+    def test_update_aggregates(self):
+
+        # Check the counters of the start heights
+        self.assertEqual((self.profile.remaining, self.profile.feet), (3, 0))
+
+        # Check the counters are updated while building
+        self.profile.build(days=3)
+        self.assertEqual((self.profile.remaining, self.profile.feet), (2, 8))
+
+        # Check the counters match the heights
+        self.profile.update_aggregates()
+        self.assertEqual((self.profile.remaining, self.profile.feet), (2, 8))
+
+        # Check the counters follow the histogram of the start heights
+        self.assertEqual(self.profile.days, 3)
+        self.assertEqual(self.profile.feet, self.profile.histogram.get_feet(3))
+        self.profile.build(days=TARGET_HEIGHT)
+        self.assertEqual(self.profile.days, self.profile.get_completion_day())
+        self.assertEqual((self.profile.remaining, self.profile.feet), (0, 16))
+
+    def test_validate(self):
+
+        # Check a valid profile
+        self.profile.validate()
+
+        # Check an empty profile
+        with self.assertRaises(BuilderValidationError):
+            WallProfileArray().validate()
+
+
 class TestWallManager(TestCase):
 
+    def setUp(self):
+
+        # Write the logs of the builds to a temporary folder
+        self.folder = tempfile.TemporaryDirectory()
+        self.log_filepath = os.path.join(self.folder.name, 'wall.log')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
     def test_init(self):
 
         # Check default values are set
-        manager = WallManager()
+        manager = WallManager(log_filepath=self.log_filepath)
         self.assertIsInstance(manager.config, WallConfigurator)
         self.assertEqual(manager.sections, [])
         self.assertEqual(manager.profiles, [])
@@ -305,7 +499,7 @@ class TestWallManager(TestCase):
         config_list = [[1, 2], [3, ]]
 
         # Initialize the manager
-        manager = WallManager()
+        manager = WallManager(log_filepath=self.log_filepath)
         manager.set_config_list(config_list)
 
         # Check the manager is not ready
@@ -326,7 +520,7 @@ class TestWallManager(TestCase):
         expected_ice = 3 * (TARGET_HEIGHT - 29) * VOLUME_ICE_PER_FOOT
 
         # Create the manager
-        manager = WallManager()
+        manager = WallManager(log_filepath=self.log_filepath)
         manager.set_config_list(config_list)
 
         # Build for one day
@@ -347,7 +541,7 @@ class TestWallManager(TestCase):
                          )
 
         # Create the manager
-        manager = WallManager()
+        manager = WallManager(log_filepath=self.log_filepath)
         manager.set_config_list(config_list)
 
         # Build for one day
@@ -362,7 +556,7 @@ class TestWallManager(TestCase):
         config_list = [[29, 29], [29, ]]
 
         # Initialize the manager
-        manager = WallManager()
+        manager = WallManager(log_filepath=self.log_filepath)
         manager.set_config_list(config_list)
 
         # Build for one day
@@ -377,7 +571,7 @@ class TestWallManager(TestCase):
         config_list = [[1, 2], [3, 4]]
 
         # Create the manager
-        manager = WallManager()
+        manager = WallManager(log_filepath=self.log_filepath)
 
         # Define a valid nested list
         manager.set_config_list(config_list)
@@ -412,7 +606,7 @@ class TestWallManager(TestCase):
         total_cost = total_ice * COST_PER_VOLUME
 
         # Create the manager
-        manager = WallManager()
+        manager = WallManager(log_filepath=self.log_filepath)
 
         # Set the configuration list
         manager.set_config_list(config_list)
@@ -438,5 +632,537 @@ class TestWallManager(TestCase):
             expected_cost = expected_ice * COST_PER_VOLUME
             self.assertEqual(profile.get_cost(), expected_cost)
 
+    def test_get_table(self):
+
+        # Create the manager
+        manager = WallManager.set_config(
+            WallConfigurator(profiles=[[21, 25, 28], [17]])
+        )
+
+        # Check the table is materialized once per configuration
+        table = manager.get_table()
+        self.assertIs(manager.get_table(), table)
+        self.assertEqual(table.get_row(1), [585, 195])
+
+        # Check the table is materialized anew after a change
+        manager.set_config_list([[29, 29], [29, ]])
+        self.assertIsNot(manager.get_table(), table)
+        self.assertEqual(manager.get_table().get_row(1), [390, 195])
+
+        # Restore the shared configuration
+        del WallManager.config
+
+    def test_profile_config(self):
+
+        # Create the manager with a faster build rate
+        manager = WallManager.set_config(
+            WallConfigurator(build_rate=2, profiles=[[21, 25, 28], [17]])
+        )
+        manager.build_profiles(days=2)
+
+        # Check the profiles are built with the configuration of the manager
+        self.assertTrue(all(p.config is manager.config
+                            for p in manager.profiles))
+        self.assertEqual([p.feet for p in manager.profiles], [4 + 4 + 2, 4])
+        self.assertEqual(manager.profiles[1].get_completion_day(), 7)
+        self.assertEqual(manager.get_ice(), 14 * VOLUME_ICE_PER_FOOT)
+        self.assertEqual(manager.snapshot.get_ice(), manager.get_ice())
+
+        # Restore the shared configuration
+        del WallManager.config
+
+    def test_get_completion_day(self):
+
+        # Create the manager
+        manager = WallManager.set_config(
+            WallConfigurator(profiles=[[21, 25, 28], [17], [30]])
+        )
+        manager.parse_profile_list()
+
+        # Check the histograms of the profiles
+        histograms = manager.get_histograms()
+        self.assertEqual([len(h) for h in histograms], [3, 1, 1])
+
+        # Check the completion days
+        self.assertEqual(manager.get_completion_day(profile_id=0), 9)
+        self.assertEqual(manager.get_completion_day(profile_id=2), 0)
+        self.assertEqual(manager.get_completion_day(), 13)
+
+        # Restore the shared configuration
+        del WallManager.config
+
+    def test_build_shared_sections(self):
+
+        # Create a shared array with three heights
+        block = shared_memory.SharedMemory(create=True, size=3 * 4)
+        heights = block.buf.cast('i')
+        heights[0], heights[1], heights[2] = 28, 17, TARGET_HEIGHT
+
+        try:
+            # Build the first two sections in the current process
+            result = build_shared_sections(block.name, 0, 2, 5)
+
+            # Check the heights are updated in place
+            self.assertEqual(result, (0, 2))
+            self.assertEqual(list(heights), [TARGET_HEIGHT, 22, TARGET_HEIGHT])
+
+        finally:
+            heights.release()
+            block.close()
+            block.unlink()
+
+    def test_build_sections(self):
+
+        # Build the sections without a pool
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[28, 17], [29, ]])
+        manager.parse_profile_list()
+        manager.build_sections(
+            starmap=lambda func, tasks: [func(*task) for task in tasks],
+            days=2
+        )
+
+        # Check the heights and days of the sections
+        heights = [section.current_height for section in manager.sections]
+        self.assertEqual(heights, [30, 19, 30])
+        self.assertEqual([section.day for section in manager.sections], [2, 2, 1])
+
+    def test_build_profiles(self):
+
+        # Build the wall in the current process
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[21, 25, 28], [17], [17, 22, 17, 19, 17]])
+        manager.build_profiles(days=2)
+
+        # Check the heights and the totals of the profiles
+        self.assertEqual(list(manager.heights[:4]), [23, 27, 30, 19])
+        self.assertEqual(manager.get_ice(), 18 * VOLUME_ICE_PER_FOOT)
+        self.assertEqual(manager.get_daily_ice(2), 9 * VOLUME_ICE_PER_FOOT)
+        self.assertEqual(manager.snapshot.get_ice(), manager.get_ice())
+
+        # Check the wall is built again from the start heights
+        manager.build_profiles(days=13)
+        self.assertTrue(manager.is_ready())
+        self.assertFalse(manager.build_profiles(days=1).is_ready())
+
+    def test_parse_profile_list(self):
+
+        # Parse two profiles into the arrays of heights
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[28, 17], [29, ]])
+        manager.parse_profile_list()
+
+        # Check the profiles share the arrays of the manager
+        self.assertEqual(list(manager.starts), [28, 17, 29])
+        self.assertEqual([p.offset for p in manager.profiles], [0, 2])
+        self.assertTrue(all(p.heights is manager.heights
+                            for p in manager.profiles))
+
+        # Check the start heights out of range are rejected
+        manager.set_config_list([[28, 1000]])
+        with self.assertRaises(BuilderValidationError):
+            manager.parse_profile_list()
+
+    def test_get_profile_and_section(self):
+
+        # Parse duplicated rows
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[28, 17], [28, 17], [29, ]])
+        manager.parse_profile_list()
+
+        # Check each row gets its own profile ID
+        self.assertEqual([p.profile_id for p in manager.profiles], [0, 1, 2])
+        self.assertEqual(manager.get_profile(1).offset, 2)
+        self.assertEqual(list(manager.section_profiles), [0, 0, 1, 1, 2])
+
+        # Check the sections are found with their profile
+        section = manager.get_section(3)
+        self.assertEqual((section.profile_id, section.start_height), (1, 17))
+
+        # Check the missing IDs
+        for profile_id in [-1, 3, None]:
+            with self.assertRaises(BuilderError):
+                manager.get_profile(profile_id)
+        for section_id in [-1, 5, None]:
+            with self.assertRaises(BuilderError):
+                manager.get_section(section_id)
+
+    def test_update_aggregates(self):
+
+        # Build the sections without a pool
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[28, 17], [29, ]])
+        manager.parse_profile_list()
+        self.assertEqual((manager.remaining, manager.feet), (3, 0))
+
+        manager.build_sections(
+            starmap=lambda func, tasks: [func(*task) for task in tasks],
+            days=3
+        )
+
+        # Check the counters of the wall and the profiles
+        self.assertEqual((manager.remaining, manager.feet), (1, 6))
+        self.assertEqual([p.remaining for p in manager.profiles], [1, 0])
+
+        # Check the ice of each day
+        self.assertEqual(list(manager.daily_feet), [3, 2, 1])
+        self.assertEqual(manager.get_daily_ice(2), 2 * VOLUME_ICE_PER_FOOT)
+        self.assertEqual(manager.get_daily_ice(4), 0)
+        with self.assertRaises(BuilderError):
+            manager.get_daily_ice(0)
+
+    def test_resume_sections(self):
+
+        # Record the tasks of the builds without a pool
+        tasks = []
+
+        def starmap(func, items):
+            tasks.append(items)
+            return [func(*item) for item in items]
+
+        manager = WallManager(log_filepath=self.log_filepath, max_checkpoints=2)
+        manager.set_config_list([[20, 17], [25, ]])
+        manager.parse_profile_list()
+        manager.resume_sections(starmap, days=2)
+
+        # Check the build of a later day resumes from the checkpoint
+        manager.parse_profile_list()
+        manager.resume_sections(starmap, days=5)
+        self.assertEqual({(task[3], task[5]) for task in tasks[-1]}, {(3, 2)})
+        self.assertEqual(list(manager.heights), [25, 22, 30])
+        self.assertEqual(list(manager.daily_feet), [3, 3, 3, 3, 3])
+
+        # Check the build of a saved day is not simulated again
+        manager.parse_profile_list()
+        manager.resume_sections(starmap, days=2)
+        self.assertEqual(len(tasks), 2)
+        self.assertEqual(list(manager.heights), [22, 19, 27])
+
+        # Check the number of checkpoints is bounded
+        manager.parse_profile_list()
+        manager.resume_sections(starmap, days=1)
+        self.assertEqual([day for _, day in manager.checkpoints], [2, 1])
+
+    def test_load_resume(self):
+
+        # Record the days of the builds without a pool
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[20, 17], [25, ]])
+
+        def build(days):
+            manager.parse_profile_list()
+            resume = manager.load_resume(days)
+            manager.resume_sections(
+                lambda func, items: [func(*item) for item in items],
+                days=days,
+                resume=resume
+            )
+            return resume
+
+        # Check the log files are appended when they reach the checkpoint
+        self.assertEqual(build(2), (0, [], 'w'))
+        self.assertEqual(build(4), (2, [], 'a'))
+        self.assertEqual(manager.get_log_day(), 4)
+
+        # Check a saved day leaves the log files as they are
+        self.assertEqual(build(2), (2, [], 'a'))
+        self.assertEqual(manager.get_log_day(), 4)
+
+        # Check a day before the end of the log files starts them anew
+        self.assertEqual(build(3), (0, [], 'w'))
+        self.assertEqual(manager.get_log_day(), 3)
+        self.assertEqual(list(manager.heights), [23, 20, 28])
+
+        # Check the checkpoint of the last day in the log files is used
+        self.assertEqual(build(5), (3, [], 'a'))
+        self.assertEqual(list(manager.heights), [25, 22, 30])
+
+    def test_build_resume_logs(self):
+
+        # Build one day and resume the build up to the third day
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[28, 29], [27]])
+        manager.build(days=1)
+        manager.build(days=3)
+
+        # Check the files hold the progress of every day
+        worklog = manager.get_worklog()
+        self.assertEqual(
+            [len(worklog.get_records(day=day)) for day in range(1, 4)],
+            [3, 2, 1]
+        )
+        self.assertEqual(len(manager.get_logs()['logs']), 6)
+
+        # Check a saved day is answered without new log files
+        size = os.path.getsize(self.log_filepath)
+        manager.build(days=1)
+        self.assertEqual(os.path.getsize(self.log_filepath), size)
+        self.assertEqual(len(worklog), 6)
+
+    def test_resume_changed_profiles(self):
+
+        # Record the tasks of the builds without a pool
+        tasks = []
+
+        def starmap(func, items):
+            tasks.append(items)
+            return [func(*item) for item in items]
+
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[20, 17], [25, ], [21]])
+        manager.parse_profile_list()
+        manager.resume_sections(starmap, days=2)
+
+        # Check only the changed profile is built up to the checkpoint
+        manager.set_config_list([[20, 17], [26, ], [21]])
+        manager.parse_profile_list()
+        manager.resume_sections(starmap, days=4)
+        self.assertEqual({(task[1], task[3], task[5]) for task in tasks[-2]},
+                         {(2, 2, 0)})
+        self.assertEqual({task[5] for task in tasks[-1]}, {2})
+
+        # Check the heights match a new build
+        self.assertEqual(list(manager.heights), [24, 21, 30, 25])
+        self.assertEqual(list(manager.daily_feet), [4, 4, 4, 4])
+        self.assertEqual(len(manager.checkpoint_params), 2)
+
+    def test_save_load_state(self):
+        # Record the tasks of the builds without a pool
+        tasks = []
+
+        def starmap(func, items):
+            tasks.append(items)
+            return [func(*item) for item in items]
+
+        with tempfile.TemporaryDirectory() as folder:
+            filepath = os.path.join(folder, 'manager.state')
+
+            # Save the state after a build of two days
+            manager = WallManager(log_filepath=self.log_filepath)
+            manager.set_config_list([[20, 17], [25, ]])
+            manager.parse_profile_list()
+            manager.resume_sections(starmap, days=2)
+            manager.snapshot = manager.get_snapshot(days=2, num_teams=1)
+            manager.save_state(filepath)
+
+            # Check a new manager restores the build and the checkpoints
+            restored = WallManager(log_filepath=self.log_filepath)
+            self.assertTrue(restored.load_state(filepath))
+            self.assertEqual(list(restored.heights), [22, 19, 27])
+            self.assertEqual(restored.snapshot, manager.snapshot)
+            self.assertEqual(restored.get_ice(), manager.get_ice())
+            self.assertEqual(restored.get_log_day(), 2)
+
+            restored.parse_profile_list()
+            restored.resume_sections(starmap, days=3)
+            self.assertEqual({task[5] for task in tasks[-1]}, {2})
+
+            # Check the state of another configuration is ignored
+            restored.set_config_list([[20, 17]])
+            self.assertFalse(restored.load_state(filepath))
+            self.assertTrue(os.path.exists(filepath))
+
+    def test_invalid_state(self):
+
+        filepath = os.path.join(self.folder.name, 'manager.state')
+        manager = WallManager(log_filepath=self.log_filepath)
+        manager.set_config_list([[20, 17], [25, ]])
+
+        # Check a truncated state file is discarded with a warning
+        with open(filepath, 'wb') as file:
+            file.write(b'WSTA')
+        with self.assertLogs(level='WARNING'):
+            self.assertFalse(manager.load_state(filepath))
+        self.assertFalse(os.path.exists(filepath))
+
+        # Check a state of other sections is discarded
+        SimulationState(
+            fingerprint=manager.config.get_fingerprint(),
+            day=1,
+            num_teams=1,
+            arrays={'heights': array('b', [21])}
+        ).save(filepath)
+        with self.assertLogs(level='WARNING'):
+            self.assertFalse(manager.load_state(filepath))
+        self.assertFalse(os.path.exists(filepath))
+        self.assertEqual(manager.checkpoints, OrderedDict())
+
+    def test_build_shared_sections_profiles(self):
+        with tempfile.TemporaryDirectory() as folder:
+            log_filepath = os.path.join(folder, 'wall.log')
+
+            # Build two profiles with a chunk across both of them
+            manager = WallManager.set_config(
+                WallConfigurator(profiles=[[28, 29], [27]], chunk_size=2)
+            )
+            manager.log_filepath = log_filepath
+            manager.build(days=5, num_teams=2)
+
+            # Check the work records of each profile
+            worklog = manager.get_worklog()
+            self.assertEqual(len(worklog), 6)
+            self.assertEqual(len(worklog.get_records(profile_id=0)), 3)
+
+            records = worklog.get_records(profile_id=1)
+            self.assertEqual([r.section_id for r in records], [2, 2, 2])
+            self.assertEqual([r.height for r in records], [28, 29, 30])
+            self.assertTrue(all(r.team > 0 for r in records))
+
+        # Restore the shared configuration
+        del WallManager.config
+
+    def test_get_logs(self):
+        with tempfile.TemporaryDirectory() as folder:
+
+            # Write the logs of two profiles
+            manager = WallManager.set_config(
+                WallConfigurator(profiles=[[28], [29]])
+            )
+            manager.log_filepath = os.path.join(folder, 'wall.log')
+            manager.build(days=5, num_teams=2)
+
+            # Check the pages of the logs
+            page = manager.get_logs(limit=2)
+            self.assertEqual(len(page['logs']), 2)
+            page = manager.get_logs(cursor=page['next'], limit=2)
+            self.assertEqual(page, {'logs': page['logs'], 'next': None})
+            self.assertEqual(len(page['logs']), 1)
+
+            # Check the profile filter uses the global section numbering
+            logs = manager.get_logs(profile_id=1)['logs']
+            self.assertEqual(len(logs), 1)
+            self.assertIn('section 1 to reach 30 feet on day 1', logs[0])
+
+        # Restore the shared configuration
+        del WallManager.config
+
+    def test_build_snapshot(self):
+
+        # Build the wall for one day
+        manager = WallManager.set_config(
+            WallConfigurator(profiles=[[28, 29], [27]])
+        )
+        manager.log_filepath = self.log_filepath
+        snapshot = manager.build_snapshot(days=1, num_teams=2)
+
+        # Check the snapshot of the build
+        self.assertEqual(list(snapshot.get_heights()), [29, 30, 28])
+        self.assertEqual(snapshot.get_ice(), manager.get_ice())
+        self.assertEqual(snapshot.get_ice(profile_id=1), manager.get_ice(1))
+
+        # Check the snapshot does not change with the next build
+        manager.build(days=3, num_teams=2)
+        self.assertEqual(list(snapshot.get_heights()), [29, 30, 28])
+        self.assertIsNot(manager.snapshot, snapshot)
+        self.assertTrue(manager.snapshot.is_ready())
+
+        # Restore the shared configuration
+        del WallManager.config
+
+    def test_get_chunk_size(self):
+
+        # Create the manager with 100 sections
+        manager = WallManager.set_config(
+            WallConfigurator(profiles=[[29] * 60, [29] * 40])
+        )
+        manager.parse_profile_list()
+
+        # Check the auto-tuned chunk size
+        self.assertEqual(manager.get_chunk_size(num_teams=1), 25)
+        self.assertEqual(manager.get_chunk_size(num_teams=20), 2)
+
+        # Check the configured chunk size
+        manager.config.chunk_size = 7
+        self.assertEqual(manager.get_chunk_size(num_teams=20), 7)
+
+        # Check all sections are built in chunks
+        manager.log_filepath = self.log_filepath
+        manager.build(days=1, num_teams=2)
+        self.assertTrue(manager.is_ready())
+        self.assertEqual(manager.get_ice(), 100 * VOLUME_ICE_PER_FOOT)
+
+        # Restore the shared configuration
+        del WallManager.config
+
+
+class TestLogHandlers(TestCase):
+
+    def test_batch_queue_handler(self):
+        from queue import Queue
+
+        # Send the records in batches of two
+        queue = Queue()
+        handler = BatchQueueHandler(queue, batch_size=2, flush_interval=60)
+        log = logging.getLogger('TestBatchQueueHandler')
+        log.addHandler(handler)
+        log.propagate = False
+
+        try:
+            # Check the first record is buffered
+            log.warning('first')
+            self.assertTrue(queue.empty())
+
+            # Check the full batch is sent
+            log.warning('second')
+            batch = queue.get_nowait()
+            self.assertEqual([r.getMessage() for r in batch], ['first', 'second'])
+
+            # Check the flush sends an incomplete batch
+            log.warning('third')
+            handler.flush()
+            self.assertEqual(len(queue.get_nowait()), 1)
+            self.assertTrue(queue.empty())
+
+        finally:
+            log.removeHandler(handler)
+
+    def test_buffered_file_handler(self):
+
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, 'test.log')
+
+            # Write a record through the buffer
+            handler = BufferedFileHandler(filename, flush_interval=60)
+            handler.emit(logging.makeLogRecord({'msg': 'buffered'}))
+
+            # Check the record is written only after the flush
+            with open(filename) as file:
+                self.assertEqual(file.read(), '')
+
+            handler.flush()
+            with open(filename) as file:
+                self.assertEqual(file.read(), 'buffered\n')
+
+            handler.close()
+
+    def test_log_listener(self):
+        from multiprocessing import Queue
+
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, 'test.log')
+
+            # Start the listener without the console output
+            queue = Queue()
+            listener = LogListener(queue, logfile=filename, echo=False)
+            listener.start()
+
+            # Send a single record and a batch of records
+            records = [
+                logging.makeLogRecord({
+                    'name': 'test',
+                    'msg': f'record {i}',
+                    'levelno': logging.INFO,
+                    'levelname': 'INFO'
+                })
+                for i in range(3)
+            ]
+            queue.put(records[0])
+            queue.put(records[1:])
+            listener.stop()
 
+            # Check all records are written once
+            with open(filename) as file:
+                lines = file.read().splitlines()
 
+            self.assertEqual(len(lines), 3)
+            self.assertTrue(lines[-1].endswith('record 2'))
@@ -0,0 +1,164 @@
+from unittest import TestCase
+from builder.pool import *
+from builder.manager import WallManager
+from builder.configurator import (
+    TARGET_HEIGHT,
+    VOLUME_ICE_PER_FOOT,
+)
+
+import os
+import tempfile
+
+
+class TestWallPool(TestCase):
+
+    def setUp(self):
+
+        # Write the logs of the pool to a temporary folder
+        self.folder = tempfile.TemporaryDirectory()
+        self.log_filepath = os.path.join(self.folder.name, 'wall.log')
+        self.pool = WallPool(num_teams=2, log_filepath=self.log_filepath)
+
+    def tearDown(self):
+        self.pool.stop()
+        self.folder.cleanup()
+
+    def test_init(self):
+
+        # Check the pool is not started on creation
+        self.assertFalse(self.pool.is_running())
+        self.assertEqual(self.pool.get_stats()['queue_depth'], 0)
+
+    def test_starmap(self):
+
+        # Build three sections with the pool
+        sections = [WallSection(i, 0, 28) for i in range(3)]
+        sections = self.pool.starmap(
+            func=WallSection.build,
+            iterable=[(section, 1) for section in sections]
+        )
+
+        # Check the results are returned in order
+        self.assertEqual([s.section_id for s in sections], [0, 1, 2])
+        self.assertTrue(all(s.current_height == 29 for s in sections))
+
+        # Check the statistics
+        stats = self.pool.get_stats()
+        self.assertTrue(stats['running'])
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['completed'], 3)
+        self.assertGreater(stats['utilisation'], 0)
+
+    def test_resize(self):
+
+        # Start the pool and keep the log listener
+        self.pool.start()
+        listener = self.pool.listener
+
+        # Check the pool is restarted with the new size
+        self.pool.resize(3)
+        self.assertEqual(self.pool.num_teams, 3)
+        self.assertEqual(self.pool.get_stats()['num_teams'], 3)
+        self.assertIs(self.pool.listener, listener)
+        self.assertTrue(self.pool.is_running())
+
+    def test_resize_teams(self):
+
+        # Build the wall before and after resizing the pool
+        manager = WallManager(log_filepath=self.log_filepath, pool=self.pool)
+        manager.set_config_list([[20, 21, 22], [23, 24, 25]])
+        manager.build(days=1, num_teams=2)
+        self.pool.resize(3)
+        manager.build(days=1, num_teams=3)
+
+        # Check the teams of the records are numbered in the current pool
+        teams = {record.team for record in manager.get_worklog().get_records()}
+        self.assertTrue(teams)
+        self.assertTrue(teams <= {1, 2, 3})
+
+    def test_stop(self):
+
+        # Check the pool can be stopped and started again
+        self.pool.start().stop()
+        self.assertFalse(self.pool.is_running())
+        self.pool.start()
+        self.assertTrue(self.pool.is_running())
+
+    def test_manager_build(self):
+
+        # Build the wall twice with the same pool
+        manager = WallManager(log_filepath=self.log_filepath, pool=self.pool)
+        manager.set_config_list([[29, 29], [29, ]])
+        manager.build(days=1, num_teams=2)
+        workers = self.pool.pool
+        manager.build(days=1, num_teams=2)
+
+        # Check the pool of workers is reused
+        self.assertIs(self.pool.pool, workers)
+        self.assertTrue(manager.is_ready())
+        self.assertEqual(
+            manager.get_ice(),
+            3 * (TARGET_HEIGHT - 29) * VOLUME_ICE_PER_FOOT
+        )
+
+    def test_open_logs(self):
+
+        with tempfile.TemporaryDirectory() as folder:
+            filepath = os.path.join(folder, 'wall.log')
+            pool = WallPool(num_teams=1, log_filepath=filepath)
+
+            try:
+                # Build the wall twice with the same pool
+                manager = WallManager(
+                    log_filepath=filepath, pool=pool, max_checkpoints=0
+                )
+                manager.set_config_list([[28, 29], ])
+                for _ in range(2):
+                    manager.build(days=1, num_teams=1)
+
+                # Write the records of the last build to the files
+                pool.open_logs(mode='a')
+
+                # Check the files hold the progress of the last build only
+                with open(filepath) as file:
+                    lines = [line for line in file if 'Added' in line]
+                self.assertEqual(len(lines), 2)
+                self.assertEqual(len(manager.get_worklog()), 2)
+
+            finally:
+                pool.stop()
+
+    def test_worklog_index(self):
+
+        # Build the wall with the running pool
+        manager = WallManager(log_filepath=self.log_filepath, pool=self.pool)
+        manager.set_config_list([[28, 29], [29, ]])
+        manager.build(days=1, num_teams=2)
+
+        # Check the index of the work log is written after the build
+        worklog = manager.get_worklog()
+        self.assertEqual(worklog.get_index()[0], 3)
+        self.assertEqual(len(worklog.get_records(day=1)), 3)
+
+    def test_resume_logs(self):
+
+        # Build two days and resume the build up to the fourth day
+        manager = WallManager(log_filepath=self.log_filepath, pool=self.pool)
+        manager.set_config_list([[20, 17], [25, ]])
+        manager.build(days=2, num_teams=2)
+        manager.build(days=4, num_teams=2)
+        self.pool.stop()
+
+        # Check the files hold the progress of every day
+        worklog = manager.get_worklog()
+        self.assertEqual(
+            [len(worklog.get_records(day=day)) for day in range(1, 5)],
+            [3, 3, 3, 3]
+        )
+        self.assertEqual(len(manager.get_logs(day=1)['logs']), 3)
+
+        # Check a saved day is answered without workers or new log files
+        manager.build(days=2, num_teams=2)
+        self.assertFalse(self.pool.is_running())
+        self.assertEqual(len(worklog), 12)
+        self.assertEqual(list(manager.heights), [22, 19, 27])
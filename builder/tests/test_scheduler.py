@@ -0,0 +1,223 @@
+from unittest import TestCase
+from builder.scheduler import *
+from builder.engine import AnalyticEngine
+from builder.configurator import (
+    WallConfigurator,
+    TARGET_HEIGHT,
+    VOLUME_ICE_PER_FOOT,
+)
+
+
+class TestTeamScheduler(TestCase):
+
+    def setUp(self):
+
+        # Define the config list from the problem description
+        self.config = WallConfigurator(
+            profiles=[
+                [21, 25, 28],
+                [17],
+                [17, 22, 17, 19, 17, ]
+            ]
+        )
+        self.scheduler = TeamScheduler.set_config(self.config)
+
+    def test_init(self):
+
+        # Check the default values
+        scheduler = TeamScheduler()
+        self.assertEqual(scheduler.days, 0)
+        self.assertEqual(scheduler.assignments, [])
+        self.assertEqual(scheduler.reliefs, [])
+
+    def test_enough_teams(self):
+
+        # With a team per section the results match the analytic engine
+        engine = AnalyticEngine.set_config(self.config)
+        for days in [1, 2, 5, 13, 30]:
+            self.scheduler.build(days=days, num_teams=9)
+            engine.build(days=days)
+            self.assertEqual(self.scheduler.get_ice(), engine.get_ice())
+            for profile_id in range(3):
+                self.assertEqual(
+                    self.scheduler.get_ice(profile_id=profile_id),
+                    engine.get_ice(profile_id=profile_id)
+                )
+
+    def test_assignments(self):
+
+        # Build with a single team for two days
+        self.scheduler.build(days=2, num_teams=1)
+
+        # Check the team works on the first section until it is completed
+        self.assertEqual(
+            self.scheduler.get_assignments(),
+            [
+                Assignment(day=1, team=1, profile_id=0, section_id=0, height=22),
+                Assignment(day=2, team=1, profile_id=0, section_id=0, height=23),
+            ]
+        )
+
+        # Check the total ice of the two days
+        self.assertEqual(self.scheduler.get_ice(), 2 * VOLUME_ICE_PER_FOOT)
+
+    def test_move_to_next_section(self):
+
+        # Build the first profile with one team
+        self.scheduler.build(days=15, num_teams=1)
+
+        # Check the first section is completed on day 9
+        self.assertTrue(self.scheduler.is_ready(section_id=0))
+        self.assertEqual(self.scheduler.get_assignments(day=10)[0].section_id, 1)
+
+        # Check the first profile is completed after 9 + 5 + 2 days
+        self.assertFalse(self.scheduler.is_ready(profile_id=0))
+        self.scheduler.build(days=16, num_teams=1)
+        self.assertTrue(self.scheduler.is_ready(profile_id=0))
+
+    def test_reliefs(self):
+
+        # Build the whole wall with more teams than sections
+        self.scheduler.build(days=TARGET_HEIGHT, num_teams=10)
+
+        # Check the team without a section is relieved on the first day
+        self.assertIn(Relief(day=1, team=10), self.scheduler.reliefs)
+        self.assertEqual(len(self.scheduler.reliefs), 10)
+        self.assertTrue(self.scheduler.is_ready())
+
+        # Check each foot was added exactly once
+        feet = sum(TARGET_HEIGHT - h for row in self.config.profiles for h in row)
+        self.assertEqual(len(self.scheduler.assignments), feet)
+
+        # Check the logs contain the reliefs
+        logs = self.scheduler.get_logs()['logs']
+        self.assertEqual(logs[-1], 'Day 14 Team-9 - Relieved')
+
+    def test_get_logs_page(self):
+
+        # Simulate the teams until all are relieved
+        self.scheduler.build(days=20, num_teams=2)
+        logs = self.scheduler.get_logs()['logs']
+
+        # Check the pages follow each other
+        page = self.scheduler.get_logs(limit=10)
+        self.assertEqual(page['logs'], logs[:10])
+        page = self.scheduler.get_logs(cursor=page['next'])
+        self.assertEqual(page, {'logs': logs[10:], 'next': None})
+
+        # Check the filters
+        logs = self.scheduler.get_logs(day=1, process='Team-2')['logs']
+        self.assertEqual(len(logs), 1)
+        self.assertTrue(logs[0].startswith('Day 1 Team-2 - Added'))
+
+        logs = self.scheduler.get_logs(profile_id=1)['logs']
+        self.assertTrue(all('section 3 ' in line for line in logs))
+
+    def test_tail_logs(self):
+
+        # Check all records are new after the simulation
+        self.scheduler.build(days=20, num_teams=2)
+        logs = self.scheduler.get_logs()['logs']
+        tail = self.scheduler.tail_logs(limit=10)
+        self.assertEqual(tail['logs'], logs[:10])
+
+        # Check the remaining records and the final offset
+        tail = self.scheduler.tail_logs(offset=tail['offset'])
+        self.assertEqual(tail['logs'], logs[10:])
+        self.assertEqual(self.scheduler.tail_logs(tail['offset'])['logs'], [])
+
+    def test_resume(self):
+
+        # Continue a simulation with the same teams
+        self.scheduler.build(days=10, num_teams=2)
+        self.scheduler.build(days=20, num_teams=2)
+        resumed = list(self.scheduler.assignments)
+
+        # Check the result matches a new simulation
+        scheduler = TeamScheduler().build(days=20, num_teams=2)
+        self.assertEqual(resumed, scheduler.assignments)
+        self.assertEqual(self.scheduler.reliefs, scheduler.reliefs)
+
+        # Check an earlier day starts a new simulation
+        self.scheduler.build(days=5, num_teams=2)
+        self.assertEqual(self.scheduler.assignments,
+                         TeamScheduler().build(days=5, num_teams=2).assignments)
+
+    def test_rewind(self):
+
+        # Change the last profile after ten days
+        self.scheduler.build(days=10, num_teams=2)
+        self.config.profiles = [[21, 25, 28], [17], [17, 22, 17, 19, 20]]
+        affected = self.scheduler.get_affected_day()
+        self.assertLessEqual(affected, 10)
+        self.assertGreater(affected, 0)
+
+        # Check the rewound simulation matches a new simulation
+        self.scheduler.build(days=20, num_teams=2)
+        scheduler = TeamScheduler().build(days=20, num_teams=2)
+        self.assertEqual(self.scheduler.assignments, scheduler.assignments)
+        self.assertEqual(self.scheduler.reliefs, scheduler.reliefs)
+        self.assertEqual(self.scheduler.get_ice(), scheduler.get_ice())
+
+        # Check another parameter starts a new simulation
+        self.config.build_rate += 1
+        self.assertEqual(self.scheduler.get_affected_day(), 0)
+
+    def test_save_load_state(self):
+        import tempfile
+        import os
+
+        with tempfile.TemporaryDirectory() as folder:
+            filepath = os.path.join(folder, 'scheduler.state')
+
+            # Save the state after ten days
+            scheduler = TeamScheduler(state_filepath=filepath)
+            scheduler.build(days=10, num_teams=2)
+
+            # Check a new scheduler continues from the saved state
+            restored = TeamScheduler(state_filepath=filepath)
+            self.assertTrue(restored.load_state(filepath))
+            self.assertEqual(restored.assignments, scheduler.assignments)
+            self.assertEqual(restored.jobs, scheduler.jobs)
+            self.assertEqual(list(restored.ready), list(scheduler.ready))
+
+            restored.build(days=20, num_teams=2)
+            expected = TeamScheduler().build(days=20, num_teams=2)
+            self.assertEqual(restored.assignments, expected.assignments)
+            self.assertEqual(restored.get_ice(), expected.get_ice())
+
+    def test_invalid_state(self):
+        import tempfile
+        import os
+
+        with tempfile.TemporaryDirectory() as folder:
+            filepath = os.path.join(folder, 'scheduler.state')
+
+            # Check an invalid state file is discarded with a warning
+            with open(filepath, 'wb') as file:
+                file.write(b'WSTA')
+            scheduler = TeamScheduler(state_filepath=filepath)
+            with self.assertLogs(level='WARNING'):
+                scheduler.build(days=10, num_teams=2)
+            self.assertEqual(scheduler.days, 10)
+
+            # Check a state of other sections is discarded
+            SimulationState(
+                fingerprint=self.config.get_fingerprint(),
+                day=1,
+                num_teams=2,
+                arrays={'heights': array('i', [1, 2])}
+            ).save(filepath)
+            with self.assertLogs(level='WARNING'):
+                self.assertFalse(scheduler.load_state(filepath))
+            self.assertFalse(os.path.exists(filepath))
+
+    def test_invalid_ids(self):
+
+        # Check unknown profiles and sections raise an error
+        self.scheduler.build(days=1, num_teams=1)
+        with self.assertRaises(BuilderError):
+            self.scheduler.get_ice(profile_id=3)
+
+        with self.assertRaises(BuilderError):
+            self.scheduler.get_ice(section_id=9)
@@ -0,0 +1,62 @@
+from unittest import TestCase
+from builder.snapshot import *
+from builder.configurator import (
+    WallConfigurator,
+    TARGET_HEIGHT,
+    VOLUME_ICE_PER_FOOT,
+    COST_PER_VOLUME,
+)
+
+
+class TestWallSnapshot(TestCase):
+
+    def setUp(self):
+
+        # Take a snapshot of two profiles after one day
+        self.config = WallConfigurator(profiles=[[21, 25, 28], [17, 30]])
+        self.snapshot = WallSnapshot.from_rows(
+            starts=[[21, 25, 28], [17, 30]],
+            heights=[[22, 26, 29], [18, 30]],
+            config=self.config,
+            days=1,
+            num_teams=2
+        )
+
+    def test_get_heights(self):
+        self.assertEqual(list(self.snapshot.get_heights()), [22, 26, 29, 18, 30])
+        self.assertEqual(list(self.snapshot.get_heights(profile_id=1)), [18, 30])
+
+        # Check the heights cannot be changed
+        with self.assertRaises(TypeError):
+            self.snapshot.get_heights()[0] = TARGET_HEIGHT
+
+    def test_get_ice(self):
+        self.assertEqual(self.snapshot.feet, (3, 1))
+        self.assertEqual(self.snapshot.get_ice(), 4 * VOLUME_ICE_PER_FOOT)
+        self.assertEqual(self.snapshot.get_ice(profile_id=1), VOLUME_ICE_PER_FOOT)
+        self.assertEqual(
+            self.snapshot.get_cost(profile_id=0),
+            3 * VOLUME_ICE_PER_FOOT * COST_PER_VOLUME
+        )
+
+        # Check unknown profiles raise an error
+        with self.assertRaises(BuilderError):
+            self.snapshot.get_ice(profile_id=2)
+
+    def test_is_ready(self):
+        self.assertFalse(self.snapshot.is_ready())
+        self.assertFalse(self.snapshot.is_ready(profile_id=1))
+
+        # Check a profile at the target height
+        snapshot = WallSnapshot.from_rows([[29]], [[30]], self.config)
+        self.assertTrue(snapshot.is_ready(profile_id=0))
+
+    def test_immutable(self):
+
+        # Check the attributes cannot be changed
+        with self.assertRaises(AttributeError):
+            self.snapshot.days = 2
+
+        # Check the snapshot can be pickled (sent between processes)
+        import pickle
+        self.assertEqual(pickle.loads(pickle.dumps(self.snapshot)), self.snapshot)
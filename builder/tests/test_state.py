@@ -0,0 +1,90 @@
+from unittest import TestCase
+from builder.state import *
+from builder.errors import *
+
+from array import array
+import os
+import tempfile
+
+
+class TestSimulationState(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.folder.name, 'wall.state')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_save_load(self):
+
+        # Save arrays of different types
+        state = SimulationState('a' * 40, 10, 2, {
+            'heights': array('b', [30, 27, 29]),
+            'days': array('i', [5, 10]),
+            'empty': array('i'),
+        }).save(self.filepath)
+
+        # Check the state is restored
+        restored = SimulationState.load(self.filepath)
+        self.assertEqual(restored, state)
+        self.assertEqual(restored.arrays['heights'].typecode, 'b')
+
+    def test_concurrent_save(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        states = [
+            SimulationState('a' * 40, day, 1, {
+                'heights': array('i', [day] * 10000)
+            })
+            for day in range(8)
+        ]
+
+        # Save different states to the same file at the same time
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda state: state.save(self.filepath), states))
+
+        # Check the file holds one of the states and no temporary files
+        self.assertIn(SimulationState.load(self.filepath), states)
+        self.assertEqual(os.listdir(self.folder.name), ['wall.state'])
+
+    def test_failed_save(self):
+
+        # Check a failed write leaves no temporary file
+        with self.assertRaises(UnicodeEncodeError):
+            SimulationState('a' * 40, 1, 1, {
+                'höhe': array('i', [1])
+            }).save(self.filepath)
+        self.assertEqual(os.listdir(self.folder.name), [])
+
+    def test_invalid_file(self):
+
+        # Check a file of another format
+        with open(self.filepath, 'wb') as file:
+            file.write(b'WIDX' + bytes(60))
+        with self.assertRaises(BuilderError):
+            SimulationState.load(self.filepath)
+
+        # Check a truncated file
+        SimulationState('a' * 40, 1, 1, {
+            'heights': array('i', range(10))
+        }).save(self.filepath)
+        with open(self.filepath, 'r+b') as file:
+            file.truncate(os.path.getsize(self.filepath) - 4)
+        with self.assertRaises(BuilderError):
+            SimulationState.load(self.filepath)
+
+        # Check an array of an unknown type
+        with open(self.filepath, 'wb') as file:
+            file.write(STATE_HEADER.pack(STATE_MAGIC, b'a' * 40, 1, 1, 1))
+            file.write(ARRAY_HEADER.pack(b'heights', b'x', 0))
+        with self.assertRaises(BuilderError):
+            SimulationState.load(self.filepath)
+
+    def test_discard(self):
+
+        # Check the file is removed with a warning
+        SimulationState('a' * 40, 1, 1, {}).save(self.filepath)
+        with self.assertLogs(level='WARNING'):
+            SimulationState.discard(self.filepath, 'Invalid state file.')
+        self.assertFalse(os.path.exists(self.filepath))
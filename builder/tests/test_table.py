@@ -0,0 +1,94 @@
+from unittest import TestCase
+from builder.table import *
+from builder.configurator import (
+    WallConfigurator,
+    TARGET_HEIGHT,
+    COST_PER_VOLUME,
+)
+
+
+class TestWallTable(TestCase):
+
+    def setUp(self):
+
+        # Define the config list from the problem description
+        self.config = WallConfigurator(
+            profiles=[
+                [21, 25, 28],
+                [17],
+                [17, 22, 17, 19, 17, ]
+            ]
+        )
+
+        # Materialize the table
+        self.table = WallTable.from_config(self.config)
+
+    def test_init(self):
+
+        # Check the number of rows and columns
+        self.assertEqual(self.table.get_days(), TARGET_HEIGHT)
+        self.assertEqual(len(self.table.get_row(0)), 3)
+
+        # Check the fingerprint of the configuration
+        self.assertEqual(self.table.fingerprint, self.config.get_fingerprint())
+
+    def test_get_ice(self):
+
+        # Check the first day (see the problem description)
+        self.assertEqual(self.table.get_row(1), [585, 195, 975])
+        self.assertEqual(self.table.get_ice(day=1), 1755)
+
+        # Check the third day of the first profile
+        self.assertEqual(self.table.get_ice(day=3, profile_id=0), 585 + 585 + 390)
+
+        # Check the days after the completion of the wall
+        self.assertEqual(
+            self.table.get_ice(day=100),
+            self.table.get_ice(day=TARGET_HEIGHT)
+        )
+
+    def test_get_cost(self):
+
+        # Check the cost (see the problem description)
+        self.assertEqual(self.table.get_cost(day=1, profile_id=0), 1111500)
+        self.assertEqual(self.table.get_cost(day=1), 3334500)
+        self.assertEqual(self.table.get_cost(day=TARGET_HEIGHT), 32233500)
+
+        # Check the cost is the ice multiplied by the cost per volume
+        expected_cost = self.table.get_ice(day=5) * COST_PER_VOLUME
+        self.assertEqual(self.table.get_cost(day=5), expected_cost)
+
+    def test_get_completion_day(self):
+
+        # Check the completion day of each profile and of the whole wall
+        self.assertEqual(self.table.get_completion_day(profile_id=0), 9)
+        self.assertEqual(self.table.get_completion_day(profile_id=1), 13)
+        self.assertEqual(self.table.get_completion_day(), 13)
+
+    def test_invalid_queries(self):
+
+        # Check invalid days and profiles raise an error
+        with self.assertRaises(BuilderError):
+            self.table.get_ice(day=-1)
+
+        with self.assertRaises(BuilderError):
+            self.table.get_ice(day=1, profile_id=3)
+
+        with self.assertRaises(BuilderError):
+            self.table.get_completion_day(profile_id=3)
+
+    def test_from_previous(self):
+
+        # Edit a single profile of the configuration
+        config = WallConfigurator(profiles=[[21, 25, 28], [20], [17, 22]])
+        table = WallTable.from_config(config, previous=self.table)
+
+        # Check the table matches a new table of the configuration
+        expected = WallTable.from_config(config)
+        self.assertEqual(table.rows, expected.rows)
+        self.assertEqual(table.completion_days, expected.completion_days)
+        self.assertEqual(table.fingerprint, expected.fingerprint)
+
+        # Check the unchanged column is copied from the previous table
+        self.assertEqual(table.get_ice(day=5, profile_id=0),
+                         self.table.get_ice(day=5, profile_id=0))
@@ -219,3 +219,26 @@ class TestConfigValidator(TestCase):
 
         with self.assertRaises(BuilderValidationError):
             self.validator.check_config_list([[1], [2,] * 2000])
+
+    def test_check_chunk_size(self):
+
+        self.assertTrue(self.validator.check_chunk_size(0))
+        self.assertTrue(self.validator.check_chunk_size(10))
+
+        with self.assertRaises(BuilderValidationError):
+            self.validator.check_chunk_size(-1)
+
+        with self.assertRaises(BuilderValidationError):
+            self.validator.check_chunk_size(1.0)
+
+    def test_check_engine(self):
+
+        self.assertTrue(self.validator.check_engine('analytic'))
+        self.assertTrue(self.validator.check_engine('simulation'))
+        self.assertTrue(self.validator.check_engine('scheduler'))
+
+        with self.assertRaises(BuilderValidationError):
+            self.validator.check_engine('unknown')
+
+        with self.assertRaises(BuilderValidationError):
+            self.validator.check_engine(1)
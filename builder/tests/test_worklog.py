@@ -0,0 +1,165 @@
+from unittest import TestCase
+from builder.worklog import *
+
+import tempfile
+
+
+class TestWorkLog(TestCase):
+
+    def setUp(self):
+
+        # Create a work log in a temporary folder
+        self.folder = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.folder.name, 'wall.bin')
+
+        self.records = [
+            WorkRecord(day=1, profile_id=0, section_id=0, team=1, height=22),
+            WorkRecord(day=1, profile_id=1, section_id=3, team=2, height=18),
+            WorkRecord(day=2, profile_id=0, section_id=0, team=1, height=23),
+            WorkRecord(day=2, profile_id=1, section_id=3, team=2, height=19),
+        ]
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_get_filepaths(self):
+        self.assertEqual(get_worklog_filepath('data/wall.log'), 'data/wall.bin')
+        self.assertEqual(get_index_filepath('data/wall.bin'), 'data/wall.idx')
+
+    def test_get_records(self):
+
+        # Write the records and the index
+        with WorkLogWriter(self.filepath) as writer:
+            for record in self.records:
+                writer.append(record)
+
+        worklog = WorkLog(self.filepath)
+
+        # Check the index covers all records
+        count, index = worklog.get_index()
+        self.assertEqual(count, 4)
+        self.assertEqual(list(index['day'][2]), [2, 3])
+        self.assertEqual(list(index['team'][1]), [0, 2])
+
+        # Check the filters
+        self.assertEqual(len(worklog), 4)
+        self.assertEqual(worklog.get_records(), self.records)
+        self.assertEqual(worklog.get_records(day=1, team=2), [self.records[1]])
+        self.assertEqual(
+            worklog.get_records(profile_id=0),
+            [self.records[0], self.records[2]]
+        )
+        self.assertEqual(worklog.get_records(day=3), [])
+
+    def test_get_records_after_index(self):
+
+        # Write the index after the first two records
+        writer = WorkLogWriter(self.filepath, flush_interval=60)
+        for record in self.records[:2]:
+            writer.append(record)
+        writer.write_index()
+
+        # Write the remaining records without the index
+        for record in self.records[2:]:
+            writer.append(record)
+        writer.flush()
+
+        # Check the records after the index are scanned
+        worklog = WorkLog(self.filepath)
+        self.assertEqual(worklog.get_index()[0], 2)
+        self.assertEqual(worklog.get_records(day=2), self.records[2:])
+
+        writer.close()
+        self.assertEqual(worklog.get_index()[0], 4)
+
+    def test_write_index_chunks(self):
+
+        # Write the index after each half of the records
+        writer = WorkLogWriter(self.filepath, flush_interval=60)
+        index_filepath = get_index_filepath(self.filepath)
+        sizes = []
+        for record in self.records:
+            writer.append(record)
+            if writer.count % 2 == 0:
+                writer.write_index()
+                sizes.append(os.path.getsize(index_filepath))
+        writer.close()
+
+        # Check each write appends only the positions of its records
+        self.assertEqual(sizes[1] - sizes[0], sizes[0] - len(INDEX_MAGIC))
+        self.assertEqual(writer.index, {kind: {} for kind in INDEX_KINDS})
+
+        # Check the chunks are joined by the reader
+        count, index = WorkLog(self.filepath).get_index()
+        self.assertEqual(count, 4)
+        self.assertEqual(list(index['team'][2]), [1, 3])
+
+    def test_append(self):
+
+        # Write the first two records and a partial record
+        with WorkLogWriter(self.filepath) as writer:
+            for record in self.records[:2]:
+                writer.append(record)
+        with open(self.filepath, 'ab') as file:
+            file.write(b'\x01\x00')
+
+        # Continue the log with the remaining records
+        with WorkLogWriter(self.filepath, mode='ab') as writer:
+            self.assertEqual(writer.count, 2)
+            for record in self.records[2:]:
+                writer.append(record)
+
+        # Check the records and the index of both writers
+        worklog = WorkLog(self.filepath)
+        count, index = worklog.get_index()
+        self.assertEqual(count, 4)
+        self.assertEqual(list(index['profile_id'][1]), [1, 3])
+        self.assertEqual(worklog.get_records(), self.records)
+
+        # Check the index is rebuilt when it is missing
+        os.remove(get_index_filepath(self.filepath))
+        WorkLogWriter(self.filepath, mode='ab').close()
+        self.assertEqual(worklog.get_index()[0], 4)
+        self.assertEqual(worklog.get_records(day=2), self.records[2:])
+
+        # Check the log and the index are reset together
+        WorkLogWriter(self.filepath).close()
+        self.assertEqual(worklog.get_index()[0], 0)
+        self.assertEqual(worklog.get_records(), [])
+
+    def test_empty_index(self):
+
+        # Write the records without the index
+        writer = WorkLogWriter(self.filepath, flush_interval=60)
+        for record in self.records:
+            writer.append(record)
+        writer.flush()
+
+        # Check the records are scanned while the index is started
+        worklog = WorkLog(self.filepath)
+        self.assertEqual(worklog.get_index()[0], 0)
+        self.assertEqual(worklog.get_records(day=2), self.records[2:])
+
+        # Check an index file without its header is read as empty
+        open(get_index_filepath(self.filepath), 'wb').close()
+        self.assertEqual(worklog.get_index()[0], 0)
+        self.assertEqual(worklog.get_records(team=1), self.records[::2])
+        writer.close()
+
+    def test_handler(self):
+
+        # Log a record with and without a work record
+        handler = WorkLogHandler(self.filepath)
+        handler.handle(logging.makeLogRecord({'msg': 'text only'}))
+        handler.handle(
+            logging.makeLogRecord({'msg': 'work', 'work': self.records[0]})
+        )
+        handler.close()
+
+        # Check only the work record is written
+        self.assertEqual(WorkLog(self.filepath).get_records(), self.records[:1])
+
+    def test_missing_worklog(self):
+        worklog = WorkLog(self.filepath)
+        self.assertEqual(len(worklog), 0)
+        self.assertEqual(worklog.get_records(day=1), [])
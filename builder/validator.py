@@ -47,6 +47,14 @@ class ConfigValidatorAbc(ABC):
     def check_cpu_worktime(self, value):
         pass
 
+    @abstractmethod
+    def check_chunk_size(self, value):
+        pass
+
+    @abstractmethod
+    def check_engine(self, value):
+        pass
+
     @abstractmethod
     def check_sections(self, value):
         pass
@@ -85,6 +93,10 @@ class ConfigValidator(object):
         True
         >>> validator.check_cpu_worktime(0.01)
         True
+        >>> validator.check_chunk_size(0)
+        True
+        >>> validator.check_engine('analytic')
+        True
         >>> validator.check_wall_sections([1, 2, 3])
         True
         >>> validator.check_wall_profiles([1, 2, 3])
@@ -268,6 +280,42 @@ class ConfigValidator(object):
 
         return True
 
+    @staticmethod
+    def check_chunk_size(value):
+        """Checks a chunk_size parameter."""
+
+        # Check the type of the value
+        if not isinstance(value, int):
+            raise BuilderValidationError(
+                info='The chunk size must be an integer'
+            )
+
+        # Check that the value is not negative (0 is auto-tune)
+        if value < 0:
+            raise BuilderValidationError(
+                info=f"The chunk size must be a non-negative integer: {value}"
+            )
+
+        return True
+
+    @staticmethod
+    def check_engine(value):
+        """Checks an engine parameter."""
+
+        # Check the type of the value
+        if not isinstance(value, str):
+            raise BuilderValidationError(
+                info='The engine must be a string'
+            )
+
+        # Check that the engine is supported
+        if value not in ENGINES:
+            raise BuilderValidationError(
+                info=f"Invalid engine: {value}. Allowed are {', '.join(ENGINES)}"
+            )
+
+        return True
+
     @staticmethod
     def check_wall_sections(value):
         """Checks a section parameter."""
@@ -0,0 +1,486 @@
+# encoding: utf-8
+from builder.errors import *
+from builder.defines import LOG_FLUSH_INTERVAL
+
+from array import array
+from collections import namedtuple
+import logging
+import os
+import struct
+import time
+
+# The work of a team on a section on a given day
+WorkRecord = namedtuple(
+    'WorkRecord', ['day', 'profile_id', 'section_id', 'team', 'height']
+)
+
+# Fixed-width binary layout of a work record (five int32 values)
+RECORD = struct.Struct('<5i')
+
+# Header of the index file
+INDEX_MAGIC = b'WIDX'
+
+# Header of a chunk of the index (indexed records after it, entries)
+INDEX_CHUNK = struct.Struct('<ii')
+
+# Entry of a chunk of the index (kind, key, number of positions)
+INDEX_ENTRY = struct.Struct('<3i')
+
+# The fields of the work records that are indexed
+INDEX_KINDS = ('day', 'profile_id', 'team')
+
+
+def get_index_filepath(filepath):
+    """Returns the path of the index file of a work log.
+
+    Args:
+        filepath (str) : The path of the work log.
+
+    Returns:
+        str: The path of the index file.
+    """
+    return os.path.splitext(filepath)[0] + '.idx'
+
+
+def get_worklog_filepath(log_filepath):
+    """Returns the path of the work log next to a text log file.
+
+    Args:
+        log_filepath (str) : The path of the text log file.
+
+    Returns:
+        str: The path of the binary work log.
+    """
+    return os.path.splitext(log_filepath)[0] + '.bin'
+
+
+def iter_index_chunks(data):
+    """Iterates over the complete chunks of the data of an index file.
+
+    A chunk that was only partly written when the data was read is ignored,
+    so the index always describes records that are complete in the log.
+
+    Args:
+        data (bytes) : The content of the index file.
+
+    Raises:
+        BuilderError: If the data is not an index file.
+
+    Yields:
+        tuple: The number of records indexed after the chunk, the offset of
+            the end of the chunk and a list of (kind, key, positions) entries.
+    """
+
+    # Check the format of the index
+    if data[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+        raise BuilderError("Invalid work log index.")
+
+    offset = len(INDEX_MAGIC)
+    while offset + INDEX_CHUNK.size <= len(data):
+        count, size = INDEX_CHUNK.unpack_from(data, offset)
+        start = offset + INDEX_CHUNK.size + size * INDEX_ENTRY.size
+        if start > len(data):
+            return
+
+        # Read the positions of the entries one after the other
+        entries = []
+        end = start
+        for i in range(size):
+            kind_id, key, length = INDEX_ENTRY.unpack_from(
+                data, offset + INDEX_CHUNK.size + i * INDEX_ENTRY.size
+            )
+            positions = array('i')
+            positions.frombytes(data[end:end + length * positions.itemsize])
+            if len(positions) < length:
+                return
+            entries.append((INDEX_KINDS[kind_id], key, positions))
+            end += length * positions.itemsize
+
+        yield count, end, entries
+        offset = end
+
+
+class WorkLogWriter(object):
+    """Appends work records to a binary work log and maintains its index.
+
+    The records are appended to the work log with a fixed width, so the n-th
+    record starts at byte n * RECORD.size. The positions of the records with
+    the same day, profile and team are collected in memory until the writer
+    is flushed, at most once per flush interval. They are then appended to
+    the index file as a chunk, so a flush writes only the positions of the
+    new records. The index is reset with the work log when the log is opened
+    for writing and continued when it is opened for appending.
+
+    Attributes:
+        filepath (str)          : The path of the work log.
+        count (int)             : The number of records written.
+        indexed (int)           : The number of records in the index file.
+        index (dict)            : The positions of the records not indexed yet
+                                  by kind and key.
+        flush_interval (float)  : The minimum time between two index writes.
+
+    Example:
+
+        from builder.worklog import WorkLogWriter, WorkRecord
+
+        # Write a record and the index
+        with WorkLogWriter('wall.bin') as writer:
+            writer.append(WorkRecord(1, 0, 2, 1, 29))
+    """
+
+    def __init__(self, filepath, mode='wb', flush_interval=LOG_FLUSH_INTERVAL):
+        """Initializes the writer and opens the work log and its index.
+
+        Args:
+            filepath (str)          : The path of the work log.
+            mode (str)              : The mode to open the work log ('wb' to
+                                      start a new log, 'ab' to continue it).
+            flush_interval (float)  : The minimum time between two index
+                                      writes.
+        """
+
+        # Set the instance attributes
+        self.filepath = filepath
+        self.count = 0
+        self.indexed = 0
+        self.index = {kind: {} for kind in INDEX_KINDS}
+        self.flush_interval = flush_interval
+        self.index_time = 0.0
+
+        # Open the append-only work log and its index
+        self.file = open(filepath, mode)
+        if mode.startswith('a'):
+            self.index_file = self.open_index()
+        else:
+            self.index_file = open(get_index_filepath(filepath), 'wb')
+            self.index_file.write(INDEX_MAGIC)
+            self.index_file.flush()
+
+        # Index the records missing in the index
+        self.write_index()
+
+    def __enter__(self):
+        """Returns the writer when entering a context."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the writer when leaving a context."""
+        self.close()
+
+    def open_index(self):
+        """Opens the index of an existing work log to append to it.
+
+        A partly written last record or index chunk is cut off, and the
+        records missing in the index are collected to be indexed again. A
+        missing or invalid index is written anew.
+
+        Returns:
+            file: The index file opened for appending.
+        """
+
+        # Cut off a partly written last record
+        self.count = self.file.seek(0, os.SEEK_END) // RECORD.size
+        self.file.truncate(self.count * RECORD.size)
+
+        # Find the end of the last complete chunk of the index
+        filepath = get_index_filepath(self.filepath)
+        end = 0
+        try:
+            with open(filepath, 'rb') as file:
+                data = file.read()
+            end = len(INDEX_MAGIC)
+            for count, end, entries in iter_index_chunks(data):
+                self.indexed = count
+        except (OSError, BuilderError):
+            self.indexed = end = 0
+
+        # Start a new index without a valid one
+        if not end or self.indexed > self.count:
+            self.indexed = 0
+            index_file = open(filepath, 'wb')
+            index_file.write(INDEX_MAGIC)
+            index_file.flush()
+        else:
+            index_file = open(filepath, 'r+b')
+            index_file.truncate(end)
+            index_file.seek(end)
+
+        # Collect the positions of the records after the index
+        with open(self.filepath, 'rb') as file:
+            file.seek(self.indexed * RECORD.size)
+            data = file.read((self.count - self.indexed) * RECORD.size)
+
+        for position, values in enumerate(RECORD.iter_unpack(data),
+                                          start=self.indexed):
+            self.add_position(WorkRecord(*values), position)
+
+        return index_file
+
+    def add_position(self, record, position):
+        """Adds the position of a record to the pending index.
+
+        Args:
+            record (WorkRecord) : The work record.
+            position (int)      : The position of the record in the log.
+        """
+
+        for kind in INDEX_KINDS:
+            key = getattr(record, kind)
+            positions = self.index[kind].get(key)
+            if positions is None:
+                positions = self.index[kind][key] = array('i')
+            positions.append(position)
+
+    def append(self, record):
+        """Appends a work record to the log.
+
+        Args:
+            record (WorkRecord) : The work record.
+        """
+
+        # Write the record at the end of the log
+        self.file.write(RECORD.pack(*record))
+
+        # Add the position of the record to the index
+        self.add_position(record, self.count)
+        self.count += 1
+
+    def write_index(self):
+        """Appends the positions of the new records to the index."""
+
+        entries = []
+        positions = array('i')
+
+        # Collect the positions of each key one after the other
+        for kind_id, kind in enumerate(INDEX_KINDS):
+            for key, items in sorted(self.index[kind].items()):
+                entries.append(INDEX_ENTRY.pack(kind_id, key, len(items)))
+                positions.extend(items)
+
+        # Append the chunk in a single write
+        if entries:
+            self.file.flush()
+            self.index_file.write(
+                INDEX_CHUNK.pack(self.count, len(entries))
+                + b''.join(entries)
+                + positions.tobytes()
+            )
+            self.index_file.flush()
+
+        self.index = {kind: {} for kind in INDEX_KINDS}
+        self.indexed = self.count
+        self.index_time = time.monotonic()
+
+    def flush(self, force=False):
+        """Writes the buffered records and the index to the files.
+
+        Args:
+            force (bool) : Write the index regardless of the flush interval.
+        """
+
+        self.file.flush()
+
+        # Write the index only if there are new records
+        if self.indexed == self.count:
+            return
+
+        if force or time.monotonic() - self.index_time >= self.flush_interval:
+            self.write_index()
+
+    def close(self):
+        """Flushes and closes the work log and its index."""
+
+        if not self.file.closed:
+            self.flush(force=True)
+            self.file.close()
+            self.index_file.close()
+
+
+class WorkLog(object):
+    """Reads the records of a binary work log using its index.
+
+    The records of a day, a profile or a team are read by seeking to their
+    positions instead of scanning the whole log. Records written after the
+    index was updated are scanned.
+
+    Attributes:
+        filepath (str)  : The path of the work log.
+
+    Example:
+
+        from builder.worklog import WorkLog
+
+        # Get the work of the second team on the first day
+        print(WorkLog('wall.bin').get_records(day=1, team=2))
+    """
+
+    def __init__(self, filepath):
+        """Initializes the reader.
+
+        Args:
+            filepath (str) : The path of the work log.
+        """
+
+        self.filepath = filepath
+
+    def __len__(self):
+        """Returns the number of records in the work log."""
+
+        if not os.path.exists(self.filepath):
+            return 0
+
+        return os.path.getsize(self.filepath) // RECORD.size
+
+    def get_index(self):
+        """Reads the index of the work log.
+
+        Returns:
+            tuple: The number of indexed records and a dict with the
+                positions of the records by kind and key.
+        """
+
+        index = {kind: {} for kind in INDEX_KINDS}
+        count = 0
+
+        # Scan the whole log without an index
+        filepath = get_index_filepath(self.filepath)
+        if not os.path.exists(filepath):
+            return count, index
+
+        with open(filepath, 'rb') as file:
+            data = file.read()
+
+        # Scan the whole log while the index is started
+        if INDEX_MAGIC.startswith(data):
+            return count, index
+
+        # Join the positions of each key from the chunks
+        try:
+            for count, end, entries in iter_index_chunks(data):
+                for kind, key, positions in entries:
+                    items = index[kind].get(key)
+                    if items is None:
+                        index[kind][key] = positions
+                    else:
+                        items.extend(positions)
+
+        except BuilderError:
+            raise BuilderError(f"Invalid work log index {filepath}.")
+
+        return count, index
+
+    def get_records(self, day=None, profile_id=None, team=None):
+        """Returns the work records filtered by day, profile and team.
+
+        Args:
+            day (int)           : The day, or None for all days.
+            profile_id (int)    : The profile ID, or None for all profiles.
+            team (int)          : The team, or None for all teams.
+
+        Returns:
+            list: The matching work records in the order they were written.
+        """
+
+        # Nothing to read without a work log
+        if not os.path.exists(self.filepath):
+            return []
+
+        filters = {'day': day, 'profile_id': profile_id, 'team': team}
+        filters = {kind: key for kind, key in filters.items() if key is not None}
+
+        count, index = self.get_index()
+
+        # Use the shortest list of positions of the filters
+        candidates = [
+            index[kind].get(key, array('i')) for kind, key in filters.items()
+        ]
+
+        if candidates:
+            positions = min(candidates, key=len)
+        else:
+            positions = range(count)
+
+        records = []
+
+        with open(self.filepath, 'rb') as file:
+
+            # Seek to the indexed records
+            for position in positions:
+                file.seek(position * RECORD.size)
+                records.append(WorkRecord(*RECORD.unpack(file.read(RECORD.size))))
+
+            # Scan the records written after the index (skip a partly
+            # written last record)
+            file.seek(count * RECORD.size)
+            data = file.read()
+            data = data[:len(data) - len(data) % RECORD.size]
+            for values in RECORD.iter_unpack(data):
+                records.append(WorkRecord(*values))
+
+        # Apply the remaining filters
+        return [
+            record for record in records
+            if all(getattr(record, kind) == key for kind, key in filters.items())
+        ]
+
+
+class WorkLogHandler(logging.Handler):
+    """Log handler that writes the work records attached to log records.
+
+    The log records with a `work` attribute (see the `extra` argument of the
+    logging functions) are written to the binary work log. The other log
+    records are ignored.
+
+    Attributes:
+        writer (WorkLogWriter) : The writer of the work log.
+    """
+
+    def __init__(self, filepath, mode='wb'):
+        """Initializes the handler.
+
+        Args:
+            filepath (str)  : The path of the work log.
+            mode (str)      : The mode to open the work log.
+        """
+
+        # Initialize the parent class
+        super().__init__()
+
+        # Open the work log
+        self.writer = WorkLogWriter(filepath, mode=mode)
+
+    def emit(self, record):
+        """Writes the work record of a log record."""
+
+        work = getattr(record, 'work', None)
+        if work is None:
+            return
+
+        try:
+            self.writer.append(WorkRecord(*work))
+        except Exception:
+            self.handleError(record)
+
+    def flush(self, force=False):
+        """Writes the records and the index to the files.
+
+        Args:
+            force (bool) : Write the index regardless of the flush interval.
+        """
+
+        self.acquire()
+        try:
+            self.writer.flush(force)
+        finally:
+            self.release()
+
+    def close(self):
+        """Closes the work log."""
+
+        self.acquire()
+        try:
+            self.writer.close()
+        finally:
+            self.release()
+
+        super().close()
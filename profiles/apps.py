@@ -1,12 +1,20 @@
 from django.apps import AppConfig
 from rootdir import ROOT_DIR
 from builder.manager import WallManager
+from builder.engine import AnalyticEngine
+from builder.scheduler import TeamScheduler
 from builder.configurator import WallConfigurator
+from builder.pool import WallPool
+from builder.cache import ResultCache
 
+from concurrent.futures import ThreadPoolExecutor
+import atexit
 import os
 
 LOG_FILE_PATH = os.path.join(ROOT_DIR, 'data', 'wall.log')
 INI_FILE_PATH = os.path.join(ROOT_DIR, 'data', 'wall.ini')
+MANAGER_STATE_PATH = os.path.join(ROOT_DIR, 'data', 'manager.state')
+SCHEDULER_STATE_PATH = os.path.join(ROOT_DIR, 'data', 'scheduler.state')
 
 
 class ProfilesConfig(AppConfig):
@@ -16,6 +24,85 @@ class ProfilesConfig(AppConfig):
     # Initialize the wall configurator
     config = WallConfigurator.from_ini(INI_FILE_PATH)
 
-    # Initialize the wall manager
-    manager = WallManager(log_filepath=LOG_FILE_PATH)
+    # Initialize the long-lived pool of workers (started on the first build)
+    pool = WallPool(num_teams=config.num_teams, log_filepath=LOG_FILE_PATH)
+
+    # Initialize the wall manager (simulation with a pool of workers)
+    manager = WallManager(
+        log_filepath=LOG_FILE_PATH,
+        pool=pool,
+        state_filepath=MANAGER_STATE_PATH
+    )
     manager.set_config(config)
+
+    # Initialize the analytic engine (closed-form calculation)
+    engine = AnalyticEngine(log_filepath=LOG_FILE_PATH)
+    engine.set_config(config)
+
+    # Initialize the team scheduler (limited number of teams)
+    scheduler = TeamScheduler(
+        log_filepath=LOG_FILE_PATH,
+        state_filepath=SCHEDULER_STATE_PATH
+    )
+    scheduler.set_config(config)
+
+    # Initialize the cache of the build results
+    cache = ResultCache(maxsize=128)
+
+    # Initialize the threads that run the builds of the async views
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='Build')
+
+    def ready(self):
+        """Stops the pool of workers when the application stops."""
+        atexit.register(self.pool.stop)
+        atexit.register(self.executor.shutdown, wait=False)
+
+    def get_builder(self):
+        """Returns the wall builder selected by the configuration."""
+
+        # The simulation with a pool of workers is opt-in
+        if self.config.engine == 'simulation':
+            return self.manager
+
+        # The teams move between the sections
+        if self.config.engine == 'scheduler':
+            return self.scheduler
+
+        return self.engine
+
+    def get_result(self, days):
+        """Returns the result of a build with the configured number of teams.
+
+        Args:
+            days (int) : The number of days to build the wall.
+
+        Returns:
+            BuildResult : The cached or newly built result.
+        """
+
+        return self.cache.get_result(
+            builder=self.get_builder(),
+            days=days,
+            num_teams=self.config.num_teams
+        )
+
+    async def aget_result(self, days):
+        """Returns the result of a build without blocking the event loop.
+
+        The build runs on a thread of the executor, so the server can serve
+        other requests while the workers build the wall. Identical requests
+        wait for the same build.
+
+        Args:
+            days (int) : The number of days to build the wall.
+
+        Returns:
+            BuildResult : The cached or newly built result.
+        """
+
+        return await self.cache.aget_result(
+            builder=self.get_builder(),
+            days=days,
+            num_teams=self.config.num_teams,
+            executor=self.executor
+        )
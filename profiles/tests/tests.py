@@ -1,6 +1,9 @@
+from django.apps import apps
 from django.test import TestCase
 from django.urls import reverse
+import asyncio
 import json
+import time
 
 
 class ProfileIndexTests(TestCase):
@@ -24,6 +27,192 @@ class ProfileLogsTests(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class ProfileLogsPageTests(TestCase):
+    """ Test the pages and the stream of the logs endpoint."""
+
+    def test_logs_page(self):
+        """ Test a page of the logs."""
+
+        url = reverse('profiles:get_logs')
+        response = self.client.get(url, {'limit': 10, 'day': 1})
+        self.assertEqual(response.status_code, 200)
+
+        # Check the response data
+        data = json.loads(response.content)
+        self.assertIn('logs', data)
+        self.assertIn('next', data)
+        self.assertLessEqual(len(data['logs']), 10)
+
+    async def test_logs_stream(self):
+        """ Test the NDJSON stream of the logs."""
+
+        url = reverse('profiles:get_logs')
+        response = await self.async_client.get(
+            url, {'format': 'ndjson', 'limit': 10}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        # Check each line is a JSON object
+        content = b''.join(
+            [chunk async for chunk in response.streaming_content]
+        ).decode()
+        for line in content.splitlines():
+            self.assertIn('cursor', json.loads(line))
+        self.assertLessEqual(len(content.splitlines()), 10)
+
+    def test_logs_since(self):
+        """ Test the messages appended since an offset."""
+
+        url = reverse('profiles:get_logs')
+        response = self.client.get(url, {'since': 0})
+        self.assertEqual(response.status_code, 200)
+
+        # Check nothing is new at the returned offset
+        data = json.loads(response.content)
+        response = self.client.get(url, {'since': data['offset']})
+        self.assertEqual(json.loads(response.content)['logs'], [])
+
+    async def test_logs_follow(self):
+        """ Test the server-sent events of the logs."""
+
+        url = reverse('profiles:get_logs')
+        response = await self.async_client.get(
+            url, {'format': 'sse', 'timeout': 0}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        # Check the stream ends after the timeout
+        content = b''.join(
+            [chunk async for chunk in response.streaming_content]
+        ).decode()
+        self.assertTrue(content.endswith('\n\n'))
+
+    async def test_logs_follow_chunks(self):
+        """ Test the events are sent before the timeout of the stream."""
+
+        url = reverse('profiles:get_logs')
+        start = time.monotonic()
+        response = await self.async_client.get(
+            url, {'format': 'sse', 'timeout': 2}
+        )
+
+        # Record when each event arrives
+        arrivals = []
+        async for chunk in response.streaming_content:
+            arrivals.append(time.monotonic() - start)
+
+        # Check the first event is not held back until the timeout
+        self.assertGreater(len(arrivals), 1)
+        self.assertLess(arrivals[0], 1.0)
+        self.assertGreaterEqual(arrivals[-1], 2.0)
+
+    def test_invalid_limit(self):
+        """ Test an invalid limit of the logs."""
+
+        url = reverse('profiles:get_logs')
+        response = self.client.get(url, {'limit': 0})
+        self.assertEqual(response.status_code, 400)
+
+
+class ProfileWorklogTests(TestCase):
+    """ Test the work log endpoint."""
+
+    def test_worklog_status(self):
+        """ Test the work log endpoint with filters."""
+
+        url = reverse('profiles:get_worklog')
+        response = self.client.get(url, {'day': 1, 'team': 1})
+        self.assertEqual(response.status_code, 200)
+
+        # Check the response data
+        data = json.loads(response.content)
+        self.assertIn('records', data)
+
+    def test_worklog_simulation(self):
+        """ Test the work records of a build with the pool of workers."""
+
+        # Build the first day with the simulation engine
+        app = apps.get_app_config('profiles')
+        engine = app.config.engine
+        app.config.engine = 'simulation'
+        app.cache.clear()
+
+        try:
+            url = reverse(
+                viewname='profiles:get_day_overview',
+                kwargs={'day_id': 1}
+            )
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+            # Read the work records of the first day
+            url = reverse('profiles:get_worklog')
+            response = self.client.get(url, {'day': 1})
+            self.assertEqual(response.status_code, 200)
+            records = json.loads(response.content)['records']
+
+        finally:
+            app.config.engine = engine
+            app.cache.clear()
+
+        # Check a record was written for each section built on the first day
+        config = app.config
+        expected = sorted(
+            (profile_id, height + config.build_rate)
+            for profile_id, heights in enumerate(config.profiles, start=1)
+            for height in heights
+            if height < config.target_height
+        )
+        self.assertEqual(
+            sorted((r['profile_id'], r['height']) for r in records),
+            expected
+        )
+
+        # Check the day and the teams of the records
+        for record in records:
+            self.assertEqual(record['day'], 1)
+            self.assertIn(record['team'], range(1, config.num_teams + 1))
+
+
+class ProfilePoolTests(TestCase):
+    """ Test the pool statistics endpoint."""
+
+    def test_pool_stats(self):
+        """ Test the pool statistics endpoint."""
+
+        url = reverse('profiles:get_pool_stats')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        # Check the response data
+        data = json.loads(response.content)
+        self.assertIn('queue_depth', data)
+        self.assertIn('utilisation', data)
+
+
+class ProfileCacheTests(TestCase):
+    """ Test the result cache endpoint."""
+
+    def test_cache_stats(self):
+        """ Test the repeated requests are answered from the cache."""
+
+        # Request the same overview twice
+        url = reverse('profiles:get_overall_overview')
+        self.client.get(url)
+        self.client.get(url)
+
+        # Check the second request was a hit
+        url = reverse('profiles:get_cache_stats')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.content)
+        self.assertGreaterEqual(data['hits'], 1)
+        self.assertIn('misses', data)
+
+
 class ProfileOverviewTests(TestCase):
     """ Test the profile overview endpoints."""
 
@@ -67,6 +256,35 @@ class ProfileOverviewTests(TestCase):
         self.assertEqual(response.status_code, 500)
 
 
+class ProfileAsyncTests(TestCase):
+    """ Test the async overview endpoints."""
+
+    async def test_concurrent_requests(self):
+        """ Test concurrent requests are served together."""
+
+        urls = [
+            reverse('profiles:get_day_overview', args=[day])
+            for day in range(1, 5)
+        ]
+
+        # Send the requests at the same time
+        responses = await asyncio.gather(
+            *[self.async_client.get(url) for url in urls]
+        )
+
+        # Check each request got its own day
+        for day, response in enumerate(responses, start=1):
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.content)['day'], day)
+
+    async def test_method_not_allowed(self):
+        """ Test the async endpoints accept only GET."""
+
+        url = reverse('profiles:get_overall_overview')
+        response = await self.async_client.post(url)
+        self.assertEqual(response.status_code, 405)
+
+
 class ProfileDailyStatusTests(TestCase):
     """ Test the daily status endpoints."""
 
@@ -62,6 +62,21 @@ urlpatterns = [
          name='get_logs'
          ),
 
+    path(route='worklog/',
+         view=views.get_worklog,
+         name='get_worklog'
+         ),
+
+    path(route='pool/',
+         view=views.get_pool_stats,
+         name='get_pool_stats'
+         ),
+
+    path(route='cache/',
+         view=views.get_cache_stats,
+         name='get_cache_stats'
+         ),
+
     # Configuration Endpoints
     path(route='config/',
          view=views.handle_config,
@@ -2,7 +2,17 @@
 from rest_framework.decorators import api_view
 from django.http import HttpResponse
 from django.http import JsonResponse
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from django.apps import apps
+from asgiref.sync import sync_to_async
+from builder.defines import LOG_PAGE_SIZE, LOG_STREAM_SIZE
+from builder.defines import LOG_FOLLOW_INTERVAL, LOG_FOLLOW_TIMEOUT
+
+from itertools import islice
+import asyncio
+import json
+import time
 
 
 @api_view(http_method_names=["GET"])
@@ -30,7 +40,13 @@ def home(request):
             <li>GET /profiles/overview/{day_id}/</li>
             <li>GET /profiles/{profile_id}/overview/{day_id}/</li>
             <li>GET /profiles/{profile_id}/days/{day_id}/</li>
-            <li>GET /profiles/logs/</li>
+            <li>GET /profiles/logs/?cursor={cursor}&limit={limit}</li>
+            <li>GET /profiles/logs/?format=ndjson&day={day_id}</li>
+            <li>GET /profiles/logs/?since={offset}</li>
+            <li>GET /profiles/logs/?format=sse</li>
+            <li>GET /profiles/worklog/?day={day_id}&team={team_id}</li>
+            <li>GET /profiles/pool/</li>
+            <li>GET /profiles/cache/</li>
             <li>GET /profiles/config/</li>
             <li>POST /profiles/config/</li>
         </ul>
@@ -55,18 +71,15 @@ def index(request):
     return HttpResponse("You're at the polls index.")
 
 
-@api_view(http_method_names=["GET"])
-def get_overall_overview(request):
+@require_GET
+async def get_overall_overview(request):
 
     # Get the app
     app = apps.get_app_config("profiles")
 
-    # Get the number of teams
-    num_teams = app.config.num_teams
-
     try:
-        # Build a wall with the given number of teams and days
-        app.manager.build(num_teams=num_teams, days=30)
+        # Build a wall with the configured number of teams for the days
+        result = await app.aget_result(days=30)
 
     # Something went wrong
     except Exception as e:
@@ -78,25 +91,22 @@ def get_overall_overview(request):
         # Prepare the data
         data = {
             'day': None,
-            'cost': app.manager.get_cost()
+            'cost': result.get_cost()
         }
 
         # Return the data
         return JsonResponse(data)
 
 
-@api_view(http_method_names=["GET"])
-def get_day_overview(request, day_id):
+@require_GET
+async def get_day_overview(request, day_id):
 
     # Get the app
     app = apps.get_app_config("profiles")
 
-    # Get the number of teams
-    num_teams = app.config.num_teams
-
     try:
-        # Build a wall with the given number of teams and days
-        app.manager.build(num_teams=num_teams, days=day_id)
+        # Build a wall with the configured number of teams for the days
+        result = await app.aget_result(days=day_id)
 
     # Something went wrong
     except Exception as e:
@@ -108,28 +118,25 @@ def get_day_overview(request, day_id):
         # Prepare the data
         data = {
             'day': day_id,
-            'cost': app.manager.get_cost()
+            'cost': result.get_cost()
         }
 
         # Return the data
         return JsonResponse(data)
 
 
-@api_view(http_method_names=["GET"])
-def get_profile_overview(request, profile_id, day_id):
+@require_GET
+async def get_profile_overview(request, profile_id, day_id):
 
     # Get the app
     app = apps.get_app_config("profiles")
 
-    # Get the number of teams
-    num_teams = app.config.num_teams
-
     try:
-        # Build a wall with the given number of teams and days
-        app.manager.build(num_teams=num_teams, days=day_id)
+        # Build a wall with the configured number of teams for the days
+        result = await app.aget_result(days=day_id)
 
-        # Get the profile with the given ID
-        profile = app.manager.get_profile(profile_id - 1)
+        # Get the cost of the profile with the given ID
+        cost = result.get_cost(profile_id=profile_id - 1)
 
     # Something went wrong
     except Exception as e:
@@ -141,28 +148,25 @@ def get_profile_overview(request, profile_id, day_id):
         # Prepare the data
         data = {
             'day': day_id,
-            'cost': profile.get_cost()
+            'cost': cost
         }
 
         # Return the data
         return JsonResponse(data)
 
 
-@api_view(http_method_names=["GET"])
-def get_day_data(request, profile_id, day_id):
+@require_GET
+async def get_day_data(request, profile_id, day_id):
 
     # Get the app
     app = apps.get_app_config("profiles")
 
-    # Get the number of teams
-    num_teams = app.config.num_teams
-
     try:
-        # Build a wall with the given number of teams and days
-        app.manager.build(num_teams=num_teams, days=day_id)
+        # Build a wall with the configured number of teams for the days
+        result = await app.aget_result(days=day_id)
 
-        # Get the profile with the given ID
-        profile = app.manager.get_profile(profile_id - 1)
+        # Get the ice of the profile with the given ID
+        ice = result.get_ice(profile_id=profile_id - 1)
 
     # Something went wrong
     except Exception as e:
@@ -174,21 +178,153 @@ def get_day_data(request, profile_id, day_id):
         # Prepare the data
         data = {
             'day': day_id,
-            'ice': profile.get_ice()
+            'ice': ice
         }
 
         # Return the data
         return JsonResponse(data)
 
 
+def get_log_filters(request):
+    """Returns the filters of a logs request."""
+
+    params = request.GET
+
+    # Profiles start from 1 in the REST API
+    profile = params.get('profile')
+
+    return {
+        'day': int(params['day']) if params.get('day') else None,
+        'profile_id': int(profile) - 1 if profile else None,
+        'section_id': int(params['section']) if params.get('section') else None,
+        'process': params.get('process') or None,
+    }
+
+
+def get_log_position(request, name, default=0):
+    """Returns a non-negative integer parameter of a logs request."""
+
+    value = int(request.GET.get(name, default))
+    if value < 0:
+        raise ValueError(f"Invalid {name} {value}.")
+
+    return value
+
+
+def read_logs(logs, limit):
+    """Returns the next log messages of an iterator as a list."""
+    return list(islice(logs, limit))
+
+
+async def stream_logs(logs, limit=None):
+    """Yields the log messages with their cursors as NDJSON lines.
+
+    The messages are read in chunks in a worker thread, so the event loop
+    sends each chunk while the next one is read from the log.
+    """
+
+    while limit is None or limit > 0:
+
+        # Read the next chunk of messages off the event loop
+        size = LOG_STREAM_SIZE
+        if limit is not None:
+            size = min(size, limit)
+
+        chunk = await sync_to_async(read_logs)(logs, size)
+        if not chunk:
+            break
+
+        if limit is not None:
+            limit -= len(chunk)
+
+        yield ''.join(
+            json.dumps({'log': line, 'cursor': cursor}) + '\n'
+            for line, cursor in chunk
+        )
+
+
+async def follow_logs(builder, tail, timeout=LOG_FOLLOW_TIMEOUT, **filters):
+    """Yields the new log messages as server-sent events until the timeout.
+
+    Each event holds the messages appended since the previous event and the
+    offset to resume from as its ID. The stream waits on the event loop and
+    polls the log in a worker thread, so no thread is held between events.
+    """
+
+    deadline = time.monotonic() + timeout
+
+    while True:
+
+        # Send the new messages or keep the connection alive
+        if tail['logs']:
+            data = ''.join(f'data: {line}\n' for line in tail['logs'])
+            yield f'id: {tail["offset"]}\n{data}\n'
+        else:
+            yield ': keep-alive\n\n'
+
+        # The client reconnects with the ID of the last event
+        if time.monotonic() >= deadline:
+            break
+
+        # Poll the messages appended since the last event
+        await asyncio.sleep(LOG_FOLLOW_INTERVAL)
+        tail = await sync_to_async(builder.tail_logs)(
+            offset=tail['offset'], **filters
+        )
+
+
 def get_logs(request):
 
     # Get the app
     app = apps.get_app_config("profiles")
 
     try:
-        # Get the logs from the manager
-        logs = app.manager.get_logs()
+        # Get the page parameters and the filters
+        filters = get_log_filters(request)
+        cursor = get_log_position(request, 'cursor')
+        limit = get_log_position(request, 'limit', LOG_PAGE_SIZE)
+        since = request.GET.get('since', request.headers.get('Last-Event-ID'))
+        since = int(since) if since else None
+        timeout = min(
+            float(request.GET.get('timeout', LOG_FOLLOW_TIMEOUT)),
+            LOG_FOLLOW_TIMEOUT
+        )
+
+        if not limit or (since is not None and since < 0):
+            raise ValueError(f"Invalid limit {limit} or offset {since}.")
+
+    # Invalid query parameters
+    except ValueError as e:
+        return HttpResponse(status=400, content=str(e))
+
+    try:
+        builder = app.get_builder()
+        output = request.GET.get('format')
+
+        # Stream the log messages one JSON object per line
+        if output == 'ndjson':
+            return StreamingHttpResponse(
+                stream_logs(builder.iter_logs(cursor=cursor, **filters), limit),
+                content_type='application/x-ndjson'
+            )
+
+        # Follow the log messages as server-sent events
+        if output == 'sse':
+            tail = builder.tail_logs(offset=since or 0, limit=limit, **filters)
+            response = StreamingHttpResponse(
+                follow_logs(builder, tail, timeout, limit=limit, **filters),
+                content_type='text/event-stream'
+            )
+            response['Cache-Control'] = 'no-cache'
+            return response
+
+        # Get the messages appended since an offset
+        if since is not None:
+            logs = builder.tail_logs(offset=since, limit=limit, **filters)
+
+        # Get a page of the logs from the wall builder
+        else:
+            logs = builder.get_logs(cursor=cursor, limit=limit, **filters)
 
     # Something went wrong
     except Exception as e:
@@ -200,6 +336,82 @@ def get_logs(request):
         return JsonResponse(logs)
 
 
+@api_view(http_method_names=["GET"])
+def get_worklog(request):
+
+    # Get the app
+    app = apps.get_app_config("profiles")
+
+    try:
+        # Get the filters of the work records (profiles start from 1)
+        day = request.GET.get('day')
+        profile = request.GET.get('profile')
+        team = request.GET.get('team')
+
+        # Seek the matching records in the binary work log
+        records = app.manager.get_worklog().get_records(
+            day=int(day) if day else None,
+            profile_id=int(profile) - 1 if profile else None,
+            team=int(team) if team else None
+        )
+
+    # Something went wrong
+    except Exception as e:
+        return HttpResponse(status=500, content=str(e))
+
+    # Everything went well
+    else:
+
+        # Prepare the data
+        data = {
+            'records': [
+                dict(record._asdict(), profile_id=record.profile_id + 1)
+                for record in records
+            ]
+        }
+
+        # Return the data
+        return JsonResponse(data)
+
+
+@api_view(http_method_names=["GET"])
+def get_pool_stats(request):
+
+    # Get the app
+    app = apps.get_app_config("profiles")
+
+    try:
+        # Get the statistics of the pool of workers
+        data = app.pool.get_stats()
+
+    # Something went wrong
+    except Exception as e:
+        return HttpResponse(status=500, content=str(e))
+
+    # Everything went well
+    else:
+        return JsonResponse(data)
+
+
+@api_view(http_method_names=["GET"])
+def get_cache_stats(request):
+
+    # Get the app
+    app = apps.get_app_config("profiles")
+
+    try:
+        # Get the statistics of the result cache
+        data = app.cache.get_stats()
+
+    # Something went wrong
+    except Exception as e:
+        return HttpResponse(status=500, content=str(e))
+
+    # Everything went well
+    else:
+        return JsonResponse(data)
+
+
 @api_view(http_method_names=["POST", "GET"])
 def handle_config(request):
 
@@ -228,6 +440,12 @@ def handle_config(request):
             # Set the new configuration data
             app.config.set_params(request.data)
 
+            # Match the size of the pool with the number of teams
+            app.pool.resize(app.config.num_teams)
+
+            # Drop the results of the previous configuration
+            app.cache.clear()
+
             # Get the new configuration data
             data = {"status": "success"}
 
@@ -71,6 +71,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'wall_project.wsgi.application'
+ASGI_APPLICATION = 'wall_project.asgi.application'
 
 
 # Database